@@ -0,0 +1,92 @@
+from src.maze import maze
+from searchalgorithms import registry
+import argparse
+import contextlib
+import csv
+import json
+import sys
+
+# Statistics written for every (maze, algorithm) run, in column order
+fields = ["maze", "algorithm", "timeout", "found", "cost", "expanded",
+          "max_frontier", "max_memory", "max_depth", "wall_time",
+          "memory_bytes", "bytes_per_node", "peak_bytes", "peak_rss"]
+
+
+def run_batch(mazes, algorithm_names, measure_memory=False):
+    """Runs every algorithm on every maze without drawing and returns the list of statistics.
+    A maze is either a predefined maze id (e.g. 3) or the path of a maze file.
+    With measure_memory the searches are traced for peak_bytes, which slows them down.
+    All algorithms are looked up before the first run, so an unknown name raises
+    registry.AlgorithmError before any maze is searched."""
+    for algorithm_name in algorithm_names:
+        registry.get(algorithm_name)
+    results = []
+    for maze_spec in mazes:
+        if str(maze_spec).isdigit():
+            my_maze = maze(maze_id=int(maze_spec), headless=True)
+        else:
+            my_maze = maze(maze_id=maze_spec, headless=True, maze_file=maze_spec)
+        my_maze.measure_memory = measure_memory
+        for algorithm_name in algorithm_names:
+            my_maze.loadSearchAlgorithm(algorithm_name=algorithm_name)
+            statistics = my_maze.runSearchAlgorithm()
+            if statistics is not None:
+                results.append(statistics)
+    return results
+
+
+def write_results(results, output, fmt):
+    """Writes the statistics as JSON or CSV to the given file object."""
+    if fmt == "json":
+        json.dump(results, output, indent=2)
+        output.write("\n")
+    else:
+        writer = csv.DictWriter(output, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Headless batch runner for the search algorithms')
+    parser.add_argument('--mazes', nargs='+', required=True,
+                        help='maze ids (1-6) or maze file paths')
+    parser.add_argument('--algorithms', nargs='+', default=None,
+                        help='the search algorithm names (default: all algorithms with --capabilities)')
+    parser.add_argument('--capabilities', nargs='+', default=[], choices=sorted(registry.CAPABILITIES),
+                        help='only run the algorithms that have all these capabilities')
+    parser.add_argument('--output', type=str, default=None,
+                        help='file to write the statistics to (default: standard output)')
+    parser.add_argument('--format', choices=['json', 'csv'], default=None,
+                        help='output format (default: from the output file extension, else json)')
+    parser.add_argument('--measure_memory', action='store_true',
+                        help='trace allocations with tracemalloc to report the peak bytes of every search (slower)')
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.output is not None and args.output.endswith(".csv") else "json"
+
+    try:
+        if args.algorithms is None:
+            algorithm_names = []
+            for name in registry.find(*args.capabilities):
+                try:
+                    registry.get(name)
+                except registry.AlgorithmNotImplementedError as e:
+                    print("Skipping", e, file=sys.stderr)  # Not implemented yet, e.g. an assignment template
+                    continue
+                algorithm_names.append(name)
+        else:
+            algorithm_names = [name for name in args.algorithms
+                               if set(args.capabilities) <= registry.get(name).capabilities]
+        # Progress messages go to stderr so the statistics can be piped from stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            results = run_batch(args.mazes, algorithm_names, args.measure_memory)
+    except registry.AlgorithmError as e:
+        sys.exit("Error: {}".format(e))
+    if args.output is None:
+        write_results(results, sys.stdout, fmt)
+    else:
+        with open(args.output, "w", newline="") as output:
+            write_results(results, output, fmt)
+        print(len(results), "runs written to", args.output)
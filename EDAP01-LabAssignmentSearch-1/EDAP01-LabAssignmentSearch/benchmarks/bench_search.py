@@ -0,0 +1,269 @@
+"""Benchmark suite for the search algorithms.
+
+Runs every algorithm on the predefined mazes and on larger synthetic grids
+(random mazes, open rooms and serpentine corridors), reports throughput (expanded nodes per second), time per query, peak frontier
+size and peak resident memory, and compares the results with the last run
+stored in the history file to detect regressions.
+
+Usage (from the project directory):
+    python benchmarks/bench_search.py                 # run and print
+    python benchmarks/bench_search.py --save          # also append the results to the history
+    python benchmarks/bench_search.py --save --check  # exit with 1 on regressions
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from os.path import abspath, dirname, exists, join
+
+import numpy
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+project_dir = dirname(dirname(abspath(__file__)))
+if project_dir not in sys.path:
+    sys.path.insert(0, project_dir)
+
+from searchalgorithms import landmarks, registry
+
+algorithm_names = ["bfs", "dfs", "ucs", "gbfs", "astar", "wavefront"]
+maze_files = [join(project_dir, "mazes", "maze{}.txt".format(i)) for i in range(1, 7)]
+synthetic_sizes = [65, 129, 257]
+# Open rooms have wide BFS levels, serpentines have levels of a single cell: wavefront is
+# compared with bfs on both ends
+open_sizes = [257]
+serpentine_sizes = [257]
+default_history = join(project_dir, "benchmarks", "history.jsonl")
+
+
+def synthetic_maze(size, seed=0):
+    """Generates a perfect maze of size x size cells (size must be odd) with a randomized
+    depth-first carving, start in the top-left and goal in the bottom-right corner."""
+    rng = numpy.random.default_rng(seed)
+    grid = numpy.ones((size, size), dtype=numpy.uint8)
+    stack = [(1, 1)]
+    grid[1, 1] = 0
+    while stack:
+        r, c = stack[-1]
+        neighbors = [(r + dr, c + dc, dr // 2, dc // 2) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                     if 0 < r + dr < size - 1 and 0 < c + dc < size - 1 and grid[r + dr, c + dc] == 1]
+        if not neighbors:
+            stack.pop()
+            continue
+        nr, nc, hr, hc = neighbors[rng.integers(len(neighbors))]
+        grid[r + hr, c + hc] = 0
+        grid[nr, nc] = 0
+        stack.append((nr, nc))
+    # Knock down some walls so there is more than one route to the goal
+    walls = numpy.argwhere(grid[1:-1, 1:-1] == 1) + 1
+    for r, c in walls[rng.random(len(walls)) < 0.05]:
+        grid[r, c] = 0
+    grid[1, 1] = 2
+    grid[size - 2, size - 2] = 3
+    return grid
+
+
+def open_maze(size):
+    """Returns a size x size room without walls, start in the top-left and goal in the bottom-right corner."""
+    grid = numpy.zeros((size, size), dtype=numpy.uint8)
+    grid[0, 0] = 2
+    grid[size - 1, size - 1] = 3
+    return grid
+
+
+def serpentine_maze(size):
+    """Returns a single corridor winding through size x size cells (size must be odd): every other
+    row is a wall with one gap, alternately at the right and the left end."""
+    grid = numpy.zeros((size, size), dtype=numpy.uint8)
+    for r in range(1, size - 1, 2):
+        grid[r, :] = 1
+        grid[r, size - 1 if (r // 2) % 2 == 0 else 0] = 0
+    grid[0, 0] = 2
+    grid[size - 1, size - 1] = 3
+    return grid
+
+
+def load_case(case):
+    """Returns (grid, start, goal) of a benchmark case."""
+    if case.startswith("synthetic"):
+        grid = synthetic_maze(int(case.split("_")[1]))
+    elif case.startswith("open"):
+        grid = open_maze(int(case.split("_")[1]))
+    elif case.startswith("serpentine"):
+        grid = serpentine_maze(int(case.split("_")[1]))
+    else:
+        grid = numpy.loadtxt(join(project_dir, case), ndmin=2)
+        landmarks.load_for(join(project_dir, case), grid)  # astar uses the stored landmark table, like in the visualizer
+    start = tuple(int(i) for i in numpy.argwhere(grid == 2)[0])
+    goal = tuple(int(i) for i in numpy.argwhere(grid == 3)[0])
+    return grid, start, goal
+
+
+def run_case(case, algorithm_name, repeat, mode="step"):
+    """Runs one algorithm on one case (in its own process) and returns the measurements.
+    mode "step" calls step() until the search is done, like the visualizer; "solve" uses the solve() fast path."""
+    algorithm = registry.get(algorithm_name)()
+    grid, start, goal = load_case(case)
+    best_time = None
+    for _ in range(repeat):
+        algorithm.reset(grid, start, goal)
+        start_time = time.perf_counter()
+        if mode == "solve":
+            algorithm.solve()
+        while not algorithm.isDone():
+            algorithm.step()
+        elapsed = time.perf_counter() - start_time
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+    expanded = algorithm.getNumberOfExpanded()
+    result = {
+        "case": case,
+        "algorithm": algorithm_name,
+        "mode": mode,
+        "cost": algorithm.getCost(),
+        "expanded": expanded,
+        "time_per_query": best_time,
+        "expanded_per_second": expanded / best_time if best_time > 0 else float("inf"),
+        "max_frontier": algorithm.getMaxFrontierSize(),
+    }
+    rss = peak_rss_kb()
+    if rss is not None:
+        result["peak_rss_kb"] = rss
+    return result
+
+
+def peak_rss_kb():
+    """Returns the peak resident set size of this process in kilobytes, or None where it is not available."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # Bytes on macOS, kilobytes elsewhere
+
+
+def run_suite(cases, algorithms, repeat, mode="step"):
+    """Runs all (case, algorithm) pairs, each in a fresh process so the peak RSS belongs to that run."""
+    results = []
+    for case in cases:
+        for algorithm_name in algorithms:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                results.append(executor.submit(run_case, case, algorithm_name, repeat, mode).result())
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_dir,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_baseline(history_path):
+    """Returns the last run stored in the history file, or None."""
+    if not exists(history_path):
+        return None
+    last = None
+    with open(history_path) as history:
+        for line in history:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+
+def find_regressions(results, baseline, threshold):
+    """Returns the results whose throughput dropped by more than threshold (a fraction) against the baseline."""
+    if baseline is None:
+        return []
+    previous = {(r["case"], r["algorithm"], r.get("mode", "step")): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get((result["case"], result["algorithm"], result["mode"]))
+        if old is None:
+            continue
+        ratio = result["expanded_per_second"] / old["expanded_per_second"]
+        if ratio < 1 - threshold:
+            regressions.append((result, old, ratio))
+    return regressions
+
+
+def print_results(results):
+    print("{:<22} {:<10} {:>6} {:>9} {:>12} {:>14} {:>9} {:>10}".format(
+        "case", "algorithm", "cost", "expanded", "time [ms]", "expanded/s", "frontier", "rss [MB]"))
+    for r in results:
+        rss = "{:.1f}".format(r["peak_rss_kb"] / 1024) if "peak_rss_kb" in r else "-"
+        print("{:<22} {:<10} {:>6} {:>9} {:>12.3f} {:>14.0f} {:>9} {:>10}".format(
+            r["case"], r["algorithm"], r["cost"], r["expanded"], r["time_per_query"] * 1000,
+            r["expanded_per_second"], r["max_frontier"], rss))
+
+
+def print_speedups(results, reference="bfs"):
+    """Prints the time per query of every algorithm relative to the reference algorithm on the same case."""
+    times = {(r["case"], r["algorithm"]): r["time_per_query"] for r in results}
+    for r in results:
+        base = times.get((r["case"], reference))
+        if r["algorithm"] == reference or base is None:
+            continue
+        print("{:<22} {:<10} {:>8.2f}x vs {}".format(r["case"], r["algorithm"], base / r["time_per_query"], reference))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Search algorithm benchmark suite')
+    parser.add_argument('--algorithms', nargs='+', default=algorithm_names,
+                        help='the search algorithm names')
+    parser.add_argument('--sizes', nargs='*', type=int, default=synthetic_sizes,
+                        help='sizes of the synthetic mazes (odd numbers)')
+    parser.add_argument('--open-sizes', nargs='*', type=int, default=open_sizes,
+                        help='sizes of the open rooms')
+    parser.add_argument('--serpentine-sizes', nargs='*', type=int, default=serpentine_sizes,
+                        help='sizes of the serpentine corridors (odd numbers)')
+    parser.add_argument('--no-mazes', action='store_true',
+                        help='skip the predefined mazes')
+    parser.add_argument('--mode', choices=['step', 'solve'], default='step',
+                        help='drive the search with step() like the visualizer, or with the solve() fast path')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='queries per case, the fastest one is reported')
+    parser.add_argument('--history', type=str, default=default_history,
+                        help='JSON-lines history file')
+    parser.add_argument('--save', action='store_true',
+                        help='append the results to the history file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed throughput drop against the baseline (fraction)')
+    parser.add_argument('--check', action='store_true',
+                        help='exit with status 1 if a regression is found')
+    args = parser.parse_args()
+
+    cases = [] if args.no_mazes else ["mazes/" + f.rsplit("/", 1)[1] for f in maze_files]
+    cases += ["synthetic_{}".format(size) for size in args.sizes]
+    cases += ["open_{}".format(size) for size in args.open_sizes]
+    cases += ["serpentine_{}".format(size) for size in args.serpentine_sizes]
+
+    results = run_suite(cases, args.algorithms, args.repeat, args.mode)
+    print_results(results)
+    print_speedups(results)
+
+    baseline = load_baseline(args.history)
+    regressions = find_regressions(results, baseline, args.threshold)
+    if baseline is not None:
+        print("Baseline: commit", baseline.get("commit"), "from", baseline.get("timestamp"))
+    for result, old, ratio in regressions:
+        print("REGRESSION {} {}: {:.0f} -> {:.0f} expanded/s ({:.0%})".format(
+            result["case"], result["algorithm"], old["expanded_per_second"], result["expanded_per_second"], ratio))
+
+    if args.save:
+        record = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.history, "a") as history:
+            history.write(json.dumps(record) + "\n")
+
+    if args.check and regressions:
+        sys.exit(1)
@@ -0,0 +1,72 @@
+"""Import-time budget of the modules that worker processes import.
+
+Every module is imported in a fresh interpreter with python -X importtime, a
+few times, and the fastest cumulative import time is compared with the budget.
+The modules must also not pull in the window and image libraries: pygame is only
+for the visualizer and Pillow only for recording GIFs.
+
+Usage (from the project directory):
+    python benchmarks/import_budget.py                  # report
+    python benchmarks/import_budget.py --check          # exit with 1 if over budget
+    python benchmarks/import_budget.py --budget-ms 150 --modules src.maze
+"""
+import argparse
+import re
+import subprocess
+import sys
+from os.path import abspath, dirname
+
+project_dir = dirname(dirname(abspath(__file__)))
+
+default_modules = ["src.maze", "src.model", "src.parallel", "batch"]
+forbidden_modules = ["pygame", "PIL"]
+default_budget_ms = 200  # numpy alone takes about 100 ms of it
+
+_line = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module):
+    """Imports module in a fresh interpreter. Returns the cumulative import times in milliseconds of module
+    and of numpy (0 if not imported), and the forbidden modules it imported."""
+    check = "import sys; print(','.join(m for m in {!r} if m in sys.modules))".format(forbidden_modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import {}; {}".format(module, check)],
+                            cwd=project_dir, capture_output=True, text=True, check=True)
+    times = {}
+    for match in _line.finditer(result.stderr):
+        times.setdefault(match.group(4), int(match.group(2)) / 1000)  # Every module is listed once, when its import ends
+    lines = result.stdout.strip().splitlines()  # pygame prints a banner before the last line
+    loaded = [name for name in (lines[-1] if lines else "").split(",") if name]
+    return times.get(module, 0.0), times.get("numpy", 0.0), loaded
+
+
+def check_budget(modules, budget_ms, repeat):
+    """Returns a list of (module, fastest ms, numpy ms, forbidden modules, within budget)."""
+    results = []
+    for module in modules:
+        runs = [measure(module) for _ in range(repeat)]
+        total, numpy_ms, loaded = min(runs, key=lambda run: run[0])
+        results.append((module, total, numpy_ms, loaded, total <= budget_ms and not loaded))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Import-time budget check')
+    parser.add_argument('--modules', nargs='+', default=default_modules,
+                        help='modules to import')
+    parser.add_argument('--budget-ms', type=float, default=default_budget_ms,
+                        help='allowed cumulative import time per module in milliseconds')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='imports per module, the fastest one is reported')
+    parser.add_argument('--check', action='store_true',
+                        help='exit with status 1 if a module is over budget or imports pygame or Pillow')
+    args = parser.parse_args()
+
+    results = check_budget(args.modules, args.budget_ms, args.repeat)
+    print("{:<16} {:>10} {:>10}  {}".format("module", "import ms", "numpy ms", "status"))
+    for module, total, numpy_ms, loaded, ok in results:
+        status = "ok" if ok else "OVER BUDGET" if not loaded else "imports " + ", ".join(loaded)
+        print("{:<16} {:>10.1f} {:>10.1f}  {}".format(module, total, numpy_ms, status))
+    print("Budget {:.0f} ms".format(args.budget_ms))
+
+    if args.check and not all(ok for *_, ok in results):
+        sys.exit(1)
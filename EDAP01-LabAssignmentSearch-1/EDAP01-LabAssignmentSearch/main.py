@@ -1,17 +1,58 @@
 from src.maze import maze 
+from os.path import basename, splitext
+from searchalgorithms.instrumentation import MetricsCollector, TraceCollector
+from searchalgorithms import registry
 import argparse
 
 parser = argparse.ArgumentParser(description='Search Algorithm Parameters')
-parser.add_argument('--maze_id', type=int, required=True,
+maze_source = parser.add_mutually_exclusive_group(required=True)
+maze_source.add_argument('--maze_id', type=int,
                     help='the id of the maze')
+maze_source.add_argument('--maze_file', type=str,
+                    help='the path of a maze file to load instead of a predefined maze')
 parser.add_argument('--search_algorithm_name', type=str, required=True,
-                    help='the search algorithm name') 
+                    help='the search algorithm name, one of: ' + ', '.join(registry.names())) 
+parser.add_argument('--headless', action='store_true',
+                    help='run the search without opening a pygame window')
+parser.add_argument('--render_every', type=int, default=1,
+                    help='draw only every N-th search step')
+parser.add_argument('--target_fps', type=float, default=None,
+                    help='draw at most this many frames per second and let the search run at full speed')
+parser.add_argument('--metrics', type=str, default=None,
+                    help='record per-step metrics of the search and save them to this JSON file')
+parser.add_argument('--trace', type=str, default=None,
+                    help='record the search steps and save them to this Chrome trace file (chrome://tracing, Perfetto)')
+parser.add_argument('--measure_memory', action='store_true',
+                    help='with --headless, trace allocations with tracemalloc to report the peak bytes of the search')
+parser.add_argument('--record', type=str, default=None,
+                    help='record the drawn frames to this .gif (needs Pillow) or .npz file from a background thread')
+parser.add_argument('--record_every', type=int, default=1,
+                    help='record only every N-th drawn frame')
 args = parser.parse_args()
 my_algorithm_name = args.search_algorithm_name
 
-if args.maze_id > 6: # there are 6 mazes predefined
+maze_id = args.maze_id
+if args.maze_file is not None:
+        maze_id = splitext(basename(args.maze_file))[0] # names the window and the saved images
+elif args.maze_id > 6: # there are 6 mazes predefined
         raise ValueError("Argument --maze_id: {args.maze_id} is greater than allowed threshold {6}")
 
-my_maze = maze(maze_id=args.maze_id, save_img= False)
-my_maze.loadSearchAlgorithm(algorithm_name=my_algorithm_name)
-my_maze.runSearchAlgorithm()
\ No newline at end of file
+my_maze = maze(maze_id=maze_id, save_img= args.record is not None, headless=args.headless, maze_file=args.maze_file,
+               render_every=args.render_every, target_fps=args.target_fps)
+try:
+        my_maze.loadSearchAlgorithm(algorithm_name=my_algorithm_name)
+except registry.AlgorithmError as e:
+        raise SystemExit("Error: {}".format(e))
+collectors = {}
+if args.metrics:
+        collectors[args.metrics] = MetricsCollector()
+if args.trace:
+        collectors[args.trace] = TraceCollector()
+my_maze.collectors = tuple(collectors.values())
+my_maze.measure_memory = args.measure_memory
+my_maze.record_path = args.record
+my_maze.record_every = args.record_every
+my_maze.runSearchAlgorithm()
+for path, collector in collectors.items():
+        collector.save(path)
+        print(path, "is saved")
\ No newline at end of file
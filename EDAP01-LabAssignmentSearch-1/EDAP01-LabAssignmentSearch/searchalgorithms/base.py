@@ -1,20 +1,43 @@
+from time import perf_counter
+from searchalgorithms import instrumentation, memory
+from searchalgorithms.frontier import QueueFrontier
+from searchalgorithms.graph import graph_for
+from searchalgorithms.state import SearchState
+
+
 class SearchAlgorithmBase:
+    # What the algorithm can do, e.g. frozenset({"optimal", "weighted"}), see searchalgorithms.registry
+    capabilities = frozenset()
+    # How solve() pushes the neighbors of an expanded node when a child class runs it in the loop below
+    # instead of over step(): "first" only the first time a node is reached (e.g., BFS, DFS, GBFS),
+    # "cheapest" whenever it is reached with a lower g(n) (e.g., UCS, A*). None calls step().
+    expansion_loop = None
 
     def __init__(self) -> None:
         # Initialize with empty/None values
         self.reset(None, None, None)
         
-    def reset(self, grid, start, goal):
-        """Set all internal variables to their initial values. """
-        self._grid = grid  # The grid environment for the search algorithm has a size of (33, 33), which corresponds to (row, column) order.
+    def reset(self, grid, start, goal, graph=None):
+        """Set all internal variables to their initial values. graph is the compiled graph of grid when the caller
+        already has it, e.g. a copy it changed with GridGraph.update(); by default it comes from graph_for(). """
+        self._grid = grid  # The grid environment for the search algorithm, indexed in (row, column) order.
         self._start = start # Starting Cell (row, column)
         self._goal = goal # Goal Cell (row, column)
+        if graph is None and grid is not None:
+            graph = graph_for(grid)
+        self._graph = graph # Adjacency of the grid, compiled once per maze
+        size = self._graph.size if self._graph is not None else 0
         
-        # Core Search Structures
-        self._frontier = [(start, 0, 0, start)] # Frontier set for search algorithms. Frontier tuple: (node, heuristic_h, cost_g, parent)
-        self._explored = []  # Using a set for faster lookups, keeping the explored set
+        # Core Search Structures, over linear cell ids (row * columns + column)
+        self._state = self._new_state(size) # Parent, cost g(n) and depth of every reached node, and the explored nodes
+        self._frontier = self._new_frontier(size) # Frontier of cell ids, see SearchState for their cost and parent
+        self._start_id = self._graph.cellId(start) if start is not None else -1
+        self._goal_id = self._graph.cellId(goal) if goal is not None else -1
+        if start is not None:
+            self._state.reach(self._start_id, self._start_id, 0, 0)
+            self._frontier.push(self._start_id, 0)
+        self._explored = []  # Explored nodes as (row, column), converted from the state on demand for drawing
         self._path = []  # To store the path
-        self._depth_map = {start: 0} if start else {} # To store the depth  
         
         # Performance and state metrics
         self._done = False # The state of the search, `True` if the search terminated
@@ -22,7 +45,53 @@ class SearchAlgorithmBase:
         self._max_depth = 0 # Track the maximum depth reached 
         self._max_nodes_in_memory = 0  # Tracker for total memory footprint
         self._max_frontier_size = 0 # Max size of the frontier
+        self._peak_bytes = None # Peak bytes allocated by the search, only set by measurePeak
          
+    def _new_state(self, size):
+        """Returns the search state for a grid of size cells, preallocated arrays by default. Searches that
+        only reach a few cells (memory-bounded or cache-backed ones) override it with a sparse state."""
+        return SearchState(size)
+
+    def _new_frontier(self, size):
+        """Returns an empty frontier for a grid of size cells. Defaults to a FIFO queue, child classes override it
+        (e.g., LIFO stack for DFS, priority queue for UCS, GBFS and A*)."""
+        return QueueFrontier(size)
+
+    def instrument(self, *collectors):
+        """Attaches instrumentation collectors (see searchalgorithms.instrumentation) to this algorithm object.
+        Call it before reset(); the collectors stay attached for all later searches. Algorithms that are never
+        instrumented run without any hooks."""
+        instrumentation.attach(self, list(collectors))
+        return self
+
+    def _wrap_structures(self, collectors) -> None:
+        """Wraps the frontier and the compiled graph for the collectors, after every reset of an instrumented
+        algorithm. Child classes with more structures wrap those too."""
+        self._frontier = instrumentation.wrapFrontier(self._frontier, collectors)
+        self._graph = instrumentation.wrapGraph(self._graph, collectors)
+
+    def heuristic(self, node):
+        # Uninformed searches estimate nothing, informed ones override this
+        return 0
+
+    # --- Membership ---
+    def _mark_explored(self, node) -> None:
+        """Adds node (row, column) to the explored set, once."""
+        self._state.close(self._graph.cellId(node))
+
+    def _is_explored(self, node) -> bool:
+        """Returns True if node (row, column) has been expanded, in constant time."""
+        return bool(self._state.closed[self._graph.cellId(node)])
+
+    def _in_frontier(self, node) -> bool:
+        """Returns True if node (row, column) is waiting in the frontier, in constant time."""
+        return self._graph.cellId(node) in self._frontier
+
+    def _reconstruct_path(self, goal_id):
+        """Reconstructs the path from the start to goal_id by walking the parent array."""
+        cell = self._graph.cell
+        return [cell(cell_id) for cell_id in self._state.pathTo(goal_id)]
+
     # --- Search Control ---
     def step(self):
         """Runs the algorithm for one step. 
@@ -32,17 +101,132 @@ class SearchAlgorithmBase:
         
         raise NotImplementedError("Subclasses must implement the step() method.")
                            
+    def solve(self, max_expansions=None, deadline=None):
+        """Runs the search to completion without visualization and returns the path, with the same result
+        as calling step() until isDone(). Stops early, not done, after max_expansions expansions or once
+        time.perf_counter() passes deadline; calling solve() or step() again continues the search.
+        Child classes that set expansion_loop run in one loop over the frontier with everything used per
+        expansion in locals."""
+        if self.expansion_loop is None:
+            steps = 0
+            while not self._done:
+                if max_expansions is not None and steps >= max_expansions:
+                    break
+                if deadline is not None and perf_counter() >= deadline:
+                    break
+                self.step()
+                steps += 1
+            return self._path
+        if self._done:
+            return self._path
+
+        # Everything used per expansion is hoisted into locals
+        frontier = self._frontier
+        pop, push = frontier.pop, frontier.push
+        state = self._state
+        parent, cost, depths, closed, explored = state.parent, state.g, state.depth, state.closed, state.explored
+        neighbors, move_cost = self._graph.neighborIds, self._graph.costs
+        goal = self._goal_id
+        first = self.expansion_loop == "first"
+        priority = self._solve_priority()
+        max_depth, max_frontier, max_memory = self._max_depth, self._max_frontier_size, self._max_nodes_in_memory
+        limit = -1 if max_expansions is None else max_expansions
+        expansions = 0
+
+        while frontier:
+            if expansions == limit:
+                break
+            # Reading the clock costs more than an expansion, check it every 256 expansions
+            if deadline is not None and expansions & 255 == 0 and perf_counter() >= deadline:
+                break
+            expansions += 1
+
+            current_node = pop()
+            if not closed[current_node]:
+                closed[current_node] = 1
+                explored.append(current_node)
+
+            # Goal check
+            if current_node == goal:
+                self._done = True
+                self._cost = cost[current_node]
+                self._path = self._reconstruct_path(current_node)
+                break
+
+            g_current = cost[current_node]
+            depth = depths[current_node] + 1
+            for neighbor in neighbors(current_node):
+                if closed[neighbor]:
+                    continue
+                g = g_current + move_cost[neighbor]  # Moving into a cell costs its terrain cost
+                if first:
+                    if neighbor in frontier:
+                        continue
+                elif 0 <= cost[neighbor] <= g:
+                    continue
+                if priority is None:
+                    push(neighbor)
+                else:
+                    push(neighbor, priority(neighbor, g))
+                parent[neighbor] = current_node
+                cost[neighbor] = g
+                depths[neighbor] = depth
+                if depth > max_depth:
+                    max_depth = depth
+
+            size = len(frontier)
+            if size > max_frontier:
+                max_frontier = size
+            if size + len(explored) > max_memory:
+                max_memory = size + len(explored)
+        else:
+            # Frontier is empty, no path found
+            self._done = True
+            self._path = []
+
+        self._max_depth, self._max_frontier_size, self._max_nodes_in_memory = max_depth, max_frontier, max_memory
+        return self._path
+
+    def _solve_priority(self):
+        """Returns the function (neighbor id, g) -> priority solve() pushes neighbors with, or None to push
+        them without a priority (FIFO and LIFO frontiers)."""
+        return None
+
+    def measurePeak(self, grid, start, goal, max_expansions=None, deadline=None):
+        """Runs reset() and solve() while tracing allocations with tracemalloc, records the peak bytes the search
+        allocated (see getPeakBytes) and returns the path. Tracing makes the search several times slower."""
+        with memory.PeakTracker() as tracker:
+            self.reset(grid, start, goal)
+            path = self.solve(max_expansions, deadline)
+        self._peak_bytes = tracker.peak
+        return path
+
     def isDone(self) -> bool:
         """Returns True if the search has terminated (success or failure)."""
         return self._done          
     
     # --- Getters for Visualization ---    
-    def getFrontier(self) -> list:
-        """Returns the frontier set of your search algorithm for visualization purposes. """
-        return self._frontier
+    def getFrontier(self):
+        """Returns the frontier set of your search algorithm for visualization purposes,
+        as frontier tuples (node, heuristic_h, cost_g, parent). """
+        if self._graph is None:
+            return []
+        cell, g, parent = self._graph.cell, self._state.g, self._state.parent
+        # The heuristic of the class, not the one instrumentation may attach: drawing is not part of the search
+        heuristic = type(self).heuristic
+        frontier = []
+        for cell_id in self._frontier:
+            node = cell(cell_id)
+            frontier.append((node, heuristic(self, node), g[cell_id], cell(parent[cell_id])))
+        return frontier
     
     def getExplored(self) -> list:
-        """Returns the explored set of your search algorithm for visualization purposes. """
+        """Returns the explored set of your search algorithm for visualization purposes. 
+        The list only grows during a search; nodes expanded since the last call are appended. """
+        explored = self._state.explored
+        if len(self._explored) < len(explored):
+            cell = self._graph.cell
+            self._explored.extend(cell(cell_id) for cell_id in explored[len(self._explored):])
         return self._explored
     
     def getPath(self) -> list:  
@@ -58,13 +242,50 @@ class SearchAlgorithmBase:
         """Returns the max frontier size. """
         return self._max_frontier_size
     
+    def getFrontierSize(self) -> int:
+        """Returns the current number of nodes in the frontier."""
+        return len(self._frontier)
+
     def getMaxMemoryUsage(self) -> int:
         """Returns the used node memory size. """
         return self._max_nodes_in_memory
     
+    def _memory_structures(self) -> dict:
+        """Returns the structures of the search by name, for getMemoryBreakdown. Child classes add theirs.
+        The compiled graph is left out: it is shared by all searches on the same maze."""
+        return {"state": self._state, "frontier": instrumentation.unwrap(self._frontier),
+                "explored_list": self._explored, "path": self._path}
+
+    def getMemoryBreakdown(self) -> dict:
+        """Returns the bytes held right now by every structure of the search, by name.
+        Objects shared by several structures are counted once, in the first one."""
+        seen = set()
+        return {name: memory.sizeof(structure, seen) for name, structure in self._memory_structures().items()}
+
+    def getMemoryBytes(self) -> int:
+        """Returns the bytes held right now by all structures of the search."""
+        return sum(self.getMemoryBreakdown().values())
+
+    def getBytesPerNode(self) -> dict:
+        """Returns the memory breakdown divided by the number of nodes in memory (getMaxMemoryUsage),
+        with the sum of all structures as "total"."""
+        nodes = max(1, self.getMaxMemoryUsage())
+        breakdown = self.getMemoryBreakdown()
+        breakdown["total"] = sum(breakdown.values())
+        return {name: size / nodes for name, size in breakdown.items()}
+
+    def getPeakBytes(self):
+        """Returns the peak bytes allocated by the last search run with measurePeak, None otherwise."""
+        return self._peak_bytes
+
+    def getPeakRSS(self):
+        """Returns the peak resident set size of the whole process in bytes (None where unavailable).
+        Unlike the other getters it is not reset between searches."""
+        return memory.peak_rss()
+
     def getNumberOfExpanded(self) -> int:
         """ Returns the number of expanded nodes which is the lenght of the explored set. """
-        return len(self._explored)
+        return len(self._state.explored)
     
     def getMaxDepth(self) -> int:
         """Returns the maximum depth reached during the search."""
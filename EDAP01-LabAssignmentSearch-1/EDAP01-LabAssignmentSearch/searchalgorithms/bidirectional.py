@@ -0,0 +1,141 @@
+from searchalgorithms import instrumentation
+from searchalgorithms.base import SearchAlgorithmBase
+from searchalgorithms.frontier import PriorityFrontier
+from searchalgorithms.state import SearchState
+
+FORWARD = 0
+BACKWARD = 1
+
+
+class bidirectional(SearchAlgorithmBase):
+    capabilities = frozenset({"optimal"})
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def reset(self, grid, start, goal):
+        super().reset(grid, start, goal)
+        # One frontier and search state per direction: index 0 grows from the start, 1 from the goal.
+        # Parent pointers of the backward state point towards the goal.
+        size = self._graph.size if self._graph is not None else 0
+        backward_state = SearchState(size)
+        backward = self._new_frontier(size)
+        if goal is not None:
+            backward_state.reach(self._goal_id, self._goal_id, 0, 0)
+            backward.push(self._goal_id, 0)
+        self._frontiers = [self._frontier, backward]
+        self._states = [self._state, backward_state]
+        self._explored = []  # Nodes expanded by either side, once, for drawing
+        self._expanded = 0
+
+        # Best meeting found so far: cost mu of the path start -> meeting node -> goal
+        self._mu = float("inf")
+        self._meeting_node = None
+        if start is not None and start == goal:
+            self._mu = 0
+            self._meeting_node = self._start_id
+
+    def _new_frontier(self, size):
+        # Both directions are ordered by path cost g(n) from their own root
+        return PriorityFrontier(size)
+
+    def _wrap_structures(self, collectors) -> None:
+        super()._wrap_structures(collectors)
+        self._frontiers = [self._frontier, instrumentation.wrapFrontier(self._frontiers[BACKWARD], collectors)]
+
+    def step(self):
+        """
+        Performs one step of the bidirectional search.
+        - Expand one node, alternately from the start side and the goal side (the side with the smaller frontier).
+        - Every newly reached node that the other side has also reached is a candidate meeting point.
+        """
+
+        """
+        Stopping condition (bidirectional uniform cost search):
+            Let mu be the cost of the best path through a meeting node found so far
+            and top_f, top_b the lowest cost g(n) in the forward and backward frontiers.
+            Any path not seen yet costs at least top_f + top_b, so stop when
+            top_f + top_b >= mu.
+        """
+
+        if self._done:
+            return  # If already done, do nothing
+
+        top = [self._frontiers[side].peekPriority() for side in (FORWARD, BACKWARD)]
+        top = [float("inf") if t is None else t for t in top]
+        if top[FORWARD] + top[BACKWARD] >= self._mu:
+            self._done = True
+            if self._meeting_node is None:
+                self._path = []  # No path found, both frontiers are exhausted
+            else:
+                self._path = self._reconstruct_path(self._meeting_node)
+            return
+
+        # Expand the side with the smaller frontier, it is cheaper to grow
+        side = FORWARD if len(self._frontiers[FORWARD]) <= len(self._frontiers[BACKWARD]) else BACKWARD
+        if top[side] == float("inf"):
+            side = 1 - side
+        other = 1 - side
+        frontier, state, other_state = self._frontiers[side], self._states[side], self._states[other]
+
+        current_node = frontier.pop()
+        g = state.g[current_node]
+        state.close(current_node)
+        if not other_state.closed[current_node]:
+            self._explored.append(self._graph.cell(current_node))
+        self._expanded += 1
+
+        # Explore neighbors, precomputed once per maze in the adjacency graph (in bounds and not occupied)
+        depth = state.depth[current_node] + 1
+        for neighbor in self._graph.neighborIds(current_node):  # Up, Down, Left, Right
+            if not state.closed[neighbor] and (state.g[neighbor] < 0 or g + 1 < state.g[neighbor]):
+                frontier.push(neighbor, g + 1)
+                state.reach(neighbor, current_node, g + 1, depth)
+
+                # Depth tracking
+                self._max_depth = max(self._max_depth, depth)
+
+                # Meeting check: the other side has reached this neighbor too
+                other_g = other_state.g[neighbor]
+                if other_g >= 0 and g + 1 + other_g < self._mu:
+                    self._mu = g + 1 + other_g
+                    self._meeting_node = neighbor
+
+        # Update max frontier size
+        frontier_size = len(self._frontiers[FORWARD]) + len(self._frontiers[BACKWARD])
+        self._max_frontier_size = max(self._max_frontier_size, frontier_size)
+        self._max_nodes_in_memory = max(self._max_nodes_in_memory, frontier_size + len(self._explored))
+
+    def getFrontier(self):
+        """Returns the frontier tuples of both directions."""
+        cell = self._graph.cell if self._graph is not None else None
+        frontier = []
+        for frontier_side, state in zip(self._frontiers, self._states):
+            for cell_id in frontier_side:
+                frontier.append((cell(cell_id), 0, state.g[cell_id], cell(state.parent[cell_id])))
+        return frontier
+
+    def getExplored(self) -> list:
+        """Returns the nodes expanded by either side, in expansion order."""
+        return self._explored
+
+    def _memory_structures(self) -> dict:
+        structures = super()._memory_structures()
+        structures["backward_state"] = self._states[BACKWARD]
+        structures["backward_frontier"] = instrumentation.unwrap(self._frontiers[BACKWARD])
+        return structures
+
+    def getFrontierSize(self) -> int:
+        """Returns the number of nodes in both frontiers."""
+        return len(self._frontiers[FORWARD]) + len(self._frontiers[BACKWARD])
+
+    def getNumberOfExpanded(self) -> int:
+        """Returns the number of expansions of both directions. A node met by both sides counts twice."""
+        return self._expanded
+
+    def _reconstruct_path(self, meeting_node):
+        """Joins the path start -> meeting node (forward parents) with meeting node -> goal (backward parents)."""
+        ids = self._states[FORWARD].pathTo(meeting_node) + self._states[BACKWARD].pathTo(meeting_node)[-2::-1]
+        path = [self._graph.cell(cell_id) for cell_id in ids]
+        self._cost = len(path) - 1  # Cost is the length of the path minus one (number of moves)
+        return path
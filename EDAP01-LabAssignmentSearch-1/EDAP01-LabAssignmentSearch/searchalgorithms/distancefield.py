@@ -0,0 +1,185 @@
+import os
+from collections import OrderedDict
+
+import numpy
+
+from searchalgorithms.base import SearchAlgorithmBase
+from searchalgorithms.frontier import QueueFrontier
+from searchalgorithms.state import SearchState
+
+
+class DistanceField:
+    """Distances to one goal cell and the next cell to move to, for every cell of a maze.
+
+    Both arrays are indexed by linear cell id; -1 marks cells that cannot reach the goal.
+    Built once with a backward breadth-first search from the goal; afterwards an optimal
+    path from any start is a walk along next_hop in O(path length).
+    """
+
+    def __init__(self, distance, next_hop, columns, goal, settled=0) -> None:
+        self.distance = distance
+        self.next_hop = next_hop
+        self.columns = columns
+        self.goal = goal
+        self.settled = settled  # Cells reached while building the field
+
+    @classmethod
+    def build(cls, graph, goal):
+        """Level-synchronous backward BFS from the goal over the CSR adjacency of the graph."""
+        indptr, indices = graph.csr()
+        cells = graph.rows * graph.columns
+        distance = numpy.full(cells, -1, dtype=numpy.int32)
+        next_hop = numpy.full(cells, -1, dtype=numpy.int32)
+        goal_id = graph.cellId(goal)
+        distance[goal_id] = 0
+        next_hop[goal_id] = goal_id
+
+        frontier = numpy.array([goal_id], dtype=numpy.int64)
+        level = 0
+        settled = 1
+        while len(frontier):
+            level += 1
+            # Gather all neighbors of the frontier cells at once
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            total = int(counts.sum())
+            if total == 0:
+                break
+            positions = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts) + numpy.arange(total)
+            neighbors = indices[positions].astype(numpy.int64)
+            parents = numpy.repeat(frontier, counts)
+            new = distance[neighbors] < 0
+            neighbors, parents = neighbors[new], parents[new]
+            # A cell reached from several frontier cells keeps the first one
+            frontier, first = numpy.unique(neighbors, return_index=True)
+            distance[frontier] = level
+            next_hop[frontier] = parents[first]
+            settled += len(frontier)
+        return cls(distance, next_hop, graph.columns, goal, settled)
+
+    @property
+    def nbytes(self) -> int:
+        return self.distance.nbytes + self.next_hop.nbytes
+
+    def distanceFrom(self, start):
+        """Returns the number of moves from start to the goal, or None if the goal cannot be reached."""
+        d = int(self.distance[start[0] * self.columns + start[1]])
+        return d if d >= 0 else None
+
+    def pathFrom(self, start) -> list:
+        """Returns an optimal path from start to the goal (empty if the goal cannot be reached)."""
+        current = start[0] * self.columns + start[1]
+        if self.distance[current] < 0:
+            return []
+        next_hop = self.next_hop
+        path = [start]
+        goal_id = self.goal[0] * self.columns + self.goal[1]
+        while current != goal_id:
+            current = int(next_hop[current])
+            path.append(divmod(current, self.columns))
+        return path
+
+
+class DistanceFieldCache:
+    """LRU cache of distance fields keyed by (GridGraph.digest, goal), bounded by a memory budget in bytes.
+    If a directory is given, fields are also saved there and loaded back on a miss."""
+
+    def __init__(self, max_bytes=256 * 2**20, directory=None) -> None:
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._fields = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, key):
+        digest, goal = key
+        return os.path.join(self.directory, "{}_{}_{}.npz".format(digest, goal[0], goal[1]))
+
+    def get(self, graph, goal):
+        """Returns the distance field of goal in the compiled graph of a maze and whether it was built by this
+        call. The key is the digest the graph already has, so a hit does not look at the grid again."""
+        key = (graph.digest, tuple(goal))
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            self.hits += 1
+            return field, False
+        self.misses += 1
+
+        built = False
+        if self.directory is not None and os.path.exists(self._file(key)):
+            with numpy.load(self._file(key)) as data:
+                field = DistanceField(data["distance"], data["next_hop"], int(data["columns"]), tuple(goal))
+        else:
+            field = DistanceField.build(graph, tuple(goal))
+            built = True
+            if self.directory is not None:
+                os.makedirs(self.directory, exist_ok=True)
+                numpy.savez(self._file(key), distance=field.distance, next_hop=field.next_hop, columns=field.columns)
+
+        self._fields[key] = field
+        self._bytes += field.nbytes
+        # Evict the least recently used fields, but always keep the one just added
+        while self._bytes > self.max_bytes and len(self._fields) > 1:
+            _, evicted = self._fields.popitem(last=False)
+            self._bytes -= evicted.nbytes
+        return field, built
+
+    def clear(self) -> None:
+        self._fields.clear()
+        self._bytes = 0
+
+
+# Cache shared by every distancefield search in the process
+default_cache = DistanceFieldCache()
+
+
+class distancefield(SearchAlgorithmBase):
+    capabilities = frozenset({"optimal", "vectorized"})
+    cache = default_cache
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def reset(self, grid, start, goal):
+        super().reset(grid, start, goal)
+        # If you want to initialize other stuff, put it here
+        self._expanded = 0
+        self._cache_hit = False
+
+    def _new_state(self, size):
+        # Cached queries only walk the path: a sparse state, not arrays the size of the grid
+        return SearchState(size, sparse=True)
+
+    def _new_frontier(self, size):
+        # Only holds the start, pushed by the base class
+        return QueueFrontier(size, sparse=True)
+
+    def step(self):
+        """
+        Answers the query from the distance field of the goal.
+        - The first query for a goal builds the field (a backward BFS over the whole maze) and caches it.
+        - Later queries with the same maze and goal only walk the next-hop pointers from the start.
+        """
+        if self._done:
+            return  # If already done, do nothing
+
+        field, built = self.cache.get(self._graph, self._goal)
+        self._cache_hit = not built
+        self._path = field.pathFrom(self._start)
+        for node in self._path:
+            self._mark_explored(node)
+        self._expanded = (field.settled if built else 0) + len(self._path)
+        self._cost = max(len(self._path) - 1, 0) # Cost is the length of the path minus one (number of moves)
+        self._max_depth = self._cost
+        self._max_nodes_in_memory = len(self._state.explored)
+        self._done = True
+
+    def getNumberOfExpanded(self) -> int:
+        """Returns the cells settled while building the field (0 on a cache hit) plus the cells on the path walk."""
+        return self._expanded
+
+    def isCacheHit(self) -> bool:
+        """Returns True if the query was answered from a field that was already cached."""
+        return self._cache_hit
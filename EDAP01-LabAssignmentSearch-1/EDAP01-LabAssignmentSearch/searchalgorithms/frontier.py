@@ -0,0 +1,174 @@
+import heapq
+from array import array
+from collections import deque
+from itertools import count
+
+from searchalgorithms.state import SparseArray
+
+
+class PriorityFrontier:
+    """Binary-heap priority queue of cell ids, used as the frontier of ucs, gbfs and astar.
+
+    Pushing a node that is already in the frontier replaces its priority without
+    searching the heap; the old heap item is only recognized as stale (lazy deletion)
+    and skipped when it reaches the top. Ties on the priority are broken by
+    insertion order, so the search is deterministic. Costs and parents are kept
+    by the search in its SearchState, not in the frontier.
+    """
+
+    def __init__(self, size) -> None:
+        self._heap = []  # Heap items: (priority, insertion counter, cell id)
+        self._live = array("q", [-1]) * size  # cell id -> insertion counter of its live heap item, -1 if not in the frontier
+        self._size = 0
+        self._counter = count()
+
+    def push(self, node, priority) -> None:
+        """Adds node with the given priority, or replaces the priority if node is already in the frontier."""
+        if self._live[node] < 0:
+            self._size += 1
+        counter = next(self._counter)
+        self._live[node] = counter
+        heapq.heappush(self._heap, (priority, counter, node))
+
+    def pop(self):
+        """Removes and returns the node with the lowest priority."""
+        heap, live = self._heap, self._live
+        while heap:
+            _, counter, node = heapq.heappop(heap)
+            if live[node] == counter:
+                live[node] = -1
+                self._size -= 1
+                return node
+        raise IndexError("pop from an empty frontier")
+
+    def remove(self, node) -> None:
+        """Removes node from the frontier if it is there; its heap item becomes stale."""
+        if self._live[node] >= 0:
+            self._live[node] = -1
+            self._size -= 1
+
+    def peekPriority(self):
+        """Returns the lowest priority in the frontier without removing it, or None if the frontier is empty."""
+        heap, live = self._heap, self._live
+        while heap and live[heap[0][2]] != heap[0][1]:
+            heapq.heappop(heap)  # Drop stale items from the top
+        return heap[0][0] if heap else None
+
+    def __contains__(self, node) -> bool:
+        return self._live[node] >= 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        # Live nodes only, in heap order
+        live = self._live
+        return (node for _, counter, node in self._heap if live[node] == counter)
+
+
+class QueueFrontier:
+    """FIFO queue (bfs) or LIFO stack (dfs) frontier of cell ids with constant-time membership tests.
+
+    The priority argument of push is accepted for a common interface with
+    PriorityFrontier and ignored. With sparse=True the membership counts are a
+    SparseArray instead of an array the size of the grid.
+    """
+
+    def __init__(self, size, lifo=False, sparse=False) -> None:
+        self._queue = deque()
+        # cell id -> number of entries of the node in the queue
+        self._members = SparseArray(0) if sparse else array("i", [0]) * size
+        self._lifo = lifo
+
+    def push(self, node, priority=None) -> None:
+        """Adds node at the back of the queue."""
+        self._queue.append(node)
+        self._members[node] += 1
+
+    def pop(self):
+        """Removes and returns the first (FIFO) or the last (LIFO) node."""
+        node = self._queue.pop() if self._lifo else self._queue.popleft()
+        self._members[node] -= 1
+        return node
+
+    def __contains__(self, node) -> bool:
+        return self._members[node] > 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __iter__(self):
+        # Nodes in insertion order
+        return iter(self._queue)
+
+
+class BucketFrontier:
+    """Bucket queue (Dial's algorithm) of cell ids for small integer priorities, used by ucs and astar.
+
+    Every priority value has a FIFO bucket, and pop takes from the lowest non-empty
+    bucket, so push and pop are O(1) instead of O(log n). This relies on the
+    priorities popped never decreasing by much: true for path costs with positive
+    integer cell costs, and for g(n) + h(n) with an integer consistent heuristic.
+    Only non-empty buckets exist, so the queue never holds more buckets than
+    distinct priorities in the frontier. Ties are broken by insertion order, like
+    PriorityFrontier, so both frontiers expand the same nodes in the same order.
+    """
+
+    def __init__(self, size) -> None:
+        self._buckets = {}  # priority -> deque of (insertion counter, cell id)
+        self._cursor = None  # Lowest priority that may have a bucket
+        self._live = array("q", [-1]) * size  # cell id -> insertion counter of its live item, -1 if not in the frontier
+        self._size = 0
+        self._counter = count()
+
+    def push(self, node, priority) -> None:
+        """Adds node with the given integer priority, or replaces the priority if node is already in the frontier."""
+        if self._live[node] < 0:
+            self._size += 1
+        counter = next(self._counter)
+        self._live[node] = counter
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = deque()
+            if self._cursor is None or priority < self._cursor:
+                self._cursor = priority
+        bucket.append((counter, node))
+
+    def _lowest_bucket(self):
+        """Moves the cursor to the lowest bucket with a live item and returns that bucket, or None."""
+        buckets, live = self._buckets, self._live
+        while buckets:
+            bucket = buckets.get(self._cursor)
+            if bucket is not None:
+                while bucket and live[bucket[0][1]] != bucket[0][0]:
+                    bucket.popleft()  # Drop stale items
+                if bucket:
+                    return bucket
+                del buckets[self._cursor]
+            self._cursor += 1
+        return None
+
+    def pop(self):
+        """Removes and returns the node with the lowest priority."""
+        bucket = self._lowest_bucket()
+        if bucket is None:
+            raise IndexError("pop from an empty frontier")
+        _, node = bucket.popleft()
+        self._live[node] = -1
+        self._size -= 1
+        return node
+
+    def peekPriority(self):
+        """Returns the lowest priority in the frontier without removing it, or None if the frontier is empty."""
+        return self._cursor if self._lowest_bucket() is not None else None
+
+    def __contains__(self, node) -> bool:
+        return self._live[node] >= 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        # Live nodes only, bucket by bucket
+        live = self._live
+        return (node for bucket in self._buckets.values() for counter, node in bucket if live[node] == counter)
@@ -1,15 +1,20 @@
 from searchalgorithms.base import SearchAlgorithmBase
-import numpy as np
+from searchalgorithms.frontier import PriorityFrontier
 
 
 class gbfs(SearchAlgorithmBase):
+    expansion_loop = "first"  # solve() runs in the loop of the base class
+
     def __init__(self) -> None:
         super().__init__()
            
     def reset(self, grid, start, goal): 
         super().reset(grid, start, goal)
         # If you want to initialize other stuff, put it here
-        self._parent_map = {}
+
+    def _new_frontier(self, size):
+        # Priority queue frontier ordered by heuristic value h(n)
+        return PriorityFrontier(size)
     
     def heuristic(self, node):
         # Euclidean distance heuristic from node n to goal
@@ -18,6 +23,11 @@ class gbfs(SearchAlgorithmBase):
         # Manhattan distance heuristic from node n to goal
         return abs(node[0] - self._goal[0]) + abs(node[1] - self._goal[1])
 
+    def _solve_priority(self):
+        # Priority h(n), through self.heuristic so that overriding it changes solve() like step()
+        heuristic, cell = self.heuristic, self._graph.cell
+        return lambda neighbor, g: heuristic(cell(neighbor))
+
     def step(self):
         """
         Performs one step of the Greedy Best-First Search (GBFS) algorithm.
@@ -47,64 +57,33 @@ class gbfs(SearchAlgorithmBase):
             return
 
         # COntinue with the UFS algorithm
-        # Frontier tuple: (node, heuristic_h, cost_g, parent)
-        index_of_min_heuristic = np.argmin([item[1] for item in self._frontier])
-        current_node, h, g, parent = self._frontier.pop(index_of_min_heuristic)
+        state = self._state
+        current_node = self._frontier.pop() # Node with the lowest heuristic value, O(log n)
+        g = state.g[current_node]
 
-        
         # Mark current node as explored
-        if current_node not in self._explored:
-            self._explored.append(current_node)
+        state.close(current_node)
             
         # Goal check
-        if current_node == self._goal:
+        if current_node == self._goal_id:
             self._done = True
             self._cost = g
-            self._path = self._reconstruct_path(current_node,current_node)
+            self._path = self._reconstruct_path(current_node)
             return   
         
-        # Get grid dimensions
-        # Get row and column numbers of map, and of current node 
-        row_num, col_num = self._grid.shape
-        r,c = current_node
+        # Explore neighbors, precomputed once per maze in the adjacency graph (in bounds and not occupied)
+        cell = self._graph.cell
+        depth = state.depth[current_node] + 1
+        for neighbor in self._graph.neighborIds(current_node):  # Up, Down, Left, Right
+            # Only add if neighbor is not already explored or not in frontier
+            if not state.closed[neighbor] and neighbor not in self._frontier:
+                # Add neighbor to frontier
+                self._frontier.push(neighbor, self.heuristic(cell(neighbor)))
+                state.reach(neighbor, current_node, g + self._graph.costs[neighbor], depth)  # Cost of the path, not its length
 
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]: # Up, Down, Left, Right: (delta_row, delta_column) 
-            neighbor= (r + dr, c + dc)
-            h_neighbor = self.heuristic(neighbor)
-            # Check if neighbor is within bounds
-            if 0 <= neighbor[0] < row_num and 0 <= neighbor[1] < col_num and self._grid[neighbor[0],neighbor[1]] != 1: # 1 represents occupied cell, probably wall
-                # Only add if neighbor is not already explored or not in frontier
-                if neighbor not in self._explored and neighbor not in [n[0] for n in self._frontier]:
-                    # Add neighbor to frontier
-                    self._frontier.append((neighbor, h_neighbor, g + 1, current_node))
-                    self._parent_map[neighbor] = current_node
-                    #print("Current parent map: ", self._parent_map)
-                    #print("Current frontier: ", self._frontier)
+                # Depth tracking
+                self._max_depth = max(self._max_depth, depth)
 
-                    # Depth tracking
-                    self._depth_map[neighbor] = self._depth_map[current_node] + 1
-                    self._max_depth = max(self._max_depth, self._depth_map[neighbor])
-        
-                
-        
         # Update max frontier size
         self._max_frontier_size = max(self._max_frontier_size, len(self._frontier))
-        self._max_nodes_in_memory = max(self._max_nodes_in_memory, len(self._frontier) + len(self._explored))
-    
-    def _reconstruct_path(self, goal, parent):
-        """Reconstructs the path from parent to goal/current node using parent pointers."""
-        path = [goal]
-        current = parent
-        while current != self._start:
-            current = self._parent_map[current]
-            path.append(current)
-            # Find parent of current in frontier or explore
-            #for (n, _, _, p) in self._frontier + [(e, 0, 0, e) for e in self._explored]:
-            #    if n == current:
-            #        current = p
-            #        break
-        path.append(self._start)
-        path.reverse()
-        self._cost = len(path) - 1  # Cost is the length of the path minus one (number of moves)
-        return path
-         
\ No newline at end of file
+        self._max_nodes_in_memory = max(self._max_nodes_in_memory, len(self._frontier) + len(state.explored))
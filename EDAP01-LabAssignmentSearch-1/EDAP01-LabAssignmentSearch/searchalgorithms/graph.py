@@ -0,0 +1,158 @@
+import copy
+import hashlib
+from array import array
+from collections import OrderedDict
+
+import numpy
+
+# Neighbor order used by every algorithm: Up, Down, Left, Right as (delta_row, delta_column),
+# bit i of a cell mask is set if the neighbor in direction i can be entered
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+# Grid values: 0 free, 1 wall, 2 start, 3 goal, all with a move cost of 1.
+# A value v >= TERRAIN is a free cell whose move cost is v - 2 (4 costs 2, 5 costs 3, ...).
+TERRAIN = 4
+
+# Directions of every possible mask value, so that neighbors() does not test the bits one by one
+_DELTAS_BY_MASK = [tuple(d for i, d in enumerate(DIRECTIONS) if mask & (1 << i)) for mask in range(16)]
+
+
+class GridGraph:
+    """The grid compiled once into a 4-connected graph over linear cell ids (row * columns + column).
+
+    Every cell stores a 4-bit mask of the neighbors it can move to, so finding the
+    neighbors of a node is one lookup instead of four bounds checks and grid reads.
+    costs[i] is the cost of moving into cell i, see TERRAIN.
+    The same adjacency is also available as CSR arrays (indptr, indices) for
+    array-based algorithms; those are built on first use.
+    """
+
+    def __init__(self, grid) -> None:
+        grid = numpy.asarray(grid)
+        self.shape = grid.shape
+        self.rows, self.columns = grid.shape
+        self.size = grid.size
+        self.free = grid != 1  # 1 represents occupied cell, probably wall
+        cost = numpy.where(grid >= TERRAIN, grid - 2, 1).astype(numpy.int32)
+        self.max_cost = int(cost[self.free].max()) if self.free.any() else 1
+        self.uniform_cost = self.max_cost == 1  # True for plain mazes, every move costs 1
+        self.costs = array("i", cost.tobytes())  # Indexing gives a Python int, unlike a numpy array
+
+        mask = numpy.zeros(self.shape, dtype=numpy.uint8)
+        free = self.free
+        # A move is allowed if both cells are free
+        mask[1:, :] |= numpy.where(free[1:, :] & free[:-1, :], UP, 0).astype(numpy.uint8)
+        mask[:-1, :] |= numpy.where(free[:-1, :] & free[1:, :], DOWN, 0).astype(numpy.uint8)
+        mask[:, 1:] |= numpy.where(free[:, 1:] & free[:, :-1], LEFT, 0).astype(numpy.uint8)
+        mask[:, :-1] |= numpy.where(free[:, :-1] & free[:, 1:], RIGHT, 0).astype(numpy.uint8)
+        self.mask = mask
+        self._mask_bytes = bytearray(mask.tobytes())  # Indexing gives a Python int, much faster than a numpy scalar
+        # Cell id offsets of every possible mask value, for neighborIds()
+        self._offsets_by_mask = [tuple(dr * self.columns + dc for dr, dc in deltas) for deltas in _DELTAS_BY_MASK]
+        self.digest = self._digest()
+        self._csr = None
+
+    def _digest(self) -> str:
+        # Hash of what the searches see: the shape, the moves and their costs. Grids that only differ
+        # in dtype or in where start and goal are marked have the same digest.
+        digest = hashlib.blake2b(numpy.array(self.shape, dtype=numpy.int64).tobytes(), digest_size=16)
+        digest.update(self._mask_bytes)
+        digest.update(self.costs.tobytes())
+        return digest.hexdigest()
+
+    def copy(self):
+        """Returns an independent copy that can be changed with update() without touching this graph,
+        which may be shared through graph_for()."""
+        graph = copy.copy(self)
+        graph.free, graph.mask = self.free.copy(), self.mask.copy()
+        graph.costs, graph._mask_bytes = array("i", self.costs), bytearray(self._mask_bytes)
+        return graph
+
+    def update(self, changes) -> list:
+        """Changes cells in place, changes being ((row, column), value) pairs with grid values.
+        Only the masks of the changed cells and their neighbors are recomputed. Returns the ids of those
+        cells, whose moves or cost may have changed, in ascending order.
+        Never update a graph returned by graph_for(), update a copy() instead."""
+        touched = set()
+        for (r, c), value in changes:
+            cell_id = r * self.columns + c
+            self.free[r, c] = value != 1
+            self.costs[cell_id] = value - 2 if value >= TERRAIN else 1
+            touched.add((r, c))
+            touched.update((r + dr, c + dc) for dr, dc in DIRECTIONS
+                           if 0 <= r + dr < self.rows and 0 <= c + dc < self.columns)
+        for r, c in touched:
+            bits = 0
+            if self.free[r, c]:
+                for i, (dr, dc) in enumerate(DIRECTIONS):
+                    if self.isFree(r + dr, c + dc):
+                        bits |= 1 << i
+            self.mask[r, c] = bits
+            self._mask_bytes[r * self.columns + c] = bits
+        cost = numpy.frombuffer(self.costs, dtype=numpy.int32).reshape(self.shape)
+        self.max_cost = int(cost[self.free].max()) if self.free.any() else 1
+        self.uniform_cost = self.max_cost == 1
+        self.digest = self._digest()
+        self._csr = None
+        return sorted(r * self.columns + c for r, c in touched)
+
+    def neighbors(self, node) -> list:
+        """Returns the free 4-connected neighbors of node, in Up, Down, Left, Right order."""
+        r, c = node
+        return [(r + dr, c + dc) for dr, dc in _DELTAS_BY_MASK[self._mask_bytes[r * self.columns + c]]]
+
+    def neighborIds(self, cell_id) -> list:
+        """Returns the cell ids of the free 4-connected neighbors of cell_id, in Up, Down, Left, Right order."""
+        return [cell_id + offset for offset in self._offsets_by_mask[self._mask_bytes[cell_id]]]
+
+    def isFree(self, r, c) -> bool:
+        """Returns True if (r, c) is inside the grid and not occupied."""
+        return 0 <= r < self.rows and 0 <= c < self.columns and bool(self.free[r, c])
+
+    def cellId(self, node) -> int:
+        return node[0] * self.columns + node[1]
+
+    def cell(self, cell_id):
+        return divmod(cell_id, self.columns)
+
+    def csr(self):
+        """Returns the adjacency as CSR arrays (indptr, indices) over linear cell ids:
+        the neighbors of cell i are indices[indptr[i]:indptr[i + 1]]."""
+        if self._csr is None:
+            flat = self.mask.reshape(-1)
+            ids = numpy.arange(flat.size, dtype=numpy.int64)
+            offsets = numpy.array([dr * self.columns + dc for dr, dc in DIRECTIONS], dtype=numpy.int64)
+            has = numpy.stack([(flat >> i) & 1 for i in range(4)], axis=1).astype(bool)  # (cells, 4) in direction order
+            degree = has.sum(axis=1)
+            indptr = numpy.zeros(flat.size + 1, dtype=numpy.int64)
+            numpy.cumsum(degree, out=indptr[1:])
+            index_dtype = numpy.int32 if flat.size < 2**31 else numpy.int64
+            indices = (ids[:, None] + offsets[None, :])[has].astype(index_dtype)
+            self._csr = (indptr, indices)
+        return self._csr
+
+
+# Compiled graphs of the most recently used grids, keyed by grid content
+_cache = OrderedDict()
+cache_size = 8
+
+
+def grid_key(grid) -> tuple:
+    """Content key of a grid: shape, dtype and a hash of the cells."""
+    grid = numpy.ascontiguousarray(grid)
+    return grid.shape, grid.dtype.str, hashlib.blake2b(grid.data, digest_size=16).hexdigest()
+
+
+def graph_for(grid) -> GridGraph:
+    """Returns the compiled graph of a grid, building it only if the same maze was not compiled recently."""
+    key = grid_key(grid)
+    graph = _cache.get(key)
+    if graph is None:
+        graph = GridGraph(grid)
+        _cache[key] = graph
+        while len(_cache) > cache_size:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return graph
@@ -0,0 +1,456 @@
+import copy
+import heapq
+from collections import OrderedDict
+
+import numpy as np
+
+from searchalgorithms import instrumentation
+from searchalgorithms.base import SearchAlgorithmBase
+from searchalgorithms.frontier import PriorityFrontier
+from searchalgorithms.graph import RIGHT, DOWN
+
+# Entrances at least this wide get a transition at both ends instead of one in the middle
+WIDE_ENTRANCE = 6
+
+
+def _local_search(graph, bounds, source, targets, reverse=False):
+    """Dijkstra from source that never leaves bounds (first row, first column, end row, end column).
+    With reverse the costs are those of paths from the cells to source. Stops once every target is settled.
+    Returns the costs of the settled targets as a dict, the parent of every reached cell and the
+    number of expanded cells."""
+    r0, c0, r1, c1 = bounds
+    columns, costs, neighbors = graph.columns, graph.costs, graph.neighborIds
+    cost = {source: 0}
+    parent = {source: source}
+    settled = set()
+    remaining = set(targets)
+    heap = [(0, source)]
+    expanded = 0
+    while heap and remaining:
+        g, node = heapq.heappop(heap)
+        if node in settled:
+            continue  # Stale heap item
+        settled.add(node)
+        remaining.discard(node)
+        expanded += 1
+        for neighbor in neighbors(node):
+            r, c = divmod(neighbor, columns)
+            if not (r0 <= r < r1 and c0 <= c < c1):
+                continue
+            # Moving into a cell costs its terrain cost, backwards the move into node is paid
+            g_neighbor = g + (costs[node] if reverse else costs[neighbor])
+            if g_neighbor < cost.get(neighbor, g_neighbor + 1):
+                cost[neighbor] = g_neighbor
+                parent[neighbor] = node
+                heapq.heappush(heap, (g_neighbor, neighbor))
+    return {target: cost[target] for target in targets if target in settled}, parent, expanded
+
+
+class Abstraction:
+    """The abstract graph of HPA* for one maze: the grid split into square clusters, the entrance cells on
+    the cluster borders and the path costs between them.
+
+    Two neighboring clusters are connected wherever a cell of one can move into the cell across the
+    border. Every maximal run of such cell pairs is an entrance; narrow ones get one transition in the
+    middle, wide ones (WIDE_ENTRANCE cells or more) one at each end. The two cells of a transition are
+    abstract nodes joined by an inter edge. Inside a cluster, every pair of its nodes is joined by an intra
+    edge with the cost of the cheapest path that stays in the cluster. Nodes are cell ids and edges are
+    directed, because a move costs the terrain cost of the cell it enters.
+    """
+
+    def __init__(self, graph, cluster_size) -> None:
+        self.cluster_size = cluster_size
+        self.rows, self.columns = graph.rows, graph.columns
+        self.cluster_rows = -(-self.rows // cluster_size)  # ceil division
+        self.cluster_columns = -(-self.columns // cluster_size)
+        self.digest = graph.digest  # GridGraph.digest of the maze the abstraction was built for
+        self._borders = {}  # (cluster, cluster to the right or below) -> list of transitions (cell id, cell id)
+        self.nodes = {}  # cluster -> sorted entrance cell ids
+        self._intra = {}  # entrance cell id -> list of (entrance cell id, cost) in the same cluster
+        self.edges = {}  # entrance cell id -> list of (cell id, cost), intra and inter edges
+        self.build_expanded = 0  # Cells expanded by the local searches while building and updating
+        self._unbuilt = []  # Clusters not built yet, the next one last, see buildStep()
+
+    @classmethod
+    def start(cls, graph, cluster_size=10):
+        """Returns an abstraction with no cluster built yet. Call buildStep() until isBuilt()."""
+        abstraction = cls(graph, cluster_size)
+        abstraction._unbuilt = list(range(abstraction.cluster_rows * abstraction.cluster_columns))[::-1]
+        return abstraction
+
+    @classmethod
+    def build(cls, graph, cluster_size=10):
+        """Finds the entrances of every border and the intra edges of every cluster."""
+        abstraction = cls.start(graph, cluster_size)
+        while not abstraction.isBuilt():
+            abstraction.buildStep(graph)
+        return abstraction
+
+    def buildStep(self, graph) -> None:
+        """Builds the next cluster: finds the entrances of its borders that are not known yet, joins its
+        entrances with intra edges and links them."""
+        cluster = self._unbuilt.pop()
+        for border in self._borders_of(cluster):
+            if border not in self._borders:
+                self._borders[border] = self._transitions(graph, border)
+        self._connect(graph, cluster)
+        self._link(graph, [cluster])
+
+    def isBuilt(self) -> bool:
+        return not self._unbuilt
+
+    def copy(self):
+        """Returns a copy that can be changed with update() without touching this abstraction, which may be
+        shared through abstraction_for()."""
+        abstraction = copy.copy(self)
+        abstraction._borders, abstraction.nodes = dict(self._borders), dict(self.nodes)
+        abstraction._intra, abstraction.edges = dict(self._intra), dict(self.edges)
+        abstraction._unbuilt = list(self._unbuilt)
+        return abstraction
+
+    def update(self, graph, touched) -> list:
+        """Repairs the abstraction in place after the cells touched changed in graph (see GridGraph.update).
+        Only the borders of the clusters with touched cells are searched for entrances again, and only the
+        clusters whose cells or entrances changed get new intra edges. Returns those clusters."""
+        changed = {self.clusterOf(cell_id) for cell_id in touched}
+        rebuilt = set(changed)
+        for cluster in changed:
+            for border in self._borders_of(cluster):
+                transitions = self._transitions(graph, border)
+                if transitions != self._borders[border]:
+                    self._borders[border] = transitions
+                    rebuilt.update(border)  # The entrances of the cluster across the border moved too
+        for cluster in rebuilt:
+            self._connect(graph, cluster)
+        # An inter edge costs the terrain cost of the cell it enters, so the edges from the clusters next to a
+        # changed one are linked again too
+        linked = set(rebuilt)
+        for cluster in changed:
+            for border in self._borders_of(cluster):
+                linked.update(border)
+        self._link(graph, sorted(linked))
+        self.digest = graph.digest
+        return sorted(rebuilt)
+
+    def clusterOf(self, cell_id) -> int:
+        r, c = divmod(cell_id, self.columns)
+        return (r // self.cluster_size) * self.cluster_columns + c // self.cluster_size
+
+    def bounds(self, cluster) -> tuple:
+        """Returns the cells of cluster as (first row, first column, end row, end column)."""
+        i, j = divmod(cluster, self.cluster_columns)
+        size = self.cluster_size
+        return i * size, j * size, min((i + 1) * size, self.rows), min((j + 1) * size, self.columns)
+
+    def _borders_of(self, cluster) -> list:
+        """Returns the borders of cluster as (cluster, cluster to the right or below) pairs."""
+        i, j = divmod(cluster, self.cluster_columns)
+        borders = []
+        if j > 0:
+            borders.append((cluster - 1, cluster))
+        if i > 0:
+            borders.append((cluster - self.cluster_columns, cluster))
+        if j + 1 < self.cluster_columns:
+            borders.append((cluster, cluster + 1))
+        if i + 1 < self.cluster_rows:
+            borders.append((cluster, cluster + self.cluster_columns))
+        return borders
+
+    def _transitions(self, graph, border) -> list:
+        """Returns the transitions (cell id in the first cluster, cell id in the second) of a border."""
+        first, second = border
+        r0, c0, r1, c1 = self.bounds(first)
+        columns = self.columns
+        if second != first + self.cluster_columns:
+            # Vertical border: the last column of first and the first column of second
+            cells = [r * columns + c1 - 1 for r in range(r0, r1)]
+            step, bit = 1, RIGHT
+        else:
+            # Horizontal border: the last row of first and the first row of second
+            cells = [(r1 - 1) * columns + c for c in range(c0, c1)]
+            step, bit = columns, DOWN
+        mask = graph.mask.reshape(-1)
+        transitions = []
+        run = []
+        for cell_id in cells + [None]:  # None ends the last run
+            if cell_id is not None and mask[cell_id] & bit:
+                run.append(cell_id)
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions += [(run[0], run[0] + step), (run[-1], run[-1] + step)]
+            elif run:
+                middle = run[len(run) // 2]
+                transitions.append((middle, middle + step))
+            run = []
+        return transitions
+
+    def _connect(self, graph, cluster) -> None:
+        """Collects the entrance nodes of cluster and joins them with intra edges, one local search each."""
+        for node in self.nodes.get(cluster, ()):
+            self._intra.pop(node, None)
+            self.edges.pop(node, None)
+        nodes = set()
+        for border in self._borders_of(cluster):
+            side = 0 if border[0] == cluster else 1
+            nodes.update(transition[side] for transition in self._borders[border])
+        nodes = sorted(nodes)
+        self.nodes[cluster] = nodes
+        bounds = self.bounds(cluster)
+        for node in nodes:
+            costs, _, expanded = _local_search(graph, bounds, node, nodes)
+            self.build_expanded += expanded
+            self._intra[node] = [(other, cost) for other, cost in costs.items() if other != node]
+
+    def _link(self, graph, clusters) -> None:
+        """Rebuilds the edge lists of the entrances of clusters from their intra edges and the transitions of
+        the cluster borders."""
+        costs = graph.costs
+        for cluster in clusters:
+            edges = {node: list(self._intra[node]) for node in self.nodes[cluster]}
+            for border in self._borders_of(cluster):
+                side = 0 if border[0] == cluster else 1
+                for transition in self._borders[border]:
+                    # Crossing the border costs the terrain cost of the cell entered
+                    node, other = transition[side], transition[1 - side]
+                    edges[node].append((other, costs[other]))
+            self.edges.update(edges)
+
+    def neighbors(self, node) -> list:
+        """Returns the (cell id, cost) edges out of an entrance node, [] for any other cell."""
+        return self.edges.get(node, [])
+
+    def getNumberOfNodes(self) -> int:
+        return len(self.edges)
+
+    def getNumberOfEdges(self) -> int:
+        return sum(len(edges) for edges in self.edges.values())
+
+
+# Abstractions of the most recently used mazes, keyed by (graph digest, cluster size)
+_cache = OrderedDict()
+cache_size = 8
+
+
+def _store(abstraction) -> None:
+    _cache[(abstraction.digest, abstraction.cluster_size)] = abstraction
+    _cache.move_to_end((abstraction.digest, abstraction.cluster_size))
+    while len(_cache) > cache_size:
+        _cache.popitem(last=False)
+
+
+def _cached(graph, cluster_size):
+    abstraction = _cache.get((graph.digest, cluster_size))
+    if abstraction is not None:
+        _cache.move_to_end((graph.digest, cluster_size))
+    return abstraction
+
+
+def abstraction_for(graph, cluster_size=10):
+    """Returns the abstraction of a compiled graph and whether it was built by this call. Every maze is
+    only abstracted once as long as it stays among the cache_size most recently used ones."""
+    abstraction = _cached(graph, cluster_size)
+    if abstraction is not None:
+        return abstraction, False
+    abstraction = Abstraction.build(graph, cluster_size)
+    _store(abstraction)
+    return abstraction, True
+
+
+class hpastar(SearchAlgorithmBase):
+    """Hierarchical Pathfinding A* (HPA*): A* over the entrances between clusters of the maze, then
+    refinement of the abstract path into cells.
+
+    The abstraction of the maze (see Abstraction) is built on the first search, one cluster per step() so
+    that deadlines and step limits hold during the build too, and cached per maze, so later searches on the
+    same maze only pay for three small parts:
+        insertion    local searches that connect the start and the goal to the entrances of their clusters
+        abstract     A* over the abstract graph, one expansion per step()
+        refinement   a local search inside one cluster for every intra edge of the abstract path
+    The path is near-optimal: it may be a little longer than the shortest one, because paths between two
+    entrances stay inside their cluster and only cross borders at transitions.
+    """
+    capabilities = frozenset({"weighted"})
+    cluster_size = 10  # Cells per cluster side
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def reset(self, grid, start, goal, graph=None):
+        super().reset(grid, start, goal, graph)
+        # If you want to initialize other stuff, put it here
+        self._abstraction = None  # Looked up or built in the first steps
+        self._building = None  # Abstraction being built, one cluster per step
+        self._cache_hit = False
+        self._query_edges = {}  # Edges of the start and the goal, which are only nodes for this search
+        self._abstract_expanded = 0
+        self._concrete_expanded = 0
+        self._updates = 0
+
+    def _new_frontier(self, size):
+        # Abstract nodes ordered by f(n) = g(n) + h(n), with the start pushed by the base class
+        return PriorityFrontier(size)
+
+    def heuristic(self, node):
+        # Manhattan distance heuristic from node n to goal
+        return abs(node[0] - self._goal[0]) + abs(node[1] - self._goal[1])
+
+    def _prepare(self) -> None:
+        """Looks up the abstraction or builds one more cluster of it. Once it is complete, caches it and
+        inserts the start and the goal."""
+        graph = instrumentation.unwrap(self._graph)
+        if self._building is None:
+            self._abstraction = _cached(graph, self.cluster_size)
+            self._cache_hit = self._abstraction is not None
+            if self._cache_hit:
+                self._insert()
+                return
+            self._building = Abstraction.start(graph, self.cluster_size)
+        self._building.buildStep(graph)
+        if self._building.isBuilt():
+            self._abstraction, self._building = self._building, None
+            _store(self._abstraction)
+            self._insert()
+
+    def _insert(self) -> None:
+        """Connects the start and the goal to the entrances of their clusters. Inserted as edges of this
+        search only, the cached abstraction is left unchanged."""
+        abstraction, start, goal = self._abstraction, self._start_id, self._goal_id
+        start_cluster, goal_cluster = abstraction.clusterOf(start), abstraction.clusterOf(goal)
+
+        targets = abstraction.nodes[start_cluster] + ([goal] if goal_cluster == start_cluster else [])
+        costs, _, expanded = _local_search(self._graph, abstraction.bounds(start_cluster), start, targets)
+        self._concrete_expanded += expanded
+        self._query_edges[start] = [(node, cost) for node, cost in costs.items() if node != start]
+
+        costs, _, expanded = _local_search(self._graph, abstraction.bounds(goal_cluster), goal,
+                                           abstraction.nodes[goal_cluster], reverse=True)
+        self._concrete_expanded += expanded
+        for node, cost in costs.items():
+            if node != goal:
+                self._query_edges.setdefault(node, []).append((goal, cost))
+
+    def _refine(self, abstract_path) -> list:
+        """Turns the abstract path into cells: a local search per intra edge, inter edges are single moves."""
+        abstraction = self._abstraction
+        path = abstract_path[:1]
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            cluster = abstraction.clusterOf(a)
+            if cluster != abstraction.clusterOf(b):
+                path.append(b)
+                continue
+            _, parent, expanded = _local_search(self._graph, abstraction.bounds(cluster), a, [b])
+            self._concrete_expanded += expanded
+            segment = [b]
+            while segment[-1] != a:
+                segment.append(parent[segment[-1]])
+            path.extend(reversed(segment[:-1]))
+        return path
+
+    def step(self):
+        """
+        Performs one step of HPA*.
+        - The first step looks up the abstraction. If the maze is not cached, every step builds one cluster.
+        - Once the abstraction is complete, the start and the goal are inserted.
+        - Every next step expands one abstract node, like astar over the abstract graph.
+        - When the goal is expanded the abstract path is refined into cells.
+        """
+        if self._done:
+            return  # If already done, do nothing
+
+        if self._abstraction is None:
+            self._prepare()
+            return
+
+        # Check if the frontier is empty. If it is, mark the search as done (failure).
+        if not self._frontier:
+            self._done = True
+            self._path = []  # No path found
+            return
+
+        state = self._state
+        current_node = self._frontier.pop()
+        g = state.g[current_node]
+        state.close(current_node)
+        self._abstract_expanded += 1
+
+        # Goal check
+        if current_node == self._goal_id:
+            self._done = True
+            self._cost = g
+            path = self._refine(state.pathTo(current_node))
+            self._path = [self._graph.cell(cell_id) for cell_id in path]
+            self._max_depth = max(self._max_depth, len(path) - 1)
+            return
+
+        # Explore the abstract neighbors: edges of the abstraction and of the start and goal of this search
+        cell = self._graph.cell
+        depth = state.depth[current_node] + 1
+        for edges in (self._abstraction.neighbors(current_node), self._query_edges.get(current_node, ())):
+            for neighbor, cost in edges:
+                g_neighbor = g + cost
+                if not state.closed[neighbor] and (state.g[neighbor] < 0 or g_neighbor < state.g[neighbor]):
+                    self._frontier.push(neighbor, g_neighbor + self.heuristic(cell(neighbor)))
+                    state.reach(neighbor, current_node, g_neighbor, depth)
+
+        # Update max frontier size
+        self._max_frontier_size = max(self._max_frontier_size, len(self._frontier))
+        self._max_nodes_in_memory = max(self._max_nodes_in_memory, len(self._frontier) + len(state.explored))
+
+    def updateCells(self, changes) -> None:
+        """Changes cells of the maze, changes being ((row, column), value) pairs or a {(row, column): value} dict
+        with grid values (1 occupied, 0 free, >= 4 terrain). The abstraction is repaired around the changed
+        cells, cached for the changed maze, and the search starts over on the next step. An abstraction that
+        is not complete yet is built for the changed maze instead."""
+        if isinstance(changes, dict):
+            changes = changes.items()
+        changes = list(changes)
+        # Private copies: the grid, the compiled graph and the abstraction may be shared with other searches
+        self._grid = np.array(self._grid, copy=True)
+        for (r, c), value in changes:
+            self._grid[r, c] = value
+        graph = instrumentation.unwrap(self._graph).copy()
+        touched = graph.update(changes)
+        if self._abstraction is not None:
+            abstraction = self._abstraction.copy()
+            abstraction.update(graph, touched)
+            _store(abstraction)  # Found by the first step after the reset below, through the changed digest
+        updates = self._updates
+        # The changed graph is passed on, so the changed grid is not compiled again
+        self.reset(self._grid, self._start, self._goal, graph)
+        self._updates = updates + 1
+
+    # --- Getters for Visualization ---
+    def _memory_structures(self) -> dict:
+        structures = super()._memory_structures()
+        structures["query_edges"] = self._query_edges  # The abstraction is shared through abstraction_for(), like the graph
+        if self._building is not None:
+            structures["building"] = self._building  # Private until it is complete
+        if self._updates:
+            # Changed by updateCells(), so no other search shares them
+            structures.update(graph=instrumentation.unwrap(self._graph), grid=self._grid)
+        return structures
+
+    def getNumberOfExpanded(self) -> int:
+        """Returns the abstract and the concrete expansions of the search, see getAbstractExpanded and
+        getConcreteExpanded. Building the abstraction is not counted, see getAbstraction().build_expanded."""
+        return self._abstract_expanded + self._concrete_expanded
+
+    def getAbstractExpanded(self) -> int:
+        """Returns the number of abstract nodes expanded by A* over the abstract graph."""
+        return self._abstract_expanded
+
+    def getConcreteExpanded(self) -> int:
+        """Returns the number of cells expanded by the local searches of the insertion and the refinement."""
+        return self._concrete_expanded
+
+    def getAbstraction(self):
+        """Returns the abstraction of the maze, None before the first step."""
+        return self._abstraction
+
+    def isCacheHit(self) -> bool:
+        """Returns True if the abstraction of the maze was already cached."""
+        return self._cache_hit
+
+    def getNumberOfUpdates(self) -> int:
+        """Returns the number of updateCells() calls since the search started."""
+        return self._updates
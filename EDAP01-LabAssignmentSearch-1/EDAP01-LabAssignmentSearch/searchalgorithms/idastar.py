@@ -0,0 +1,127 @@
+from searchalgorithms.base import SearchAlgorithmBase
+from searchalgorithms.frontier import QueueFrontier
+from searchalgorithms.state import SearchState
+
+
+class idastar(SearchAlgorithmBase):
+    capabilities = frozenset({"optimal", "memory_bounded"})
+    # Most cells kept in the per-iteration table of best costs g(n); the table prunes paths that reach
+    # a cell again without being cheaper. Memory stays bounded by this plus the depth-first stack.
+    table_budget = 100000
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def reset(self, grid, start, goal):
+        super().reset(grid, start, goal)
+        # Depth-first stack, one frame per node on the current path: [node, g, unexplored neighbors]
+        self._stack = []
+        self._on_path = set()
+        self._best_g = {}  # Best g(n) reached in the current iteration, at most table_budget cells
+        self._threshold = None
+        self._next_threshold = self.heuristic(start) if start is not None else 0
+        self._iterations = 0
+        self._expanded = 0
+
+    def _new_state(self, size):
+        # Memory-bounded: a sparse state, not arrays the size of the grid
+        return SearchState(size, sparse=True)
+
+    def _new_frontier(self, size):
+        # Only holds the start, pushed by the base class; the depth-first stack is the real frontier
+        return QueueFrontier(size, sparse=True)
+
+    def heuristic(self, node):
+        # Manhattan distance heuristic from node n to goal
+        return abs(node[0] - self._goal[0]) + abs(node[1] - self._goal[1])
+
+    def _expand(self, node, g):
+        """Pushes node on the depth-first stack (one expansion) and tests it for the goal."""
+        self._expanded += 1
+        self._max_depth = max(self._max_depth, len(self._stack))
+        if node == self._goal:
+            self._done = True
+            self._path = [frame[0] for frame in self._stack] + [node]
+            self._cost = g
+            return
+        # Children are taken from the end, so reverse to try Up, Down, Left, Right in that order
+        self._stack.append([node, g, self._graph.neighbors(node)[::-1]])
+        self._on_path.add(node)
+
+    def step(self):
+        """
+        Performs one expansion of Iterative Deepening A* (IDA*).
+        - Depth-first search that cuts off every node with f(n) = g(n) + h(n) above the threshold.
+        - When an iteration ends without the goal, the threshold is raised to the lowest f(n)
+          that was cut off and the depth-first search restarts from the start node.
+        Memory is the current path with its unexplored neighbors, plus a bounded table of costs; no
+        explored set is kept, so getExplored() is empty.
+        """
+
+        if self._done:
+            return  # If already done, do nothing
+
+        while True:
+            if not self._stack:
+                # Start the next iteration, or fail if nothing was cut off in the last one
+                if self._next_threshold == float("inf"):
+                    self._done = True
+                    self._path = []  # No path found
+                    return
+                self._threshold = self._next_threshold
+                self._next_threshold = float("inf")
+                self._iterations += 1
+                self._on_path.clear()
+                self._best_g = {self._start: 0}
+                self._expand(self._start, 0)
+                break
+
+            frame = self._stack[-1]
+            node, g, children = frame
+            if not children:
+                # All neighbors tried, backtrack
+                self._stack.pop()
+                self._on_path.discard(node)
+                continue
+
+            child = children.pop()
+            g_child = g + 1
+            if child in self._on_path:
+                continue
+            best = self._best_g.get(child)
+            if best is not None and best <= g_child:
+                continue  # Reached before in this iteration at no higher cost, nothing new below it
+            f_child = g_child + self.heuristic(child)
+            if f_child > self._threshold:
+                self._next_threshold = min(self._next_threshold, f_child)
+                continue
+            if best is not None or len(self._best_g) < self.table_budget:
+                self._best_g[child] = g_child
+            self._expand(child, g_child)
+            break
+
+        # Update max frontier size: the unexplored neighbors on the stack
+        frontier_size = sum(len(frame[2]) for frame in self._stack)
+        self._max_frontier_size = max(self._max_frontier_size, frontier_size)
+        self._max_nodes_in_memory = max(self._max_nodes_in_memory, frontier_size + len(self._stack) + len(self._best_g))
+
+    def getFrontier(self):
+        """Returns the unexplored neighbors of the nodes on the current path as frontier tuples."""
+        return [(child, 0, frame[1] + 1, frame[0]) for frame in self._stack for child in frame[2]]
+
+    def _memory_structures(self) -> dict:
+        structures = super()._memory_structures()
+        structures.update(stack=self._stack, on_path=self._on_path, best_g=self._best_g)
+        return structures
+
+    def getFrontierSize(self) -> int:
+        """Returns the number of unexplored neighbors on the stack."""
+        return sum(len(frame[2]) for frame in self._stack)
+
+    def getNumberOfExpanded(self) -> int:
+        """Returns the number of expansions over all iterations, re-expansions included."""
+        return self._expanded
+
+    def getIterations(self) -> int:
+        """Returns the number of depth-first iterations (thresholds) so far."""
+        return self._iterations
@@ -0,0 +1,317 @@
+"""Opt-in per-step instrumentation of the search algorithms.
+
+    metrics, trace = MetricsCollector(), TraceCollector()
+    algorithm = astar()
+    algorithm.instrument(metrics, trace)
+    algorithm.reset(grid, start, goal)
+    algorithm.solve()
+    metrics.save("metrics.json")
+    trace.save("trace.json")  # Open in chrome://tracing or https://ui.perfetto.dev
+
+instrument() replaces reset, step and heuristic of that one algorithm
+object with wrappers and wraps its frontier and compiled graph after every
+reset, so the search loops themselves are unchanged and algorithms that are not
+instrumented run exactly the same code as before. An instrumented solve() calls
+step() in a loop, so every expansion is seen, instead of the faster loop of the
+base class.
+
+Collectors receive these hooks, override the ones you need:
+    onReset(algorithm)                          after reset()
+    onStep(index, seconds, expanded, frontier)  after every step(): its duration, the number of expansions
+                                                it made and the frontier size after it
+    onPush(cell_id, priority)                   node pushed to a frontier (also when its priority is replaced)
+    onPop(cell_id)                              node popped from a frontier
+    onGenerate(cell_id, count)                  neighbors of cell_id looked up, count of them
+    onHeuristic(node)                           heuristic evaluated for node (row, column)
+    onDone(algorithm)                           after the step that finished the search
+"""
+import json
+from array import array
+from time import perf_counter
+
+
+class Collector:
+    """Base class of the collectors, every hook does nothing."""
+
+    def onReset(self, algorithm) -> None:
+        pass
+
+    def onStep(self, index, seconds, expanded, frontier) -> None:
+        pass
+
+    def onPush(self, cell_id, priority) -> None:
+        pass
+
+    def onPop(self, cell_id) -> None:
+        pass
+
+    def onGenerate(self, cell_id, count) -> None:
+        pass
+
+    def onHeuristic(self, node) -> None:
+        pass
+
+    def onDone(self, algorithm) -> None:
+        pass
+
+
+class MetricsCollector(Collector):
+    """Counts the frontier operations, neighbor lookups and heuristic evaluations, and records the time
+    and frontier size of every step.
+
+    In a step that popped a node from a frontier, a neighbor lookup that did not
+    lead to a push is counted as a duplicate rejection: the neighbor was explored
+    already, waiting in the frontier, or reached with a lower cost before.
+    Algorithms without a frontier (idastar, smastar, wavefront) reject nothing.
+    """
+
+    def __init__(self) -> None:
+        self.onReset(None)
+
+    def onReset(self, algorithm) -> None:
+        self.algorithm = type(algorithm).__name__ if algorithm is not None else None
+        self.pushes = 0
+        self.pops = 0
+        self.generated = 0
+        self.rejected = 0
+        self.heuristic_evaluations = 0
+        self.step_seconds = array("d")  # Duration of every step
+        self.step_expanded = array("i")  # Expansions made by every step
+        self.frontier_sizes = array("i")  # Frontier size after every step
+        self._step_pushes = 0
+        self._step_pops = 0
+        self._step_generated = 0
+
+    def onStep(self, index, seconds, expanded, frontier) -> None:
+        self.step_seconds.append(seconds)
+        self.step_expanded.append(expanded)
+        self.frontier_sizes.append(frontier)
+        if self._step_pops:
+            self.rejected += max(0, self._step_generated - self._step_pushes)
+        self._step_pushes = self._step_pops = self._step_generated = 0
+
+    def onPush(self, cell_id, priority) -> None:
+        self.pushes += 1
+        self._step_pushes += 1
+
+    def onPop(self, cell_id) -> None:
+        self.pops += 1
+        self._step_pops += 1
+
+    def onGenerate(self, cell_id, count) -> None:
+        self.generated += count
+        self._step_generated += count
+
+    def onHeuristic(self, node) -> None:
+        self.heuristic_evaluations += 1
+
+    def summary(self) -> dict:
+        """Returns the totals of the run and the time per expansion."""
+        expansions = sum(self.step_expanded)
+        total = sum(self.step_seconds)
+        return {
+            "algorithm": self.algorithm,
+            "steps": len(self.step_seconds),
+            "expansions": expansions,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "generated": self.generated,
+            "duplicates_rejected": self.rejected,
+            "heuristic_evaluations": self.heuristic_evaluations,
+            "step_time_total": total,
+            "step_time_max": max(self.step_seconds, default=0.0),
+            "time_per_expansion": total / expansions if expansions else 0.0,
+            "max_frontier": max(self.frontier_sizes, default=0),
+        }
+
+    def toDict(self) -> dict:
+        """Returns the summary and the per-step series."""
+        return {
+            "summary": self.summary(),
+            "step_seconds": self.step_seconds.tolist(),
+            "step_expanded": self.step_expanded.tolist(),
+            "frontier_sizes": self.frontier_sizes.tolist(),
+        }
+
+    def save(self, path) -> None:
+        with open(path, "w") as f:
+            json.dump(self.toDict(), f)
+
+
+class TraceCollector(Collector):
+    """Records every step as a Chrome trace event (Trace Event Format), with counter tracks for the frontier
+    size, the frontier operations and the heuristic evaluations."""
+
+    def __init__(self, pid=0, tid=0) -> None:
+        self.pid, self.tid = pid, tid
+        self.events = []
+        self._origin = perf_counter()
+        self._counts = {"pushes": 0, "pops": 0, "generated": 0, "heuristic": 0}
+
+    def _timestamp(self, seconds) -> float:
+        return (seconds - self._origin) * 1e6  # Microseconds since the collector was created
+
+    def onReset(self, algorithm) -> None:
+        self._name = type(algorithm).__name__
+        self._counts = dict.fromkeys(self._counts, 0)
+        self.events.append({"name": "reset", "cat": self._name, "ph": "i", "s": "t",
+                            "ts": self._timestamp(perf_counter()), "pid": self.pid, "tid": self.tid})
+
+    def onStep(self, index, seconds, expanded, frontier) -> None:
+        end = perf_counter()
+        begin = self._timestamp(end - seconds)
+        self.events.append({"name": "step", "cat": self._name, "ph": "X", "ts": begin, "dur": seconds * 1e6,
+                            "pid": self.pid, "tid": self.tid, "args": {"index": index, "expanded": expanded}})
+        self.events.append({"name": "frontier", "ph": "C", "ts": begin, "pid": self.pid, "args": {"size": frontier}})
+        self.events.append({"name": "operations", "ph": "C", "ts": begin, "pid": self.pid, "args": dict(self._counts)})
+
+    def onPush(self, cell_id, priority) -> None:
+        self._counts["pushes"] += 1
+
+    def onPop(self, cell_id) -> None:
+        self._counts["pops"] += 1
+
+    def onGenerate(self, cell_id, count) -> None:
+        self._counts["generated"] += count
+
+    def onHeuristic(self, node) -> None:
+        self._counts["heuristic"] += 1
+
+    def onDone(self, algorithm) -> None:
+        self.events.append({"name": "done", "cat": self._name, "ph": "i", "s": "t",
+                            "ts": self._timestamp(perf_counter()), "pid": self.pid, "tid": self.tid,
+                            "args": {"cost": algorithm.getCost(), "found": bool(algorithm.getPath())}})
+
+    def toDict(self) -> dict:
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def save(self, path) -> None:
+        with open(path, "w") as f:
+            json.dump(self.toDict(), f)
+
+
+class InstrumentedFrontier:
+    """Frontier wrapper that reports pushes and pops to the collectors."""
+    __slots__ = ("frontier", "_collectors")
+
+    def __init__(self, frontier, collectors) -> None:
+        self.frontier = frontier
+        self._collectors = collectors
+
+    def push(self, node, priority=None) -> None:
+        for collector in self._collectors:
+            collector.onPush(node, priority)
+        self.frontier.push(node, priority)
+
+    def pop(self):
+        node = self.frontier.pop()
+        for collector in self._collectors:
+            collector.onPop(node)
+        return node
+
+    def remove(self, node) -> None:
+        self.frontier.remove(node)
+
+    def peekPriority(self):
+        return self.frontier.peekPriority()
+
+    def __contains__(self, node) -> bool:
+        return node in self.frontier
+
+    def __len__(self) -> int:
+        return len(self.frontier)
+
+    def __iter__(self):
+        return iter(self.frontier)
+
+
+class InstrumentedGraph:
+    """Compiled graph wrapper that reports neighbor lookups to the collectors; everything else is the graph's."""
+
+    def __init__(self, graph, collectors) -> None:
+        self.graph = graph
+        self._collectors = collectors
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+    def copy(self):
+        # The copy lpastar changes in place stays instrumented
+        return InstrumentedGraph(self.graph.copy(), self._collectors)
+
+    def neighbors(self, node) -> list:
+        result = self.graph.neighbors(node)
+        cell_id = self.graph.cellId(node)
+        for collector in self._collectors:
+            collector.onGenerate(cell_id, len(result))
+        return result
+
+    def neighborIds(self, cell_id) -> list:
+        result = self.graph.neighborIds(cell_id)
+        for collector in self._collectors:
+            collector.onGenerate(cell_id, len(result))
+        return result
+
+
+def wrapFrontier(frontier, collectors):
+    """Returns frontier wrapped once for collectors."""
+    if frontier is None or isinstance(frontier, InstrumentedFrontier):
+        return frontier
+    return InstrumentedFrontier(frontier, collectors)
+
+
+def wrapGraph(graph, collectors):
+    """Returns graph wrapped once for collectors."""
+    if graph is None or isinstance(graph, InstrumentedGraph):
+        return graph
+    return InstrumentedGraph(graph, collectors)
+
+
+def unwrap(structure):
+    """Returns the frontier or graph inside an instrumentation wrapper, or structure itself."""
+    if isinstance(structure, InstrumentedFrontier):
+        return structure.frontier
+    if isinstance(structure, InstrumentedGraph):
+        return structure.graph
+    return structure
+
+
+def attach(algorithm, collectors) -> None:
+    """Instruments algorithm for collectors, see the module docstring. Use SearchAlgorithmBase.instrument()."""
+    cls = type(algorithm)
+    reset, step, heuristic = cls.reset.__get__(algorithm), cls.step.__get__(algorithm), cls.heuristic.__get__(algorithm)
+    steps = [0]
+
+    def instrumented_reset(grid, start, goal, *args, **kwargs):
+        reset(grid, start, goal, *args, **kwargs)
+        steps[0] = 0
+        algorithm._wrap_structures(collectors)
+        for collector in collectors:
+            collector.onReset(algorithm)
+
+    def instrumented_step():
+        if algorithm.isDone():
+            return
+        expanded = algorithm.getNumberOfExpanded()
+        begin = perf_counter()
+        step()
+        seconds = perf_counter() - begin
+        frontier = algorithm.getFrontierSize()
+        expanded = algorithm.getNumberOfExpanded() - expanded
+        steps[0] += 1
+        for collector in collectors:
+            collector.onStep(steps[0], seconds, expanded, frontier)
+        if algorithm.isDone():
+            for collector in collectors:
+                collector.onDone(algorithm)
+
+    def instrumented_heuristic(node):
+        for collector in collectors:
+            collector.onHeuristic(node)
+        return heuristic(node)
+
+    algorithm.reset = instrumented_reset
+    algorithm.step = instrumented_step
+    algorithm.heuristic = instrumented_heuristic
+    # solve() of the base class then calls the timed step() above instead of running its own loop
+    algorithm.expansion_loop = None
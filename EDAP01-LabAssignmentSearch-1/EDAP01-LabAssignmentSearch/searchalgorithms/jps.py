@@ -0,0 +1,142 @@
+from searchalgorithms.base import SearchAlgorithmBase
+from searchalgorithms.frontier import PriorityFrontier
+
+
+class jps(SearchAlgorithmBase):
+    capabilities = frozenset({"optimal"})
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def reset(self, grid, start, goal):
+        super().reset(grid, start, goal)
+        # If you want to initialize other stuff, put it here
+        self._jump_points = []  # Every jump point found, in the order it was found
+
+    def _new_frontier(self, size):
+        # Priority queue frontier of jump points ordered by f(n) = g(n) + h(n)
+        return PriorityFrontier(size)
+
+    def heuristic(self, node):
+        # Manhattan distance heuristic from node n to goal
+        return abs(node[0] - self._goal[0]) + abs(node[1] - self._goal[1])
+
+    def _jump_horizontal(self, r, c, dc):
+        """Moves from (r, c) in column direction dc until a jump point (returned) or a wall (None)."""
+        free = self._graph.isFree
+        while free(r, c):
+            if (r, c) == self._goal:
+                return (r, c)
+            # Forced neighbor: a cell above/below that was blocked one step back
+            if (free(r - 1, c) and not free(r - 1, c - dc)) or (free(r + 1, c) and not free(r + 1, c - dc)):
+                return (r, c)
+            c += dc
+        return None
+
+    def _jump_vertical(self, r, c, dr):
+        """Moves from (r, c) in row direction dr until a jump point (returned) or a wall (None).
+        A cell is also a jump point if a horizontal jump from it finds one."""
+        free = self._graph.isFree
+        while free(r, c):
+            if (r, c) == self._goal:
+                return (r, c)
+            # Forced neighbor: a cell left/right that was blocked one step back
+            if (free(r, c - 1) and not free(r - dr, c - 1)) or (free(r, c + 1) and not free(r - dr, c + 1)):
+                return (r, c)
+            if self._jump_horizontal(r, c + 1, 1) is not None or self._jump_horizontal(r, c - 1, -1) is not None:
+                return (r, c)
+            r += dr
+        return None
+
+    def _directions(self, node, parent):
+        """Pruned search directions: all four from the start, otherwise forward and both sides."""
+        if node == parent:
+            return [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        dr = (node[0] > parent[0]) - (node[0] < parent[0])
+        dc = (node[1] > parent[1]) - (node[1] < parent[1])
+        if dc != 0:
+            return [(-1, 0), (1, 0), (0, dc)]
+        return [(0, -1), (0, 1), (dr, 0)]
+
+    def step(self):
+        """
+        Performs one step of Jump Point Search (JPS) on the 4-connected grid.
+        - A* over jump points: from the expanded node, jump in each pruned direction
+          over cells whose only optimal paths go straight through, and add the jump point
+          where the straight line stops to the frontier.
+        """
+
+        if self._done:
+            return  # If already done, do nothing
+
+        # Check if the frontier is empty. If it is, mark the search as done (failure).
+        if not self._frontier:
+            self._done = True
+            self._path = []  # No path found
+            return
+
+        state = self._state
+        current_id = self._frontier.pop() # Jump point with the lowest f value
+        g = state.g[current_id]
+
+        # Mark current node as explored
+        state.close(current_id)
+
+        # Goal check
+        if current_id == self._goal_id:
+            self._done = True
+            self._path = self._reconstruct_path(current_id)
+            return
+
+        cell, cellId = self._graph.cell, self._graph.cellId
+        current_node = cell(current_id)
+        r, c = current_node
+        depth = state.depth[current_id] + 1
+        for dr, dc in self._directions(current_node, cell(state.parent[current_id])):
+            if dr != 0:
+                jump_point = self._jump_vertical(r + dr, c, dr)
+            else:
+                jump_point = self._jump_horizontal(r, c + dc, dc)
+            if jump_point is None:
+                continue
+            jump_id = cellId(jump_point)
+            if state.closed[jump_id]:
+                continue
+            g_jump = g + abs(jump_point[0] - r) + abs(jump_point[1] - c)
+            if state.g[jump_id] < 0 or g_jump < state.g[jump_id]:
+                if state.g[jump_id] < 0:
+                    self._jump_points.append(jump_point)
+                self._frontier.push(jump_id, g_jump + self.heuristic(jump_point))
+                state.reach(jump_id, current_id, g_jump, depth)
+
+                # Depth tracking (in jumps)
+                self._max_depth = max(self._max_depth, depth)
+
+        # Update max frontier size
+        self._max_frontier_size = max(self._max_frontier_size, len(self._frontier))
+        self._max_nodes_in_memory = max(self._max_nodes_in_memory, len(self._frontier) + len(state.explored))
+
+    def _memory_structures(self) -> dict:
+        structures = super()._memory_structures()
+        structures["jump_points"] = self._jump_points
+        return structures
+
+    def getJumpPoints(self) -> list:
+        """Returns the jump points found so far, for drawing."""
+        return self._jump_points
+
+    def _reconstruct_path(self, goal):
+        """Reconstructs the cell-by-cell path to the goal id by walking the jump points back to the start
+        and filling in the straight segments between them."""
+        jump_points = [self._graph.cell(cell_id) for cell_id in self._state.pathTo(goal)]
+
+        path = [jump_points[0]]
+        for (r0, c0), (r1, c1) in zip(jump_points, jump_points[1:]):
+            dr = (r1 > r0) - (r1 < r0)
+            dc = (c1 > c0) - (c1 < c0)
+            r, c = r0, c0
+            while (r, c) != (r1, c1):
+                r, c = r + dr, c + dc
+                path.append((r, c))
+        self._cost = len(path) - 1  # Cost is the length of the path minus one (number of moves)
+        return path
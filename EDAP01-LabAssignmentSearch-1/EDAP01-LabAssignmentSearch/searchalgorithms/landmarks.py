@@ -0,0 +1,153 @@
+"""Landmark (ALT) lower bounds for A*: A* with Landmarks and the Triangle inequality.
+
+For a landmark L with exact path costs d(L, n) to every cell, the triangle
+inequality bounds the remaining cost of any node n to the goal t:
+    d(n, t) >= d(L, t) - d(L, n)
+    d(n, t) >= d(n, L) - d(t, L)
+In these grids moving into a cell costs that cell's cost, so a path walked
+backwards costs the same except for its end cells:
+d(n, L) = d(L, n) + cost(L) - cost(n). One table per landmark is therefore
+enough. The bound of a set of landmarks is the maximum over them. It is
+admissible and consistent, so A* stays optimal.
+
+Tables are built once per maze and stored next to the maze file
+(mazes/maze3.txt -> mazes/maze3.landmarks.npz):
+    python -m searchalgorithms.landmarks mazes/*.txt [--count 8]
+Loaded tables are registered by graph digest, and astar picks up the table of
+its maze automatically.
+"""
+import argparse
+import os
+from array import array
+
+import numpy
+
+from searchalgorithms.graph import graph_for
+
+# Tables registered for astar, keyed by GridGraph.digest
+_tables = {}
+
+
+def distances_from(graph, source_id):
+    """Returns the exact path costs from source_id to every cell as an int32 array, -1 if unreachable.
+    Dial's algorithm run level by level: all cells at the current cost are settled and relaxed at once."""
+    indptr, indices = graph.csr()
+    costs = numpy.frombuffer(graph.costs, dtype=numpy.int32)
+    distance = numpy.full(graph.size, -1, dtype=numpy.int32)
+    pending = {0: [numpy.array([source_id], dtype=numpy.int64)]}  # tentative cost -> arrays of cell ids
+    level = 0
+    while pending:
+        level = min(pending)
+        cells = numpy.unique(numpy.concatenate(pending.pop(level)))
+        cells = cells[distance[cells] < 0]  # Skip cells settled at a lower cost
+        if not len(cells):
+            continue
+        distance[cells] = level
+        # Gather all neighbors of the settled cells at once
+        starts = indptr[cells]
+        counts = indptr[cells + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        positions = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts) + numpy.arange(total)
+        neighbors = indices[positions].astype(numpy.int64)
+        neighbors = neighbors[distance[neighbors] < 0]
+        step = costs[neighbors]
+        for cost in numpy.unique(step).tolist():
+            pending.setdefault(level + cost, []).append(neighbors[step == cost])
+    return distance
+
+
+class LandmarkTable:
+    """Exact path costs from a few landmark cells to every cell of one maze."""
+
+    def __init__(self, landmarks, distances, digest) -> None:
+        self.landmarks = numpy.asarray(landmarks, dtype=numpy.int64)  # Landmark cell ids
+        self.distances = numpy.asarray(distances, dtype=numpy.int32)  # (landmarks, cells), -1 if unreachable
+        self.digest = digest  # GridGraph.digest of the maze the table was built for
+        self._rows = None
+
+    @classmethod
+    def build(cls, grid, count=8):
+        """Picks count landmarks by farthest-point selection and computes their tables.
+        The first landmark is the cell farthest from the start of the maze (the goal or the first free
+        cell if there is none); every next one is the cell farthest from all landmarks chosen so far,
+        so they end up at the dead ends and corners that make long detours. Only the part of the maze
+        that the start can reach gets landmarks."""
+        graph = graph_for(grid)
+        flat = numpy.asarray(grid).reshape(-1)
+        seeds = [numpy.flatnonzero(flat == value) for value in (2, 3)] + [numpy.flatnonzero(graph.free.reshape(-1))]
+        seeds = [cells for cells in seeds if len(cells)]
+        if not seeds:
+            return cls(numpy.zeros(0), numpy.zeros((0, graph.size)), graph.digest)
+        nearest = distances_from(graph, int(seeds[0][0])).astype(numpy.int64)  # -1 outside the component
+        landmarks, distances = [], []
+        while len(landmarks) < count:
+            candidate = int(numpy.argmax(nearest))
+            if nearest[candidate] <= 0 and landmarks:
+                break  # Every reachable cell is a landmark already
+            landmarks.append(candidate)
+            distances.append(distances_from(graph, candidate))
+            nearest = numpy.minimum(nearest, distances[-1])
+        return cls(landmarks, numpy.stack(distances), graph.digest)
+
+    @property
+    def nbytes(self) -> int:
+        return self.distances.nbytes + self.landmarks.nbytes
+
+    def rows(self) -> list:
+        """Returns the tables as one array.array per landmark; indexing them gives Python ints,
+        which is much faster than numpy scalars inside a search loop."""
+        if self._rows is None:
+            self._rows = [array("i", row.tobytes()) for row in self.distances]
+        return self._rows
+
+    def save(self, path) -> None:
+        numpy.savez_compressed(path, landmarks=self.landmarks, distances=self.distances, digest=self.digest)
+
+    @classmethod
+    def load(cls, path):
+        with numpy.load(path) as data:
+            return cls(data["landmarks"], data["distances"], str(data["digest"]))
+
+
+def landmark_path(maze_file) -> str:
+    """Returns the landmark file stored next to a maze file."""
+    return os.path.splitext(maze_file)[0] + ".landmarks.npz"
+
+
+def register(table) -> None:
+    """Makes a table available to astar for every grid with the same graph digest."""
+    _tables[table.digest] = table
+
+
+def table_for(graph):
+    """Returns the registered table of a compiled graph, or None."""
+    return _tables.get(graph.digest)
+
+
+def load_for(maze_file, grid):
+    """Loads and registers the landmark file of a maze file if there is one that matches grid.
+    Returns the table, or None if there is no file or it was built for a different maze."""
+    path = landmark_path(maze_file)
+    if not os.path.exists(path):
+        return None
+    table = LandmarkTable.load(path)
+    if table.digest != graph_for(grid).digest:
+        return None  # The maze changed after the table was built
+    register(table)
+    return table
+
+
+if __name__ == "__main__":
+    from src.mazefile import load_grid
+
+    parser = argparse.ArgumentParser(description='Precompute landmark tables for the ALT heuristic of astar')
+    parser.add_argument('mazes', nargs='+', help='maze files (.txt or .mzb)')
+    parser.add_argument('--count', type=int, default=8, help='number of landmarks per maze')
+    args = parser.parse_args()
+    for maze_file in args.mazes:
+        grid, _, _ = load_grid(maze_file)
+        table = LandmarkTable.build(grid, args.count)
+        table.save(landmark_path(maze_file))
+        print(maze_file, "->", landmark_path(maze_file), "({} landmarks)".format(len(table.landmarks)))
@@ -0,0 +1,187 @@
+from array import array
+from searchalgorithms import instrumentation
+from searchalgorithms.base import SearchAlgorithmBase
+from searchalgorithms.frontier import PriorityFrontier
+import numpy as np
+
+# Cost of unreached cells, large enough to never be a path cost and small enough to stay a machine integer
+_INF = 2**62
+
+
+class lpastar(SearchAlgorithmBase):
+    """Lifelong Planning A* (LPA*): A* that can repair its search after cells of the maze change.
+
+    Every cell has g(n), the cost it was expanded with, and rhs(n), the cost its
+    neighbors promise now: rhs(n) = min over neighbors p of g(p) + cost(n). A cell
+    with g(n) != rhs(n) is inconsistent and waits in the frontier with the key
+    (min(g, rhs) + h(n), min(g, rhs)). The first search expands the same cells as
+    A*. After updateCells() only the cells whose moves changed are made
+    inconsistent again, and the next search only expands what the change
+    actually affects instead of the whole maze.
+    """
+    capabilities = frozenset({"optimal", "weighted", "incremental"})
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def reset(self, grid, start, goal):
+        super().reset(grid, start, goal)
+        size = self._graph.size if self._graph is not None else 0
+        self._private = False  # True once updateCells() has made its own copies of the graph and the grid
+        self._g = array("q", [_INF]) * size  # Cost the cell was last expanded with
+        self._rhs = array("q", [_INF]) * size  # One-step lookahead cost through the best neighbor
+        self._frontier = self._new_frontier(size)  # Keyed by (f, g) pairs, without the start pushed by the base class
+        if start is not None:
+            self._rhs[self._start_id] = 0
+            self._frontier.push(self._start_id, self._key(self._start_id))
+        self._expanded = 0  # Expansions since reset, re-expansions included
+        self._plan_expanded = 0  # Expansions of the last plan: the first search or the last repair
+        self._updates = 0  # Number of updateCells() calls
+        self._full_replan_expanded = None  # Computed on demand by getFullReplanExpanded()
+
+    def _new_frontier(self, size):
+        # Keys are (f, g) pairs and cells leave the frontier when they become consistent, see _update_vertex
+        return PriorityFrontier(size)
+
+    def heuristic(self, node):
+        # Manhattan distance heuristic from node n to goal, consistent since every move costs at least 1
+        return abs(node[0] - self._goal[0]) + abs(node[1] - self._goal[1])
+
+    def _key(self, cell_id):
+        g = min(self._g[cell_id], self._rhs[cell_id])
+        return (g + self.heuristic(self._graph.cell(cell_id)), g)
+
+    def _update_vertex(self, cell_id) -> None:
+        """Recomputes rhs(n) from the neighbors and puts n in the frontier if, and only if, it is inconsistent."""
+        g, rhs = self._g, self._rhs
+        if cell_id != self._start_id:
+            best = _INF
+            for neighbor in self._graph.neighborIds(cell_id):
+                if g[neighbor] < best:
+                    best = g[neighbor]
+            # Moving into a cell costs its terrain cost
+            rhs[cell_id] = best + self._graph.costs[cell_id] if best < _INF else _INF
+        if g[cell_id] != rhs[cell_id]:
+            self._frontier.push(cell_id, self._key(cell_id))
+        else:
+            self._frontier.remove(cell_id)
+
+    def step(self):
+        """Performs one expansion of LPA*, of the first search or of the repair after updateCells()."""
+        if self._done:
+            return
+
+        goal = self._goal_id
+        g, rhs = self._g, self._rhs
+        # Done once no inconsistent cell can lower the cost of the goal anymore
+        top = self._frontier.peekPriority()
+        if top is None or (top >= self._key(goal) and g[goal] == rhs[goal]):
+            self._finish()
+            return
+
+        current_node = self._frontier.pop()
+        self._expanded += 1
+        self._plan_expanded += 1
+        self._state.close(current_node)
+        if g[current_node] > rhs[current_node]:
+            # Overconsistent: a cheaper path was found, settle it like A* does
+            g[current_node] = rhs[current_node]
+        else:
+            # Underconsistent: the path it was expanded with got more expensive or blocked, start over from rhs
+            g[current_node] = _INF
+            self._update_vertex(current_node)
+        for neighbor in self._graph.neighborIds(current_node):  # Up, Down, Left, Right
+            self._update_vertex(neighbor)
+
+        # Update max frontier size
+        self._max_frontier_size = max(self._max_frontier_size, len(self._frontier))
+        self._max_nodes_in_memory = max(self._max_nodes_in_memory, len(self._frontier) + len(self._state.explored))
+
+    def _finish(self) -> None:
+        """Marks the search as done and walks the path back from the goal through the cheapest neighbors."""
+        self._done = True
+        self._path = []
+        self._cost = 0
+        g, goal = self._g, self._goal_id
+        if g[goal] >= _INF:
+            return  # No path found
+        self._cost = g[goal]
+        costs, neighbors = self._graph.costs, self._graph.neighborIds
+        path = [goal]
+        while path[-1] != self._start_id:
+            node = path[-1]
+            previous = min(neighbors(node), key=lambda p: g[p])
+            if g[previous] + costs[node] != g[node] or len(path) > self._graph.size:
+                raise RuntimeError("LPA* path extraction failed at cell {}".format(self._graph.cell(node)))
+            path.append(previous)
+        path.reverse()
+        self._path = [self._graph.cell(cell_id) for cell_id in path]
+        self._max_depth = max(self._max_depth, len(path) - 1)
+
+    def updateCells(self, changes) -> None:
+        """Changes cells of the maze, changes being ((row, column), value) pairs or a {(row, column): value} dict
+        with grid values (1 occupied, 0 free, >= 4 terrain). Only the changed cells and their neighbors are
+        updated; stepping or solving again repairs the path from where the last search left off."""
+        if isinstance(changes, dict):
+            changes = changes.items()
+        changes = list(changes)
+        if not self._private:
+            # Copy on the first write: the compiled graph is shared between searches through graph_for() and is
+            # changed in place, the grid is kept in sync for getFullReplanExpanded()
+            self._graph = self._graph.copy()
+            self._grid = np.array(self._grid, copy=True)
+            self._private = True
+        for (r, c), value in changes:
+            self._grid[r, c] = value
+        for cell_id in self._graph.update(changes):
+            self._update_vertex(cell_id)
+        self._done = False
+        self._path = []
+        self._plan_expanded = 0
+        self._updates += 1
+        self._full_replan_expanded = None
+
+    # --- Getters for Visualization ---
+    def getFrontier(self):
+        """Returns the inconsistent cells as frontier tuples (node, heuristic_h, cost_g, parent).
+        LPA* keeps no parents, a node is its own parent."""
+        if self._graph is None:
+            return []
+        cell = self._graph.cell
+        heuristic = type(self).heuristic  # Not counted by instrumentation, see SearchAlgorithmBase.getFrontier
+        frontier = []
+        for cell_id in self._frontier:
+            node = cell(cell_id)
+            frontier.append((node, heuristic(self, node), min(self._g[cell_id], self._rhs[cell_id]), node))
+        return frontier
+
+    def _memory_structures(self) -> dict:
+        structures = super()._memory_structures()
+        structures.update(g=self._g, rhs=self._rhs)
+        if self._private:
+            # The copies updateCells() made, before that the graph is shared like in the other algorithms
+            structures.update(graph=instrumentation.unwrap(self._graph), grid=self._grid)
+        return structures
+
+    def getNumberOfExpanded(self) -> int:
+        """Returns the number of expansions since reset, re-expansions after updates included."""
+        return self._expanded
+
+    def getPlanExpanded(self) -> int:
+        """Returns the number of expansions of the last plan: the first search, or the repair after the last
+        updateCells()."""
+        return self._plan_expanded
+
+    def getFullReplanExpanded(self) -> int:
+        """Returns the number of expansions a search from scratch on the current maze needs, to compare with
+        getPlanExpanded(). Runs that search on the first call after each update."""
+        if self._full_replan_expanded is None:
+            fresh = type(self)()
+            fresh.reset(self._grid, self._start, self._goal)
+            fresh.solve()
+            self._full_replan_expanded = fresh.getNumberOfExpanded()
+        return self._full_replan_expanded
+
+    def getNumberOfUpdates(self) -> int:
+        """Returns the number of updateCells() calls since reset."""
+        return self._updates
@@ -0,0 +1,96 @@
+"""Memory of the searches in bytes.
+
+getMaxMemoryUsage() of the algorithms counts nodes. These helpers measure bytes:
+    sizeof(obj)    bytes held by a search structure, following containers and objects
+    PeakTracker    peak bytes allocated inside a with block, traced with tracemalloc
+    peak_rss()     peak resident set size of the whole process
+"""
+import sys
+import tracemalloc
+import types
+from array import array
+from collections import deque
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+# Objects that are not followed: their size is all there is
+_LEAVES = (int, float, complex, str, bytes, bytearray, array, range, type(None), bool)
+_CONTAINERS = (tuple, list, set, frozenset, deque)
+# Code, not data of the search
+_SKIPPED = (type, types.FunctionType, types.MethodType, types.BuiltinFunctionType, types.ModuleType)
+
+
+def sizeof(obj, seen=None) -> int:
+    """Returns the bytes held by obj and everything it references, counting shared objects once.
+    Pass the same seen set to several calls to not count what they share twice. Small cached ints and
+    classes, functions and modules are not counted."""
+    if seen is None:
+        seen = set()
+    total = 0
+    pending = [obj]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, _SKIPPED):
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, int) and -5 <= obj <= 256:
+            continue  # Shared by the interpreter
+        total += sys.getsizeof(obj)  # numpy arrays include the data they own
+        if isinstance(obj, _LEAVES):
+            continue
+        if isinstance(obj, _CONTAINERS):
+            pending.extend(obj)
+        elif isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif type(obj).__module__.startswith("searchalgorithms"):
+            # Objects of the search: follow their attributes
+            if hasattr(obj, "__dict__"):
+                pending.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, name):
+                        pending.append(getattr(obj, name))
+    return total
+
+
+class PeakTracker:
+    """Context manager that records the peak bytes allocated inside its block with tracemalloc:
+
+        with PeakTracker() as tracker:
+            algorithm.reset(grid, start, goal)
+            algorithm.solve()
+        tracker.peak  # Bytes above what was allocated when the block was entered
+
+    Tracing slows Python down several times, so do not time a search while tracing it.
+    """
+
+    def __init__(self) -> None:
+        self.peak = None
+        self._started = False
+        self._baseline = 0
+
+    def __enter__(self):
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc_info):
+        self.peak = tracemalloc.get_traced_memory()[1] - self._baseline
+        if self._started:
+            tracemalloc.stop()
+        return False
+
+
+def peak_rss():
+    """Returns the peak resident set size of the process in bytes, or None where it is not available."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # Bytes on macOS, kilobytes elsewhere
@@ -0,0 +1,243 @@
+"""Registry of the search algorithms, looked up by name.
+
+Algorithms come from three places, found the first time the registry is used:
+    built-ins         modules of this package that define a class with the module's name
+                      (searchalgorithms/astar.py defines class astar)
+    plugin folders    the same layout in folders added with add_directory() or listed in the
+                      SEARCH_ALGORITHM_PATH environment variable (separated like PATH)
+    entry points      installed packages exposing classes in the "searchalgorithms" entry point group
+Classes are only imported when they are first asked for, and then cached.
+
+Every algorithm declares what it can do in its capabilities class attribute, written as a literal
+(capabilities = frozenset({...})) in the class body so that the registry can read it from the
+source without importing the module (plugins that inherit it, and entry points, are imported):
+    optimal           finds a least-cost path (on unit-cost grids, unless it is also weighted)
+    weighted          searches with the terrain costs of the grid
+    incremental       repairs its search after cells change (updateCells)
+    vectorized        expands whole levels at once with numpy
+    memory_bounded    keeps a bounded number of nodes in memory
+"""
+import ast
+import importlib
+import importlib.util
+import os
+
+CAPABILITIES = frozenset({"optimal", "weighted", "incremental", "vectorized", "memory_bounded"})
+ENTRY_POINT_GROUP = "searchalgorithms"
+PATH_VARIABLE = "SEARCH_ALGORITHM_PATH"
+
+
+class AlgorithmError(Exception):
+    """An algorithm could not be found or loaded."""
+
+
+class UnknownAlgorithmError(AlgorithmError, LookupError):
+    """No algorithm is registered with the name."""
+
+
+class AlgorithmNotImplementedError(AlgorithmError, NotImplementedError):
+    """The algorithm exists but has not implemented step() yet."""
+
+
+class AlgorithmInfo:
+    """A registered algorithm: its name, where it comes from, its declared capabilities and, once resolved,
+    its class."""
+    __slots__ = ("name", "source", "_load", "_cls", "_declared")
+
+    def __init__(self, name, source, load, declared=None) -> None:
+        self.name = name
+        self.source = source  # "builtin", the plugin file or the entry point
+        self._load = load  # Returns the class, called once
+        self._cls = None
+        self._declared = declared  # Capabilities read from the source, None if they are only known after import
+
+    def resolve(self):
+        """Imports and checks the class on the first call, returns the cached class afterwards."""
+        if self._cls is None:
+            try:
+                cls = self._load()
+            except NotImplementedError as e:
+                raise AlgorithmNotImplementedError("{}: {}".format(self.name, e)) from e
+            except Exception as e:
+                raise AlgorithmError("Could not load {} from {}: {}".format(self.name, self.source, e)) from e
+            _check(self.name, cls)
+            if self._declared is not None and frozenset(cls.capabilities) != self._declared:
+                raise AlgorithmError("{} declares the capabilities {} in its source but has {}".format(
+                    self.name, sorted(self._declared), sorted(cls.capabilities)))
+            self._cls = cls
+        return self._cls
+
+    @property
+    def capabilities(self) -> frozenset:
+        """The capabilities read from the source, without importing the algorithm when possible."""
+        if self._cls is None and self._declared is not None:
+            return self._declared
+        return self.resolve().capabilities
+
+
+def _check(name, cls) -> None:
+    from searchalgorithms.base import SearchAlgorithmBase  # Imported with the first algorithm, it needs numpy
+    if not (isinstance(cls, type) and issubclass(cls, SearchAlgorithmBase)):
+        raise AlgorithmError("{} is not a SearchAlgorithmBase subclass".format(name))
+    if cls.step is SearchAlgorithmBase.step:
+        raise AlgorithmNotImplementedError("{} has not implemented the step() method".format(name))
+    unknown = set(cls.capabilities) - CAPABILITIES
+    if unknown:
+        raise AlgorithmError("{} declares unknown capabilities: {}".format(name, ", ".join(sorted(unknown))))
+
+
+# Registered algorithms by name, filled by _discover() on first use
+_algorithms = {}
+_discovered = False
+
+
+def _add(info, replace=False) -> None:
+    old = _algorithms.get(info.name)
+    if old is not None and not replace:
+        raise AlgorithmError("Algorithm {} from {} is already registered from {}".format(info.name, info.source, old.source))
+    _algorithms[info.name] = info
+
+
+def _declared_capabilities(class_def):
+    """Returns the capabilities assigned in the body of a class definition, None if they cannot be known
+    without importing: inherited from another algorithm, or not a literal."""
+    value = None
+    for statement in class_def.body:
+        if isinstance(statement, ast.Assign):
+            targets = statement.targets
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            targets = [statement.target]
+        else:
+            continue
+        if any(isinstance(target, ast.Name) and target.id == "capabilities" for target in targets):
+            value = statement.value  # The last assignment wins, like when the class body runs
+    if value is None:
+        # Not assigned: the empty default of SearchAlgorithmBase, unless another algorithm is inherited from
+        bases = [getattr(base, "attr", getattr(base, "id", None)) for base in class_def.bases]  # Attribute or Name
+        return frozenset() if all(base == "SearchAlgorithmBase" for base in bases) else None
+    if (isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id in ("frozenset", "set")
+            and len(value.args) <= 1 and not value.keywords):
+        if not value.args:
+            return frozenset()
+        value = value.args[0]
+    try:
+        declared = ast.literal_eval(value)
+    except (ValueError, TypeError):
+        return None  # Computed, e.g. from the capabilities of another class
+    if isinstance(declared, (set, frozenset, tuple, list)) and all(isinstance(item, str) for item in declared):
+        return frozenset(declared)
+    return None
+
+
+def _algorithm_files(directory):
+    """Yields (name, path, declared capabilities or None) of the files in directory that define a class with
+    their own name. Only the source is parsed, nothing is imported. Files that do not parse are yielded
+    with None, so that loading them reports the error."""
+    for file_name in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(file_name)
+        if extension != ".py" or not name.isidentifier():
+            continue
+        path = os.path.join(directory, file_name)
+        with open(path, "rb") as f:
+            source = f.read()
+        try:
+            tree = ast.parse(source, path)
+        except (SyntaxError, ValueError):
+            yield name, path, None
+            continue
+        for statement in tree.body:
+            if isinstance(statement, ast.ClassDef) and statement.name == name:
+                yield name, path, _declared_capabilities(statement)
+                break
+
+
+def _load_builtin(name):
+    return lambda: getattr(importlib.import_module("searchalgorithms." + name), name)
+
+
+def _load_file(name, path):
+    def load():
+        spec = importlib.util.spec_from_file_location("searchalgorithm_plugins." + name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return getattr(module, name)
+    return load
+
+
+def _entry_points():
+    from importlib import metadata
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=ENTRY_POINT_GROUP)
+    return entry_points.get(ENTRY_POINT_GROUP, [])  # Python < 3.10
+
+
+def _discover() -> None:
+    global _discovered
+    if _discovered:
+        return
+    _discovered = True
+    for name, _, declared in _algorithm_files(os.path.dirname(__file__)):
+        _add(AlgorithmInfo(name, "builtin", _load_builtin(name), declared))
+    for directory in filter(None, os.environ.get(PATH_VARIABLE, "").split(os.pathsep)):
+        add_directory(directory)
+    for entry_point in _entry_points():
+        _add(AlgorithmInfo(entry_point.name, "entry point " + entry_point.value, entry_point.load))
+
+
+def add_directory(directory) -> list:
+    """Registers the algorithm files of a plugin folder and returns their names."""
+    _discover()
+    added = []
+    for name, path, declared in _algorithm_files(directory):
+        _add(AlgorithmInfo(name, path, _load_file(name, path), declared))
+        added.append(name)
+    return added
+
+
+def register(cls, name=None, replace=False) -> None:
+    """Registers an algorithm class, by default under its class name. Raises AlgorithmError if the name is
+    taken, unless replace is True."""
+    name = name or cls.__name__
+    _check(name, cls)
+    _discover()
+    info = AlgorithmInfo(name, "registered", lambda: cls)
+    info._cls = cls
+    _add(info, replace)
+
+
+def names() -> list:
+    """Returns the names of all registered algorithms, without importing them."""
+    _discover()
+    return sorted(_algorithms)
+
+
+def info(name) -> AlgorithmInfo:
+    _discover()
+    try:
+        return _algorithms[name]
+    except KeyError:
+        raise UnknownAlgorithmError("No algorithm named {}, available: {}".format(name, ", ".join(names()))) from None
+
+
+def get(name):
+    """Returns the algorithm class registered as name, imported once and cached.
+    Raises UnknownAlgorithmError, AlgorithmNotImplementedError or AlgorithmError."""
+    return info(name).resolve()
+
+
+def find(*capabilities) -> list:
+    """Returns the names of the algorithms that have all the given capabilities. Only the algorithms whose
+    capabilities cannot be read from their source are imported; of those, the ones that have not
+    implemented step() yet are left out."""
+    unknown = set(capabilities) - CAPABILITIES
+    if unknown:
+        raise AlgorithmError("Unknown capabilities: {}".format(", ".join(sorted(unknown))))
+    found = []
+    for name in names():
+        try:
+            if set(capabilities) <= info(name).capabilities:
+                found.append(name)
+        except AlgorithmNotImplementedError:
+            pass
+    return found
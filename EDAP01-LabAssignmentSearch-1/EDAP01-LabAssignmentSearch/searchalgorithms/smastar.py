@@ -0,0 +1,298 @@
+import heapq
+from itertools import count
+from searchalgorithms.base import SearchAlgorithmBase
+from searchalgorithms.frontier import QueueFrontier
+from searchalgorithms.state import SearchState
+
+
+class _Node:
+    """Node of the SMA* search tree. Nodes are dropped and regenerated, so they are objects with
+    explicit child links instead of entries in parent and depth maps."""
+    __slots__ = ("cell", "g", "f", "depth", "parent", "children", "pending", "forgotten", "dominated", "pruned",
+                 "version", "in_open", "alive")
+
+    def __init__(self, cell, g, f, depth, parent) -> None:
+        self.cell = cell
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.parent = parent
+        self.children = {}  # cell -> child node kept in memory
+        self.pending = []  # Neighbor cells not generated yet (or generated and forgotten again)
+        self.forgotten = {}  # cell -> backed up f(n) of a dropped child
+        # cell -> node in memory that reaches it, or the cells below it, as cheaply; the cell is not regenerated.
+        # Both are created on first use, most nodes never need them.
+        self.dominated = None
+        self.pruned = None  # Set of the nodes in memory with this node in dominated
+        self.version = 0  # Bumped on every change, older open heap items of the node are skipped
+        self.in_open = False
+        self.alive = True
+
+
+class smastar(SearchAlgorithmBase):
+    capabilities = frozenset({"optimal", "memory_bounded"})
+    # Most search tree nodes kept in memory. When the tree grows past it, the leaf with the highest f(n)
+    # is dropped and its f(n) is remembered by its parent, so the subtree is only regenerated if it
+    # becomes the best option again.
+    memory_budget = 10000
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def reset(self, grid, start, goal):
+        super().reset(grid, start, goal)
+        self._open = []  # Heap items: (f, -depth, counter, version, node), lowest f and deepest first
+        self._leaves = []  # Heap items: (-f, depth, counter, node), highest f and shallowest first
+        self._counter = count()
+        self._best_node = {}  # cell -> node in memory with the lowest g(n), prunes cycles and worse paths
+        self._open_size = 0
+        self._nodes_in_memory = 0
+        self._expanded = 0
+        self._forgotten = 0
+        self._root = None
+        if start is not None:
+            self._root = self._new_node(start, 0, self.heuristic(start), None)
+
+    def _new_state(self, size):
+        # Memory-bounded: a sparse state, not arrays the size of the grid
+        return SearchState(size, sparse=True)
+
+    def _new_frontier(self, size):
+        # Only holds the start, pushed by the base class; the open heap is the real frontier
+        return QueueFrontier(size, sparse=True)
+
+    def heuristic(self, node):
+        # Manhattan distance heuristic from node n to goal
+        return abs(node[0] - self._goal[0]) + abs(node[1] - self._goal[1])
+
+    # --- Tree bookkeeping ---
+    def _new_node(self, cell, g, f, parent):
+        depth = parent.depth + 1 if parent is not None else 0
+        node = _Node(cell, g, f, depth, parent)
+        node.pending = [n for n in self._graph.neighbors(cell) if parent is None or n != parent.cell][::-1]
+        if parent is not None:
+            parent.children[cell] = node
+        best = self._best_node.get(cell)
+        if best is None or g < best.g:
+            self._best_node[cell] = node
+        self._nodes_in_memory += 1
+        self._max_depth = max(self._max_depth, depth)
+        if cell == self._goal or node.pending:
+            self._set_open(node, True)
+        else:
+            node.f = float("inf")  # Dead end
+        self._push_leaf(node)
+        return node
+
+    def _set_open(self, node, in_open) -> None:
+        if node.in_open != in_open:
+            node.in_open = in_open
+            self._open_size += 1 if in_open else -1
+        node.version += 1
+        if in_open:
+            heapq.heappush(self._open, (node.f, -node.depth, next(self._counter), node.version, node))
+
+    def _push_leaf(self, node) -> None:
+        # Current while the node is a leaf with this f(n), opening or closing it does not matter
+        heapq.heappush(self._leaves, (-node.f, node.depth, next(self._counter), node))
+
+    def _set_f(self, node, f) -> None:
+        node.f = f
+        self._set_open(node, node.in_open)  # Re-queue with the new f(n)
+        if not node.children:
+            self._push_leaf(node)
+
+    def _backup(self, node) -> None:
+        """Sets f(n) of a node whose successors are all known to the lowest f(n) among them,
+        and propagates the change towards the root."""
+        while node is not None:
+            if any(cell not in node.forgotten for cell in node.pending):
+                return  # Successors not generated yet, f(n) is still the bound of the node itself
+            values = [child.f for child in node.children.values()] + list(node.forgotten.values())
+            f = min(values) if values else float("inf")
+            if f == node.f:
+                return
+            self._set_f(node, f)
+            node = node.parent
+
+    def _is_open_item(self, item) -> bool:
+        node = item[-1]
+        return node.alive and node.in_open and item[3] == node.version
+
+    def _is_leaf_item(self, item) -> bool:
+        node = item[-1]
+        return node.alive and not node.children and -item[0] == node.f
+
+    def _compact(self) -> None:
+        """Rebuilds a heap from its current items once it holds twice memory_budget items, so stale
+        items, and the dropped nodes they reference, do not pile up."""
+        limit = 2 * self.memory_budget
+        for name, is_current in (("_open", self._is_open_item), ("_leaves", self._is_leaf_item)):
+            heap = getattr(self, name)
+            if len(heap) > limit:
+                current = {}  # One item per node, a node pushed again with the same f(n) has several
+                for item in heap:
+                    if is_current(item):
+                        current.setdefault(id(item[-1]), item)
+                heap = list(current.values())
+                heapq.heapify(heap)
+                setattr(self, name, heap)
+
+    def _pop_best(self):
+        """Returns the open node with the lowest f(n), deepest first, or None."""
+        heap = self._open
+        while heap:
+            if self._is_open_item(heap[0]):
+                return heap[0][-1]
+            heapq.heappop(heap)
+        return None
+
+    def _dominate(self, node, cell, other) -> None:
+        if node.dominated is None:
+            node.dominated = {}
+        if other.pruned is None:
+            other.pruned = set()
+        node.dominated[cell] = other
+        other.pruned.add(node)
+
+    def _undominate(self, node, cell) -> None:
+        other = node.dominated.pop(cell, None) if node.dominated else None
+        if other is not None and other not in node.dominated.values():
+            other.pruned.discard(node)
+
+    def _drop_worst_leaf(self) -> None:
+        """Removes the leaf with the highest f(n), shallowest first, and remembers its f(n) in the parent."""
+        heap = self._leaves
+        while heap:
+            item = heapq.heappop(heap)
+            node = item[-1]
+            if not self._is_leaf_item(item) or node is self._root:
+                continue
+            node.alive = False
+            if node.in_open:
+                self._set_open(node, False)
+            if self._best_node.get(node.cell) is node:
+                del self._best_node[node.cell]
+            self._nodes_in_memory -= 1
+            self._forgotten += 1
+
+            parent = node.parent
+            del parent.children[node.cell]
+            parent.forgotten[node.cell] = node.f
+            if node.f != float("inf"):
+                # Regenerated after the successors never generated, if it becomes the best option again.
+                # A hopeless child never is.
+                parent.pending.insert(0, node.cell)
+                self._set_open(parent, True)
+            # Cells the node did not generate are left to the nodes that dominate them. The parent waits
+            # for one of them instead, and regenerates the node if it is dropped.
+            for cell in list(node.dominated or ()):
+                other = node.dominated[cell]
+                self._undominate(node, cell)
+                if other.alive and node.cell not in (parent.dominated or ()):
+                    self._dominate(parent, node.cell, other)
+            if not parent.children:
+                self._push_leaf(parent)
+            self._backup(parent)
+            self._restore_dominated(node)
+            return
+
+    def _restore_dominated(self, node) -> None:
+        """Hands the cells a dropped node dominated back to the nodes waiting for it, as forgotten successors
+        that are regenerated if they become the best option."""
+        for other in node.pruned or ():
+            if not other.alive:
+                continue
+            for cell in [cell for cell, dominating in other.dominated.items() if dominating is node]:
+                del other.dominated[cell]
+                # Through the cell of node, reached with at least its g(n), a path is bounded by its f(n)
+                f = min(other.forgotten.get(cell, float("inf")), max(node.f, other.g + 1 + self.heuristic(cell)))
+                other.forgotten[cell] = f
+                if f != float("inf") and cell not in other.pending:
+                    other.pending.insert(0, cell)
+                    self._set_open(other, True)
+            self._backup(other)
+        node.pruned = None
+
+    def step(self):
+        """
+        Performs one step of Simplified Memory-bounded A* (SMA*).
+        - Takes the open node with the lowest f(n) = g(n) + h(n) (deepest on ties) and generates ONE successor.
+        - Once all successors of a node are known, its f(n) is backed up to the lowest f(n) among them.
+        - If more than memory_budget nodes are in memory, the worst leaf is dropped; its parent keeps
+          its f(n) and regenerates it later if needed. No explored set is kept, getExplored() is empty.
+        """
+
+        if self._done:
+            return  # If already done, do nothing
+
+        best = self._pop_best()
+        if best is None or best.f == float("inf"):
+            self._done = True
+            self._path = []  # No path found within the memory budget
+            return
+
+        if best.cell == self._goal:
+            self._done = True
+            self._cost = best.g
+            node = best
+            while node is not None:
+                self._path.append(node.cell)
+                node = node.parent
+            self._path.reverse()
+            return
+
+        cell = best.pending.pop()
+        g = best.g + 1
+        remembered = best.forgotten.pop(cell, None)
+        self._undominate(best, cell)
+        known = self._best_node.get(cell)
+        if known is None or known.g > g:
+            # f(n) never decreases along a path; a regenerated node keeps the f(n) backed up before dropping it
+            f = max(best.f, g + self.heuristic(cell))
+            if remembered is not None:
+                f = max(f, remembered)
+            if cell != self._goal and best.depth + 1 >= self.memory_budget - 1:
+                f = float("inf")  # No room left for a path through this node
+            self._new_node(cell, g, f, best)
+            self._expanded += 1
+        else:
+            # Pruned, known reaches the cell as cheaply. The f(n) of this node is backed up without the
+            # cell, which it gets back if known is dropped.
+            self._dominate(best, cell, known)
+
+        if not best.pending:
+            self._set_open(best, False)
+            self._backup(best)
+
+        while self._nodes_in_memory > self.memory_budget:
+            self._drop_worst_leaf()
+        self._compact()
+
+        # Update max frontier size and memory
+        self._max_frontier_size = max(self._max_frontier_size, self._open_size)
+        self._max_nodes_in_memory = max(self._max_nodes_in_memory, self._nodes_in_memory)
+
+    def getFrontier(self):
+        """Returns the open nodes in memory as frontier tuples."""
+        return [(node.cell, node.f - node.g, node.g, node.parent.cell if node.parent else node.cell)
+                for node in self._best_node.values() if node.in_open]
+
+    def _memory_structures(self) -> dict:
+        # The tree first, so the nodes are counted there and the heaps only add their items. Dropped nodes
+        # still referenced by stale heap items count in the heaps.
+        structures = super()._memory_structures()
+        structures.update(tree=self._root, best_node=self._best_node, open=self._open, leaves=self._leaves)
+        return structures
+
+    def getFrontierSize(self) -> int:
+        """Returns the number of open nodes in memory."""
+        return self._open_size
+
+    def getNumberOfExpanded(self) -> int:
+        """Returns the number of generated nodes, regenerations of dropped nodes included."""
+        return self._expanded
+
+    def getNumberOfForgotten(self) -> int:
+        """Returns the number of nodes dropped to stay within memory_budget."""
+        return self._forgotten
@@ -0,0 +1,69 @@
+from array import array
+
+
+class SparseArray(dict):
+    """Dict that reads like a preallocated array: cells that were never written read as default.
+    Used by searches that only ever touch a few cells of a large grid."""
+    __slots__ = ("default",)
+
+    def __init__(self, default) -> None:
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, cell_id):
+        return self.default
+
+
+class SearchState:
+    """Bookkeeping of one search in flat arrays indexed by linear cell id (row * columns + column).
+
+    The arrays are preallocated to the size of the grid, so reaching a node only
+    writes a few machine integers instead of allocating tuples and dict entries.
+    They are array.array rather than numpy arrays because the search loops read and
+    write single elements, which array.array does without creating numpy scalars.
+    With sparse=True they are SparseArray dicts instead, which only hold the cells
+    actually reached, for searches that keep little in memory or answer from a cache.
+    """
+    __slots__ = ("parent", "g", "depth", "closed", "explored")
+
+    def __init__(self, size, sparse=False) -> None:
+        if sparse:
+            self.parent, self.g, self.depth = SparseArray(-1), SparseArray(-1), SparseArray(0)
+            self.closed = SparseArray(0)
+            self.explored = array("i")
+            return
+        self.parent = array("i", [-1]) * size  # Parent cell id, -1 if not reached; the root is its own parent
+        self.g = array("i", [-1]) * size  # Cost g(n) of the best path found so far, -1 if not reached
+        self.depth = array("i", [0]) * size  # Depth of the node in the search tree
+        self.closed = bytearray(size)  # 1 once the node has been expanded
+        self.explored = array("i")  # Expanded cell ids in expansion order, for drawing
+
+    def reach(self, cell_id, parent, g, depth) -> None:
+        """Records a (better) path to cell_id."""
+        self.parent[cell_id] = parent
+        self.g[cell_id] = g
+        self.depth[cell_id] = depth
+
+    def close(self, cell_id) -> None:
+        """Marks cell_id as expanded, once."""
+        if not self.closed[cell_id]:
+            self.closed[cell_id] = 1
+            self.explored.append(cell_id)
+
+    def pathTo(self, cell_id) -> list:
+        """Returns the cell ids from the root to cell_id by walking the parent array."""
+        parent = self.parent
+        path = [cell_id]
+        while parent[cell_id] != cell_id:
+            cell_id = parent[cell_id]
+            path.append(cell_id)
+        path.reverse()
+        return path
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays (the entries only, for a sparse state)."""
+        if isinstance(self.closed, SparseArray):
+            return sum(len(table) for table in (self.parent, self.g, self.depth, self.closed)) * 8 + \
+                self.explored.itemsize * len(self.explored)
+        return sum(a.itemsize * len(a) for a in (self.parent, self.g, self.depth, self.explored)) + len(self.closed)
@@ -0,0 +1,143 @@
+import numpy
+
+from searchalgorithms.base import SearchAlgorithmBase
+from searchalgorithms.graph import DOWN, LEFT, RIGHT, UP
+
+
+class wavefront(SearchAlgorithmBase):
+    capabilities = frozenset({"optimal", "vectorized"})
+    # Levels of at most this many cells are expanded in a Python loop instead of with array operations
+    small_level = 32
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def reset(self, grid, start, goal):
+        super().reset(grid, start, goal)
+        # The frontier is one BFS level, kept as an array of linear cell ids (row * columns + column)
+        self._levels = []  # Cell ids of every expanded level, for drawing
+        self._levels_listed = 0  # Levels already copied into the explored list
+        self._expanded = 0
+        self._level = 0
+        if grid is None:
+            return
+        self._open = self._graph.free.copy()  # Free cells that have not been reached yet
+        self._distance = numpy.full(grid.shape, -1, dtype=numpy.int32)
+        self._wave = numpy.array([self._graph.cellId(start)] if start is not None else [], dtype=numpy.int64)
+        if start is not None:
+            self._distance[start] = 0
+            self._open[start] = False
+        # Bit of every move in the neighbor masks of the compiled graph, and the cell id offset of the move
+        columns = self._graph.columns
+        self._moves = ((UP, -columns), (DOWN, columns), (LEFT, -1), (RIGHT, 1))
+        self._mask_bytes = self._graph.mask.tobytes()  # Indexing bytes returns a Python int, for small levels
+
+    def step(self):
+        """
+        Performs one level of a vectorized Breadth-First Search (BFS).
+        - The whole current level is expanded at once: the level is shifted
+          Up, Down, Left and Right, and ANDed with the free cells and the unvisited cells.
+        - One step is one BFS level, so the visualizer gets one snapshot per level.
+        Unlike bfs, the level that contains the goal is expanded completely.
+        """
+
+        if self._done:
+            return  # If already done, do nothing
+
+        ids = self._wave
+        # Check if the frontier is empty. If it is, mark the search as done (failure).
+        if len(ids) == 0:
+            self._done = True
+            self._path = []  # No path found
+            return
+
+        # Mark the whole level as explored (the explored list of tuples is only built when it is drawn)
+        self._levels.append(ids)
+        self._expanded += len(ids)
+        self._max_depth = self._level
+
+        # Goal check
+        if self._distance[self._goal] == self._level:
+            self._done = True
+            self._path = self._reconstruct_path()
+            return
+
+        # Next level: the neighbors of the level cells, shifted by the moves their masks allow (so inside
+        # the grid and free), that are not visited yet. Only the level cells and their neighbors are
+        # touched, never the rest of the grid, so a level costs O(cells in the level).
+        open_cells = self._open.reshape(-1)
+        self._level += 1
+        if len(ids) <= self.small_level:
+            # A few cells, e.g. in a corridor: a loop is cheaper than the fixed cost of the array calls
+            reached = []
+            mask_bytes = self._mask_bytes
+            for cell_id in ids.tolist():
+                mask = mask_bytes[cell_id]
+                for bit, offset in self._moves:
+                    if mask & bit and open_cells[cell_id + offset]:
+                        open_cells[cell_id + offset] = False
+                        reached.append(cell_id + offset)
+            reached.sort()
+            reached = numpy.array(reached, dtype=numpy.int64)
+        else:
+            masks = self._graph.mask.reshape(-1)[ids]
+            reached = numpy.concatenate([ids[(masks & bit) != 0] + offset for bit, offset in self._moves])
+            reached = numpy.unique(reached[open_cells[reached]])  # Sorted, a cell reached twice once
+            open_cells[reached] = False
+        self._distance.reshape(-1)[reached] = self._level
+        self._wave = reached
+
+        # Update max frontier size
+        frontier_size = len(self._wave)
+        self._max_frontier_size = max(self._max_frontier_size, frontier_size)
+        self._max_nodes_in_memory = max(self._max_nodes_in_memory, frontier_size + self._expanded)
+
+    def _cells(self, ids):
+        """Returns cell ids as an (n, 2) array of (row, column)."""
+        return numpy.stack(numpy.divmod(ids, self._graph.columns), axis=1)
+
+    def getFrontier(self):
+        """Returns the cells of the next level as frontier tuples (node, heuristic_h, cost_g, parent)."""
+        if self._done or self._grid is None:
+            return []
+        level = self._level
+        return [(tuple(cell), 0, level, None) for cell in self._cells(self._wave).tolist()]
+
+    def _memory_structures(self) -> dict:
+        structures = super()._memory_structures()
+        structures["levels"] = self._levels
+        if self._grid is not None:
+            structures.update(open=self._open, distance=self._distance, wave=self._wave)
+        return structures
+
+    def getFrontierSize(self) -> int:
+        """Returns the number of cells in the next level."""
+        return len(self._wave) if self._grid is not None and not self._done else 0
+
+    def getExplored(self) -> list:
+        """Returns the explored cells, level by level, for visualization purposes. """
+        for ids in self._levels[self._levels_listed:]:
+            self._explored.extend(map(tuple, self._cells(ids).tolist()))
+        self._levels_listed = len(self._levels)
+        return self._explored
+
+    def getNumberOfExpanded(self) -> int:
+        """Returns the number of cells in the expanded levels."""
+        return self._expanded
+
+    def getLevels(self) -> list:
+        """Returns the expanded BFS levels, one (n, 2) array of (row, column) cells per level."""
+        return [self._cells(ids) for ids in self._levels]
+
+    def _reconstruct_path(self):
+        """Walks from the goal to the start, each time to a neighbor one level closer to the start."""
+        distance = self._distance
+        current = self._goal
+        path = [current]
+        while current != self._start:
+            d = distance[current]
+            current = next(n for n in self._graph.neighbors(current) if distance[n] == d - 1)
+            path.append(current)
+        path.reverse()
+        self._cost = len(path) - 1  # Cost is the length of the path minus one (number of moves)
+        return path
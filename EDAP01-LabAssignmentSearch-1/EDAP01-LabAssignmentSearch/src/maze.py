@@ -1,185 +1,96 @@
-import pygame
-import numpy
-from os.path import exists, dirname, join
+import time
+from src.model import MazeModel
 
-colors = {
-    -1: (206, 171, 147), #grid
-    0: (255, 251, 233), #empty
-    1: (227, 202, 165), #occupied
-    2: (79, 189, 186), #start
-    3: (246, 137, 137), #end
-    4: (255, 0, 0), #frontier, red
-    5: (0, 0, 255), #explored, blue
-    6: (0, 255, 0), #path, green
-}
-
-class maze:
-    window_size = (706, 706)
-    #window_size = (310, 200) # for mini mazes
-    cell_properties = {"height":20,"width":20,"margin":2}
-    sizes = (33,33)
-    #sizes = (9,14) # for mini mazes
-    timeout = 100000
+class maze(MazeModel):
+    """A maze with its pygame window: the MazeModel plus a src.view.MazeView that draws the search.
+    In headless mode pygame is never imported, see MazeModel."""
+    render_every = 1 # draw only every render_every-th search step
+    target_fps = None # if set, draw at most target_fps frames per second instead of pacing the search at 60 steps per second
     done = False
     found = False
-    start_exist = False
-    end_exist = False
-    start = None
-    end = None
-    algorithm = None
-    algorithm_name = "" 
-    maze_id = 1
-    path = [] 
     saveImages = False
+    record_path = None # file the frames are recorded to with save_img (.gif or .npz), default images/maze_<id>_algorithm_<name>.gif
+    record_every = 1 # record only every record_every-th drawn frame
+    headless = False
+    view = None
 
 
-    def __init__(self, maze_id=1, save_img = False) -> None:
-        pygame.init()
-        pygame.display.set_caption("LUND - LTH - MAZE {}".format(self.maze_id))
-        self.screen = pygame.display.set_mode(self.window_size)
-        self.clock = pygame.time.Clock()
-        self.grid = numpy.zeros(self.sizes)
-        self.maze_id=maze_id
-        self.saveImages = save_img
-        self.resetgrid(fill=False)
-        maze_path = "./mazes/maze{}.txt".format(self.maze_id)
-        self.loadgrid(maze_path)
-        print(maze_path, "is loaded")  
+    def __init__(self, maze_id=1, save_img = False, headless = False, maze_file = None, render_every = 1, target_fps = None) -> None:
+        # In headless mode pygame is never imported nor initialized: no window, no drawing, no images
+        self.headless = headless
+        self.saveImages = save_img and not headless
+        self.render_every = max(1, render_every)
+        self.target_fps = target_fps
+        super().__init__(maze_id=maze_id, maze_file=maze_file)
+        if not self.headless:
+            # The window size depends on the maze size, so the grid is loaded first
+            from src.view import MazeView
+            self.view = MazeView(self.grid, self.maze_id, self.render_every, self.target_fps)
 
     def __del__(self) -> None:
-        pygame.quit()
-
-    def loadSearchAlgorithm(self, algorithm_name, initial=False):
-        module = "searchalgorithms."+algorithm_name
-        if exists(join(dirname(dirname(__file__)),"searchalgorithms",algorithm_name)+".py"):
-            m = __import__(module)
-            algo = getattr(m, algorithm_name)
-            self.algo = getattr(algo, algorithm_name)
-            self.algorithm_name = algorithm_name
-            print(algorithm_name, "is loaded")
-            # Throw exception if nothing has been implemented yet
-            try:
-                self.algo() 
-            except NotImplementedError as e:
-                print(f"Error: {e}")
-                # The program will stop here because the exception was raised
-                exit(1)            
-        else:
-            self.algorithm_name = ""
-            if not initial:
-                print("No algorithm loaded. Could not find",algorithm_name, "algorithm")
-            else:
-                print("No algorithm loaded")
-            return False
+        if self.view is not None:
+            self.view.close()
 
-    def loadgrid(self, path) -> None:
-        self.grid = numpy.loadtxt(path)
-        for row in range(self.sizes[0]):
-            for column in range(self.sizes[1]):
-                if self.grid[row][column] == 2:
-                    self.start_exist = True
-                    self.start = (row,column)
-                elif self.grid[row][column] == 3:
-                    self.end_exist = True
-                    self.end = (row,column)
+    def draw(self):
+        """Draws the current state of the search and returns the RGB image of the frame (None if headless)."""
+        if self.view is None:
+            return None
+        return self.view.draw(self.algorithm, self.path)
 
-    def resetgrid(self,fill=False) -> None:
-        if fill:
-            self.grid = numpy.ones(self.sizes)
-        else:
-            self.grid = numpy.zeros(self.sizes)
-        self.start_exist = False
-        self.end_exist = False
+    def frameDue(self, count) -> bool:
+        """Returns True if step number count should be drawn, according to render_every and target_fps."""
+        return self.view is not None and self.view.frameDue(count)
 
-    def draw(self) -> None:
-        f = []
-        e = []
-        if self.algorithm:
-            f = self.algorithm.getFrontier()
-            f = [n[0] for n in f]
-            e = self.algorithm.getExplored()
-            
-        self.screen.fill(colors[-1])
-        for row in range(self.sizes[0]):
-            for column in range(self.sizes[1]):
-                if self.grid[row][column] in colors:
-                    if (row,column) in self.path:
-                        color = colors[6]
-                    elif (row,column) in e:
-                        color = colors[5]
-                    elif (row,column) in f:
-                        color = colors[4]
-                    else:
-                        color = colors[self.grid[row][column]]
-                pygame.draw.rect(self.screen, color, 
-                [self.cell_properties["margin"] + (self.cell_properties["margin"] + self.cell_properties["width"]) * column, 
-                self.cell_properties["margin"] + (self.cell_properties["margin"] + self.cell_properties["height"]) * row, 
-                self.cell_properties["width"], self.cell_properties["height"]])
-        pygame.display.flip() 
-        self.clock.tick(60)
-                                               
-    def runSearchAlgorithm(self) -> None:
-        pygame.display.set_caption("LUND - LTH - MAZE {} - Algorithm {}".format(self.maze_id, self.algorithm_name))
-        frame_no = 0        
-        # start running
+    def runSearchAlgorithm(self):
+        """Runs the loaded search algorithm until it is done, drawing every step unless headless.
+        Returns the statistics of the run as a dictionary (None if the search could not start). """
+        if self.headless:
+            return super().runSearchAlgorithm()
+        self.view.setCaption("LUND - LTH - MAZE {} - Algorithm {}".format(self.maze_id, self.algorithm_name))
         if self.algorithm_name == "":
             print("No algorithm selected")
-            return
-        self.algorithm = self.algo()
-        if not self.start_exist:
-            print("Start position is not set")
-        elif not self.end_exist:
-            print("End position is not set")
-        else:
+            return None
+        if self.startSearch():
             count = 0
-            self.algorithm.reset(self.grid, self.start, self.end)
+            self.view.reset()
+            recorder = None
+            if self.saveImages:
+                # Frames are encoded into one file by a background thread, the search only queues them
+                from src.recorder import FrameRecorder, default_extension
+                path = self.record_path or "./images/maze_{0}_algorithm_{1}{2}".format(
+                    self.maze_id, self.algorithm_name, default_extension())
+                recorder = FrameRecorder(path, every=self.record_every)
+            start_time = time.perf_counter()
             while count<self.timeout and not self.algorithm.isDone():
-                pygame.event.get() #to prevent freezing
+                self.view.pumpEvents() #to prevent freezing
                 self.algorithm.step()
-                self.draw()
                 count +=1
-                if self.saveImages:
-                    # save the output to generate gif
-                    outputgifname = "./images/gif_images/maze_{0}_algorithm_{1}_frame_{2}.png".format(self.maze_id,self.algorithm_name,frame_no)
-                    pygame.image.save(self.screen,outputgifname) 
-                    frame_no +=1 
-            if count>=self.timeout:
-                print("Timeout")
-            else:
-                print("------------------------")
-                print("Found Path with", self.algorithm.getCost(),"cost")
-                print("Expanded", self.algorithm.getNumberOfExpanded(),"nodes")
-                print("Max Frontier size", self.algorithm.getMaxFrontierSize())                
-                print("Max node memory size", self.algorithm.getMaxMemoryUsage())            
-                print("Max depth", self.algorithm.getMaxDepth())
-                print("------------------------")
+                if not self.frameDue(count):
+                    continue
+                image = self.draw()
+                if recorder is not None:
+                    recorder.add(image)
+            self.finishSearch(count, time.perf_counter() - start_time)
+            if count<self.timeout:
                 all_path = self.algorithm.getPath()
-                for p in all_path:
+                for i, p in enumerate(all_path):
                     self.path.append(p)
-                    self.draw()
-                    if self.saveImages:
-                        # save the output to generate gif
-                        outputgifname = "./images/gif_images/maze_{0}_algorithm_{1}_frame_{2}.png".format(self.maze_id,self.algorithm_name,frame_no)
-                        pygame.image.save(self.screen,outputgifname) 
-                        frame_no +=1
+                    if not self.frameDue(i + 1) and i + 1 < len(all_path):
+                        continue
+                    image = self.draw()
+                    if recorder is not None:
+                        recorder.add(image)
+            if recorder is not None:
+                print(recorder.close(), "is saved with", recorder.getWritten(), "frames")
 
         # save the output
         outputfilename = "./images/maze_{0}_algorithm_{1}.png".format(self.maze_id,self.algorithm_name)
-        pygame.image.save(self.screen,outputfilename)  
-        
+        self.view.save(outputfilename)
+
         # show the final maze and computed solution until pressing Escape!
         while not self.done:
             self.draw()
-            for event in pygame.event.get(): 
-                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                    self.done = True
-                    pygame.quit()
-                    break
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                            print("Exit")
-                            pygame.quit()
-                            self.done = True
-                            break
-                    else:
-                        self.draw() 
\ No newline at end of file
+            if self.view.exitRequested():
+                self.done = True
+                self.view.close()
+        return self.statistics
@@ -0,0 +1,144 @@
+"""Compact binary maze format (.mzb) and conversion from the text mazes.
+
+Layout (little endian):
+    offset  0  4 bytes  magic b"MAZB"
+    offset  4  uint8    format version (1)
+    offset  5  uint8    cell packing: 0 = one uint8 per cell, 1 = four 2-bit cells per byte
+    offset  6  2 bytes  reserved
+    offset  8  uint32   rows
+    offset 12  uint32   columns
+    offset 16  int32    start row, start column (-1, -1 if the maze has no start)
+    offset 24  int32    goal row, goal column (-1, -1 if the maze has no goal)
+    offset 32  cells in row-major order
+
+Cell values are 0 free, 1 wall, 2 start, 3 goal, and 4-255 free terrain that
+costs value - 2 to enter (see searchalgorithms.graph.TERRAIN).
+
+Unpacked files are memory-mapped on load, so opening a huge maze costs almost
+nothing until the cells are touched. Packed files are 4x smaller on disk but
+are unpacked into memory, and can only hold the cell values 0-3.
+
+Convert the text mazes with:
+    python -m src.mazefile mazes/*.txt [--packed]
+"""
+import argparse
+import os
+import struct
+
+import numpy
+
+MAGIC = b"MAZB"
+VERSION = 1
+HEADER = struct.Struct("<4sBB2xIIiiii")
+UNPACKED = 0
+PACKED = 1
+
+
+def find_start_goal(grid):
+    """Returns the (start, goal) cells of a grid, or None for a missing one.
+    If a value occurs more than once the last cell in row-major order is used. """
+    cells = []
+    for value in (2, 3):
+        found = numpy.flatnonzero(grid.reshape(-1) == value)
+        if len(found):
+            cells.append(tuple(int(i) for i in numpy.unravel_index(found[-1], grid.shape)))
+        else:
+            cells.append(None)
+    return cells[0], cells[1]
+
+
+def save_maze(path, grid, packed=False) -> None:
+    """Writes a grid to a binary maze file."""
+    grid = numpy.asarray(grid)
+    if grid.ndim != 2:
+        raise ValueError("A maze grid must have two dimensions, got shape {}".format(grid.shape))
+    if grid.min() < 0 or grid.max() > (3 if packed else 255):
+        raise ValueError("Cell values do not fit in the {} format".format("packed" if packed else "uint8"))
+    cells = grid.astype(numpy.uint8)
+    start, goal = find_start_goal(cells)
+    start = start if start is not None else (-1, -1)
+    goal = goal if goal is not None else (-1, -1)
+    header = HEADER.pack(MAGIC, VERSION, PACKED if packed else UNPACKED,
+                         cells.shape[0], cells.shape[1], start[0], start[1], goal[0], goal[1])
+    if packed:
+        flat = cells.reshape(-1)
+        padded = numpy.zeros(-(-len(flat) // 4) * 4, dtype=numpy.uint8)
+        padded[:len(flat)] = flat
+        quads = padded.reshape(-1, 4)
+        data = quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+    else:
+        data = cells
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(numpy.ascontiguousarray(data).tobytes())
+
+
+def read_header(path):
+    """Returns (packing, rows, columns, start, goal) of a binary maze file."""
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError("{} is too short to be a binary maze file".format(path))
+    magic, version, packing, rows, columns, sr, sc, gr, gc = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("{} is not a binary maze file".format(path))
+    if version != VERSION:
+        raise ValueError("Unsupported binary maze version {} in {}".format(version, path))
+    start = (sr, sc) if sr >= 0 else None
+    goal = (gr, gc) if gr >= 0 else None
+    return packing, rows, columns, start, goal
+
+
+def load_maze(path, mmap=True):
+    """Reads a binary maze file and returns (grid, start, goal).
+    Unpacked cells are memory-mapped read-only unless mmap is False."""
+    packing, rows, columns, start, goal = read_header(path)
+    if packing == UNPACKED:
+        if mmap:
+            grid = numpy.memmap(path, dtype=numpy.uint8, mode="r", offset=HEADER.size, shape=(rows, columns))
+        else:
+            grid = numpy.fromfile(path, dtype=numpy.uint8, offset=HEADER.size, count=rows * columns).reshape(rows, columns)
+    elif packing == PACKED:
+        data = numpy.fromfile(path, dtype=numpy.uint8, offset=HEADER.size)
+        cells = numpy.empty((len(data), 4), dtype=numpy.uint8)
+        for i in range(4):
+            cells[:, i] = (data >> (2 * i)) & 3
+        grid = cells.reshape(-1)[:rows * columns].reshape(rows, columns)
+    else:
+        raise ValueError("Unknown cell packing {} in {}".format(packing, path))
+    return grid, start, goal
+
+
+def maze_path(maze_id, directory="./mazes"):
+    """Returns the file of a predefined maze, the converted binary file if there is one."""
+    binary_path = os.path.join(directory, "maze{}.mzb".format(maze_id))
+    if os.path.exists(binary_path):
+        # Prefer the converted binary maze, it loads without parsing
+        return binary_path
+    return os.path.join(directory, "maze{}.txt".format(maze_id))
+
+
+def load_grid(path):
+    """Reads a binary or text maze file and returns (grid, start, goal) with a uint8 grid."""
+    if path.endswith(".mzb"):
+        return load_maze(path)
+    grid = numpy.loadtxt(path, ndmin=2).astype(numpy.uint8)
+    start, goal = find_start_goal(grid)
+    return grid, start, goal
+
+
+def convert(text_path, binary_path=None, packed=False):
+    """Converts a text maze (numpy.loadtxt format) to the binary format and returns the new path."""
+    if binary_path is None:
+        binary_path = text_path.rsplit(".", 1)[0] + ".mzb"
+    save_maze(binary_path, numpy.loadtxt(text_path, ndmin=2), packed=packed)
+    return binary_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert text mazes to the binary maze format')
+    parser.add_argument('mazes', nargs='+', help='text maze files')
+    parser.add_argument('--packed', action='store_true', help='store four 2-bit cells per byte')
+    args = parser.parse_args()
+    for text_path in args.mazes:
+        print(text_path, "->", convert(text_path, packed=args.packed))
@@ -0,0 +1,132 @@
+import numpy
+import time
+from src.mazefile import load_grid, maze_path
+from searchalgorithms import landmarks, registry
+
+
+class MazeModel:
+    """The maze without a window: the grid with its start and goal, the loaded search algorithm,
+    headless runs and their statistics. It does not import pygame, so processes that only load
+    and search mazes start fast; src.maze adds the pygame view on top of it."""
+    sizes = (33,33) # (rows, columns), taken from the maze file in loadgrid
+    timeout = 100000 # minimum number of steps, raised to the number of cells for bigger mazes
+    start_exist = False
+    end_exist = False
+    start = None
+    end = None
+    algorithm = None
+    algorithm_name = ""
+    maze_id = 1
+    path = []
+    statistics = None
+    measure_memory = False # trace the allocations of headless searches with tracemalloc for the peak_bytes statistic
+    collectors = () # instrumentation collectors attached to every algorithm run, see searchalgorithms.instrumentation
+
+    def __init__(self, maze_id=1, maze_file=None) -> None:
+        self.maze_id = maze_id
+        self.path = []
+        self.grid = numpy.zeros(self.sizes)
+        self.resetgrid(fill=False)
+        path = maze_file if maze_file is not None else maze_path(self.maze_id)
+        self.loadgrid(path)
+        print(path, "is loaded")
+
+    def loadSearchAlgorithm(self, algorithm_name) -> None:
+        """Loads the algorithm class from searchalgorithms.registry. Raises registry.AlgorithmError
+        (UnknownAlgorithmError, AlgorithmNotImplementedError) if it cannot be used, the previous
+        algorithm stays loaded then."""
+        self.algo = registry.get(algorithm_name)
+        self.algorithm_name = algorithm_name
+        print(algorithm_name, "is loaded")
+
+    def loadgrid(self, path) -> None:
+        self.grid, self.start, self.end = load_grid(path)
+        self.start_exist = self.start is not None
+        self.end_exist = self.end is not None
+        self.sizes = self.grid.shape
+        self.timeout = max(MazeModel.timeout, self.grid.size)
+        # Landmark tables stored next to the maze file are picked up by astar (ALT heuristic)
+        if landmarks.load_for(path, self.grid) is not None:
+            print(landmarks.landmark_path(path), "is loaded")
+
+    def resetgrid(self,fill=False) -> None:
+        if fill:
+            self.grid = numpy.ones(self.sizes)
+        else:
+            self.grid = numpy.zeros(self.sizes)
+        self.start_exist = False
+        self.end_exist = False
+
+    def startSearch(self) -> bool:
+        """Creates and resets the loaded search algorithm for the grid. Returns False if the search
+        cannot start because there is no algorithm, start or goal."""
+        if self.algorithm_name == "":
+            print("No algorithm selected")
+            return False
+        self.algorithm = self.algo()
+        if self.collectors:
+            self.algorithm.instrument(*self.collectors)
+        self.statistics = None
+        if not self.start_exist:
+            print("Start position is not set")
+            return False
+        if not self.end_exist:
+            print("End position is not set")
+            return False
+        self.algorithm.reset(self.grid, self.start, self.end)
+        self.path = []
+        return True
+
+    def finishSearch(self, count, wall_time) -> dict:
+        """Collects and prints the statistics of a search that ran count steps in wall_time seconds."""
+        self.statistics = {
+            "maze": self.maze_id,
+            "algorithm": self.algorithm_name,
+            "timeout": count>=self.timeout,
+            "found": len(self.algorithm.getPath()) > 0,
+            "cost": self.algorithm.getCost(),
+            "expanded": self.algorithm.getNumberOfExpanded(),
+            "max_frontier": self.algorithm.getMaxFrontierSize(),
+            "max_memory": self.algorithm.getMaxMemoryUsage(),
+            "max_depth": self.algorithm.getMaxDepth(),
+            "wall_time": wall_time,
+            "memory_bytes": self.algorithm.getMemoryBytes(),
+            "bytes_per_node": self.algorithm.getBytesPerNode()["total"],
+            "peak_bytes": self.algorithm.getPeakBytes(),
+            "peak_rss": self.algorithm.getPeakRSS(),
+        }
+        if count>=self.timeout:
+            print("Timeout")
+        else:
+            print("------------------------")
+            print("Found Path with", self.algorithm.getCost(),"cost")
+            print("Expanded", self.algorithm.getNumberOfExpanded(),"nodes")
+            print("Max Frontier size", self.algorithm.getMaxFrontierSize())
+            print("Max node memory size", self.algorithm.getMaxMemoryUsage())
+            print("Max depth", self.algorithm.getMaxDepth())
+            print("Wall time {:.6f} s".format(wall_time))
+            print("Search memory {} bytes, {:.1f} bytes per node".format(
+                self.statistics["memory_bytes"], self.statistics["bytes_per_node"]))
+            for name, size in self.algorithm.getMemoryBreakdown().items():
+                print("    {:<18} {} bytes".format(name, size))
+            if self.statistics["peak_bytes"] is not None:
+                print("Peak allocated", self.statistics["peak_bytes"], "bytes")
+            if self.statistics["peak_rss"] is not None:
+                print("Peak RSS", self.statistics["peak_rss"], "bytes")
+            print("------------------------")
+        return self.statistics
+
+    def runSearchAlgorithm(self):
+        """Runs the loaded search algorithm to completion without drawing.
+        Returns the statistics of the run as a dictionary (None if the search could not start). """
+        if not self.startSearch():
+            return None
+        start_time = time.perf_counter()
+        if self.measure_memory:
+            # Traced allocations make the search much slower, so wall_time is not comparable in this mode
+            self.algorithm.measurePeak(self.grid, self.start, self.end, max_expansions=self.timeout)
+        else:
+            # Nothing to draw, run the whole search in the algorithm's own loop
+            self.algorithm.solve(max_expansions=self.timeout)
+        count = self.timeout if not self.algorithm.isDone() else 0
+        return self.finishSearch(count, time.perf_counter() - start_time)
@@ -0,0 +1,245 @@
+"""Parallel execution of large batches of search queries.
+
+A query is (maze, start, goal, algorithm): maze is a predefined maze id or a maze
+file, start and goal are (row, column) cells or None for the ones stored in the
+maze. Every distinct maze is loaded once in the parent process and placed in
+shared memory; the worker processes map the same memory instead of receiving a
+pickled copy of the grid with every task. Results are yielded in completion order.
+
+The timeout of a query covers its search only: it starts once the worker has
+attached the grid, imported the algorithm and called reset(), and solve()
+checks it as it goes. A query that is still running KILL_GRACE seconds
+after its timeout, e.g. in one long step, is stopped by killing its worker
+process. The pool replaces the worker; the queries that had not started yet
+stay queued, the ones the worker was running are started again.
+
+Usage (from the project directory):
+    python -m src.parallel queries.csv --workers 8 --timeout 10 > results.jsonl
+where queries.csv has the columns maze, algorithm and optionally
+start_row, start_col, goal_row, goal_col.
+"""
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+import traceback
+from multiprocessing import shared_memory, sharedctypes
+
+import numpy
+
+from searchalgorithms import landmarks, registry
+from src.mazefile import load_grid, maze_path
+
+# Shared grids attached by this worker process: shared memory name -> (SharedMemory, grid)
+_attached = {}
+# Progress of every query of the batch, set up by the pool initializer: (pids, start times, finished),
+# shared arrays indexed by query. A pid is written when a worker takes the query, the start time
+# (time.monotonic()) when its search starts, and the finished flag when it returns or raises.
+# Plain shared memory, unlike a queue, has no lock a killed worker could leave held.
+_progress = None
+
+# Seconds a query may run past its timeout before its worker process is killed
+KILL_GRACE = 1.0
+# Seconds between two checks of the running queries when there is a timeout
+POLL_INTERVAL = 0.05
+
+
+def _init_worker(progress) -> None:
+    global _progress
+    _progress = progress
+
+
+def _attach(name, shape, dtype, maze_file):
+    """Returns the grid stored in the named shared memory block, attaching it once per worker.
+    The landmark table of the maze file, if any, is registered at the same time."""
+    if name not in _attached:
+        # Workers share the resource tracker of the parent, which owns the block and unlinks it
+        block = shared_memory.SharedMemory(name=name)
+        grid = numpy.ndarray(shape, dtype=dtype, buffer=block.buf)
+        grid.flags.writeable = False
+        landmarks.load_for(maze_file, grid)
+        _attached[name] = (block, grid)
+    return _attached[name][1]
+
+
+def _run_query(index, block_name, shape, dtype, maze_file, start, goal, algorithm_name, timeout):
+    """Runs one query in a worker process and returns its statistics."""
+    pids, start_times, finished = _progress if _progress is not None else (None, None, None)
+    if pids is not None:
+        pids[index] = os.getpid()
+    try:
+        grid = _attach(block_name, shape, dtype, maze_file)
+        algorithm = registry.get(algorithm_name)()  # Imported once per worker, cached afterwards
+        algorithm.reset(grid, start, goal)
+        # The timeout starts here, loading the maze and the algorithm and resetting it are not counted
+        start_time = time.perf_counter()
+        deadline = start_time + timeout if timeout is not None else None
+        if start_times is not None:
+            start_times[index] = time.monotonic()
+        algorithm.solve(deadline=deadline)
+        if not algorithm.isDone():
+            raise TimeoutError("Query did not finish within {} s".format(timeout))
+        wall_time = time.perf_counter() - start_time
+    finally:
+        if finished is not None:
+            finished[index] = True
+    return {
+        "found": len(algorithm.getPath()) > 0,
+        "cost": algorithm.getCost(),
+        "expanded": algorithm.getNumberOfExpanded(),
+        "max_frontier": algorithm.getMaxFrontierSize(),
+        "max_memory": algorithm.getMaxMemoryUsage(),
+        "max_depth": algorithm.getMaxDepth(),
+        "wall_time": wall_time,
+        "memory_bytes": algorithm.getMemoryBytes(),
+        "bytes_per_node": algorithm.getBytesPerNode()["total"],
+        "peak_rss": algorithm.getPeakRSS(),  # Of the worker process, over all queries it ran so far
+    }
+
+
+class SharedMazes:
+    """Loads every distinct maze of a batch once into shared memory. Use as a context manager,
+    the blocks are released on exit."""
+
+    def __init__(self) -> None:
+        self._mazes = {}  # maze spec -> (block, shape, dtype, maze file, start, goal)
+
+    def add(self, maze_spec):
+        """Returns (block name, shape, dtype, maze file, start, goal) of a maze, loading it on first use."""
+        maze_spec = str(maze_spec)
+        if maze_spec not in self._mazes:
+            path = maze_path(maze_spec) if maze_spec.isdigit() else maze_spec
+            grid, start, goal = load_grid(path)
+            block = shared_memory.SharedMemory(create=True, size=max(grid.nbytes, 1))
+            numpy.ndarray(grid.shape, dtype=grid.dtype, buffer=block.buf)[...] = grid
+            self._mazes[maze_spec] = (block, grid.shape, grid.dtype.str, path, start, goal)
+        block, shape, dtype, path, start, goal = self._mazes[maze_spec]
+        return block.name, shape, dtype, path, start, goal
+
+    def close(self) -> None:
+        for block, *_ in self._mazes.values():
+            block.close()
+            block.unlink()
+        self._mazes.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_queries(queries, workers=None, timeout=None):
+    """Runs the queries on a process pool and yields one result dictionary per query, in completion order.
+    queries is an iterable of (maze, start, goal, algorithm). A failing or timed out query yields a
+    result with status "error" or "timeout" instead of stopping the batch."""
+    with SharedMazes() as mazes:
+        tasks = {}  # index -> (arguments of _run_query, result)
+        for index, (maze_spec, start, goal, algorithm_name) in enumerate(queries):
+            result = {"index": index, "maze": maze_spec, "algorithm": algorithm_name,
+                      "start": start, "goal": goal}
+            try:
+                registry.get(algorithm_name)  # Unknown names fail here instead of in a worker
+                block_name, shape, dtype, maze_file, maze_start, maze_goal = mazes.add(maze_spec)
+            except registry.AlgorithmError as e:
+                result.update(status="error", error=str(e))
+                yield result
+                continue
+            except (OSError, ValueError) as e:
+                result.update(status="error", error="Could not load maze: {}".format(e))
+                yield result
+                continue
+            result["start"] = tuple(start) if start is not None else maze_start
+            result["goal"] = tuple(goal) if goal is not None else maze_goal
+            tasks[index] = ((index, block_name, shape, dtype, maze_file,
+                             result["start"], result["goal"], algorithm_name, timeout), result)
+        if tasks:
+            yield from _run_tasks(tasks, workers, timeout)
+
+
+def _run_tasks(tasks, workers, timeout):
+    """Runs the tasks on a process pool and yields their results. A query that overruns its timeout by
+    KILL_GRACE seconds has its worker killed and yields a timeout result; the pool starts a new worker."""
+    size = max(tasks) + 1
+    pids = sharedctypes.RawArray("q", size)
+    start_times = sharedctypes.RawArray("d", [math.nan] * size)
+    finished = sharedctypes.RawArray("b", size)
+    completed = queue.Queue()  # (index, value, exception), put by the result thread of the pool
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=((pids, start_times, finished),)) as pool:
+
+        def submit(index):
+            pids[index], start_times[index], finished[index] = 0, math.nan, False
+            pool.apply_async(_run_query, tasks[index][0],
+                             callback=lambda value: completed.put((index, value, None)),
+                             error_callback=lambda e: completed.put((index, None, e)))
+
+        for index in tasks:
+            submit(index)
+        killed = set()  # pids of the workers killed so far
+        while tasks:
+            try:
+                index, value, e = completed.get(timeout=POLL_INTERVAL if timeout is not None else None)
+            except queue.Empty:
+                pass
+            else:
+                if index in tasks:  # Not reported as a timeout when its worker was killed
+                    yield _result(tasks.pop(index)[1], value, e)
+            if timeout is None:
+                continue
+            # Queries the killed workers had started besides the one they were killed for never return
+            for index in [i for i in tasks if pids[i] in killed and not finished[i]]:
+                submit(index)
+            now = time.monotonic()
+            for index in [i for i in tasks if now - start_times[i] > timeout + KILL_GRACE]:
+                pid = pids[index]
+                # The query may have finished since the clock was read, then its result is on the way
+                if finished[index] or pid in killed:
+                    continue
+                os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+                killed.add(pid)
+                result = tasks.pop(index)[1]
+                result.update(status="timeout", error="Query did not finish within {} s, its worker was "
+                              "killed after {:.1f} s".format(timeout, now - start_times[index]))
+                yield result
+        # Leaving the block terminates the pool, a task lost with a killed worker would block close()
+
+
+def _result(result, value, e):
+    """Completes the result of a query with the statistics it returned or the exception it raised."""
+    if e is None:
+        result.update(value)
+        result["status"] = "ok"
+    elif isinstance(e, TimeoutError):
+        result.update(status="timeout", error=str(e))
+    else:
+        result.update(status="error", error="".join(traceback.format_exception_only(type(e), e)).strip())
+    return result
+
+
+def read_queries(path):
+    """Reads queries from a CSV file with the columns maze, algorithm and optionally
+    start_row, start_col, goal_row, goal_col (empty means the cell stored in the maze)."""
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            start = (int(row["start_row"]), int(row["start_col"])) if row.get("start_row") else None
+            goal = (int(row["goal_row"]), int(row["goal_col"])) if row.get("goal_row") else None
+            yield row["maze"], start, goal, row["algorithm"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run a batch of search queries on a process pool')
+    parser.add_argument('queries', help='CSV file with the queries')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=None, help='time limit per query in seconds, for the search after the maze is loaded and the algorithm reset; '
+                        'a query still running KILL_GRACE seconds later has its worker killed')
+    args = parser.parse_args()
+
+    for result in run_queries(list(read_queries(args.queries)), args.workers, args.timeout):
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
@@ -0,0 +1,172 @@
+"""Records rendered frames of a search into one file from a background thread.
+
+The search loop only hands the RGB image of a frame to a bounded queue; a writer
+thread encodes it and appends it to the file, so PNG/GIF encoding and disk writes
+no longer stall the search and close() only finishes the file. The output format
+follows the file extension:
+    .gif    animated GIF, needs Pillow (pip install Pillow)
+    .npz    compressed frame archive, frames stored as frame_000000, frame_000001, ...
+            (numpy.load(path)["frame_000000"] is an (height, width, 3) uint8 image)
+"""
+import os
+import queue
+import threading
+import zipfile
+
+import numpy
+
+try:
+    from PIL import GifImagePlugin, Image
+except ImportError:
+    Image = None
+
+_STOP = object()  # Queue item that ends the writer thread
+
+
+def default_extension() -> str:
+    """Returns ".gif" if Pillow is installed, else ".npz"."""
+    return ".gif" if Image is not None else ".npz"
+
+
+class FrameRecorder:
+    """Background frame writer fed through a bounded queue. Use as a context manager or call close().
+
+    Only every every-th frame passed to add() is recorded. When the writer falls
+    queue_size frames behind, add() waits for it (block=True) or drops the frame
+    (block=False) so that the search never waits, see getDropped().
+    """
+
+    def __init__(self, path, every=1, queue_size=64, block=True, frame_duration=50) -> None:
+        self.path = path
+        self.every = max(1, every)
+        self.block = block
+        self.frame_duration = frame_duration  # Milliseconds per GIF frame
+        if path.endswith(".gif"):
+            if Image is None:
+                raise ImportError("Recording a GIF needs Pillow (pip install Pillow), record to a .npz file instead")
+            self._writer = _GifWriter(path, frame_duration)
+        elif path.endswith(".npz"):
+            self._writer = _NpzWriter(path)
+        else:
+            raise ValueError("Unsupported recording format: {} (use .gif or .npz)".format(path))
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._offered = 0  # Frames passed to add()
+        self._written = 0
+        self._dropped = 0
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="FrameRecorder", daemon=True)
+        self._thread.start()
+
+    def add(self, image) -> None:
+        """Queues an RGB image (height, width, 3) as the next frame. The image must not be changed afterwards."""
+        self._offered += 1
+        if (self._offered - 1) % self.every != 0:
+            return
+        if self._error is not None:
+            raise self._error
+        try:
+            self._queue.put(image, block=self.block)
+        except queue.Full:
+            self._dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            image = self._queue.get()
+            if image is _STOP:
+                break
+            if self._error is not None:
+                continue  # Keep draining so add() never blocks forever
+            try:
+                self._writer.write(numpy.ascontiguousarray(image, dtype=numpy.uint8))
+                self._written += 1
+            except Exception as e:
+                self._error = e
+
+    def close(self) -> str:
+        """Writes the queued frames, finishes the file and returns its path."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+            if self._error is None:
+                self._writer.close()
+        if self._error is not None:
+            raise self._error
+        return self.path
+
+    def getWritten(self) -> int:
+        """Returns the number of frames written."""
+        return self._written
+
+    def getDropped(self) -> int:
+        """Returns the number of frames dropped because the queue was full (only with block=False)."""
+        return self._dropped
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+class _NpzWriter:
+    """Writes every frame as its own compressed .npy member of a zip file, the layout numpy.load reads as .npz."""
+
+    def __init__(self, path) -> None:
+        # The fastest deflate level: maze frames are large areas of a few colors and compress well anyway
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+        self._count = 0
+
+    def write(self, image) -> None:
+        with self._zip.open("frame_{:06d}.npy".format(self._count), "w") as member:
+            numpy.lib.format.write_array(member, image, allow_pickle=False)
+        self._count += 1
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class _GifWriter:
+    """Writes the animated GIF frame by frame as the frames arrive, so neither memory nor close() grows
+    with the length of the recording. Only the rectangle that changed since the previous frame is
+    quantized and written, with its own palette; the maze only has a few colors, which fit the 256
+    of a palette."""
+
+    def __init__(self, path, frame_duration) -> None:
+        self._path = path
+        self._file = open(path, "wb")
+        self._frame_duration = frame_duration
+        self._previous = None
+
+    def _quantize(self, image):
+        return Image.fromarray(image).quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+
+    def write(self, image) -> None:
+        if self._previous is None:
+            # The first frame is the whole canvas, its palette is the global one
+            frame = self._quantize(image)
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": 0, "duration": self._frame_duration})
+            self._file.write(b"".join(header))
+            data = GifImagePlugin.getdata(frame, duration=self._frame_duration)
+        else:
+            # Changed rows, then changed columns within them; any() over a trailing axis of 3 is much slower
+            changed = (image != self._previous).reshape(image.shape[0], -1)
+            rows = numpy.flatnonzero(changed.any(axis=1))
+            if len(rows):
+                channels = numpy.flatnonzero(changed[rows[0]:rows[-1] + 1].any(axis=0))
+                top, bottom, left, right = rows[0], rows[-1] + 1, channels[0] // 3, channels[-1] // 3 + 1
+            else:
+                top, bottom, left, right = 0, 1, 0, 1  # Unchanged: one pixel keeps the frame and its duration
+            frame = self._quantize(numpy.ascontiguousarray(image[top:bottom, left:right]))
+            data = GifImagePlugin.getdata(frame, offset=(int(left), int(top)), duration=self._frame_duration,
+                                          include_color_table=True)
+        self._file.write(b"".join(data))
+        self._previous = image
+
+    def close(self) -> None:
+        if self._previous is None:
+            self._file.close()
+            os.remove(self._path)  # A GIF needs at least one frame, write nothing
+            return
+        self._file.write(b";")  # GIF trailer
+        self._file.close()
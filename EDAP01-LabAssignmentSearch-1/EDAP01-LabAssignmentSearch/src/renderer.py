@@ -0,0 +1,94 @@
+import numpy
+
+from searchalgorithms.graph import TERRAIN
+
+# Overlay codes, a higher code wins when a cell is in several sets
+FRONTIER = 4
+EXPLORED = 5
+PATH = 6
+
+
+class RasterRenderer:
+    """Builds the picture of the maze as one RGB array instead of drawing every cell.
+
+    The grid colors are looked up once through a palette. Explored and path cells
+    are painted incrementally into an overlay (both only ever grow), the frontier
+    is painted on top for the current frame only. The cell image is then expanded
+    to pixels, margins included, with a single reshaped assignment.
+    With view_stride > 1 one pixel block shows a view_stride x view_stride block
+    of cells: its grid color comes from the top-left cell and it shows an overlay
+    if any cell of the block has one.
+    """
+
+    def __init__(self, grid, colors, cell_properties, view_stride=1) -> None:
+        self._colors = colors
+        self._stride = view_stride
+        self._cell = cell_properties["width"]
+        self._margin = cell_properties["margin"]
+        sampled = numpy.asarray(grid[::view_stride, ::view_stride]).astype(numpy.int64)
+        self._view_shape = sampled.shape
+
+        # Palette indexed by grid value, unknown values are drawn as empty cells
+        top = max(int(sampled.max()) + 1, TERRAIN)
+        palette = numpy.tile(numpy.array(colors[0], dtype=numpy.uint8), (top, 1))
+        for value, color in colors.items():
+            if 0 <= value < TERRAIN:
+                palette[value] = color
+        if top > TERRAIN and -2 in colors:
+            # Terrain cells shade from the empty color towards the terrain color, the most costly one darkest
+            weight = numpy.linspace(0.25, 1.0, top - TERRAIN)[:, None]
+            palette[TERRAIN:] = numpy.round((1 - weight) * numpy.array(colors[0]) + weight * numpy.array(colors[-2]))
+        self._base = palette[sampled]
+
+        self._overlay_palette = numpy.zeros((PATH + 1, 3), dtype=numpy.uint8)
+        for code in (FRONTIER, EXPLORED, PATH):
+            self._overlay_palette[code] = colors[code]
+
+        pitch = self._cell + self._margin
+        rows, columns = self._view_shape
+        self.image_shape = (rows * pitch + self._margin, columns * pitch + self._margin, 3)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets the explored cells and the path, e.g. before a new search."""
+        self._overlay = numpy.zeros(self._view_shape, dtype=numpy.uint8)
+        self._explored_seen = 0
+        self._path_seen = 0
+
+    def _view_index(self, nodes):
+        cells = numpy.asarray(nodes, dtype=numpy.int64).reshape(-1, 2) // self._stride
+        return cells[:, 0], cells[:, 1]
+
+    def _paint(self, nodes, code) -> None:
+        if len(nodes):
+            rows, columns = self._view_index(nodes)
+            self._overlay[rows, columns] = numpy.maximum(self._overlay[rows, columns], code)
+
+    def render(self, explored=(), frontier=(), path=()):
+        """Returns the RGB image (height, width, 3) of the current state.
+        explored and path must be append-only sequences of (row, column) cells,
+        frontier an iterable of frontier tuples (node, heuristic_h, cost_g, parent)."""
+        if len(explored) < self._explored_seen or len(path) < self._path_seen:
+            self.reset()
+        self._paint(explored[self._explored_seen:], EXPLORED)
+        self._explored_seen = len(explored)
+        self._paint(path[self._path_seen:], PATH)
+        self._path_seen = len(path)
+
+        overlay = self._overlay
+        frontier_nodes = [entry[0] for entry in frontier]
+        if frontier_nodes:
+            overlay = overlay.copy()
+            rows, columns = self._view_index(frontier_nodes)
+            overlay[rows, columns] = numpy.maximum(overlay[rows, columns], FRONTIER)
+
+        cells = numpy.where(overlay[..., None] > 0, self._overlay_palette[overlay], self._base)
+
+        # Expand cells to pixels: every cell is a (cell x cell) square followed by the margin
+        image = numpy.empty(self.image_shape, dtype=numpy.uint8)
+        image[...] = self._colors[-1]
+        rows, columns = self._view_shape
+        pitch, cell, margin = self._cell + self._margin, self._cell, self._margin
+        blocks = image[margin:margin + rows * pitch, margin:margin + columns * pitch].reshape(rows, pitch, columns, pitch, 3)
+        blocks[:, :cell, :, :cell] = cells[:, None, :, None]
+        return image
@@ -0,0 +1,107 @@
+import pygame
+import time
+from src.renderer import RasterRenderer
+
+colors = {
+    -2: (150, 120, 80), #costliest terrain (grid values 4 and up), cheaper terrain is lighter
+    -1: (206, 171, 147), #grid
+    0: (255, 251, 233), #empty
+    1: (227, 202, 165), #occupied
+    2: (79, 189, 186), #start
+    3: (246, 137, 137), #end
+    4: (255, 0, 0), #frontier, red
+    5: (0, 0, 255), #explored, blue
+    6: (0, 255, 0), #path, green
+}
+
+
+class MazeView:
+    """The pygame window of a maze. Only this module imports pygame, and src.maze only imports it
+    when a window is opened."""
+    max_window_size = (1200, 900) # (width, height) the window is allowed to grow to
+    window_size = (728, 728) # computed from the grid size in setupView; 33x33 cells of 20+2 px need 728, the old fixed 706 cut off the last row and column
+    cell_properties = {"height":20,"width":20,"margin":2} # largest cells, shrunk in setupView for bigger mazes
+    view_stride = 1 # draw every view_stride-th row and column when the maze has more cells than the window has pixels
+
+    def __init__(self, grid, maze_id=1, render_every=1, target_fps=None, max_window_size=None) -> None:
+        self.render_every = max(1, render_every) # draw only every render_every-th search step
+        self.target_fps = target_fps # if set, draw at most target_fps frames per second instead of pacing the search at 60 steps per second
+        self._last_frame_time = None
+        if max_window_size is not None:
+            self.max_window_size = max_window_size
+        # The window size depends on the maze size
+        self.setupView(grid.shape)
+        pygame.init()
+        pygame.display.set_caption("LUND - LTH - MAZE {}".format(maze_id))
+        self.screen = pygame.display.set_mode(self.window_size)
+        self.clock = pygame.time.Clock()
+        self.renderer = RasterRenderer(grid, colors, self.cell_properties, self.view_stride)
+
+    def setupView(self, sizes) -> None:
+        """Scales the cells so that the whole maze fits in max_window_size.
+        Cells shrink down to one pixel; beyond that only every view_stride-th row and column is drawn. """
+        rows, columns = sizes
+        max_width, max_height = self.max_window_size
+        self.view_stride = max(1, -(-rows // max_height), -(-columns // max_width)) # ceil division
+        view_rows = -(-rows // self.view_stride)
+        view_columns = -(-columns // self.view_stride)
+        # Largest cell (including its margin) that fits, capped at the default 20+2 pixels
+        pitch = min(MazeView.cell_properties["width"] + MazeView.cell_properties["margin"],
+                    max_width // view_columns, max_height // view_rows)
+        margin = 2 if pitch >= 8 else (1 if pitch >= 3 else 0)
+        self.cell_properties = {"height": pitch - margin, "width": pitch - margin, "margin": margin}
+        self.window_size = (view_columns * pitch + margin, view_rows * pitch + margin)
+
+    def setCaption(self, caption) -> None:
+        pygame.display.set_caption(caption)
+
+    def reset(self) -> None:
+        """Clears the drawn search, for the next run."""
+        self.renderer.reset()
+
+    def draw(self, algorithm, path):
+        """Draws the current state of the search and returns the RGB image of the frame."""
+        f = []
+        e = []
+        if algorithm:
+            f = algorithm.getFrontier()
+            e = algorithm.getExplored()
+
+        image = self.renderer.render(e, f, path)
+        pygame.surfarray.blit_array(self.screen, image.transpose(1, 0, 2)) # surfarray is indexed (x, y)
+        pygame.display.flip()
+        if self.target_fps is None:
+            self.clock.tick(60)
+        return image
+
+    def frameDue(self, count) -> bool:
+        """Returns True if step number count should be drawn, according to render_every and target_fps."""
+        if count % self.render_every != 0:
+            return False
+        if self.target_fps is None:
+            return True
+        now = time.perf_counter()
+        if self._last_frame_time is not None and now - self._last_frame_time < 1.0 / self.target_fps:
+            return False
+        self._last_frame_time = now
+        return True
+
+    def pumpEvents(self) -> None:
+        """Handles the window events so that the window does not freeze during a search."""
+        pygame.event.get()
+
+    def exitRequested(self) -> bool:
+        """Handles the window events and returns True if the window was closed or Escape was pressed."""
+        if self.target_fps is not None:
+            self.clock.tick(self.target_fps) # draw does not pace the loop in this mode
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return True
+        return False
+
+    def save(self, path) -> None:
+        """Saves the window content as an image file."""
+        pygame.image.save(self.screen, path)
+
+    def close(self) -> None:
+        pygame.quit()
@@ -0,0 +1,7 @@
+import sys
+from os.path import abspath, dirname
+
+# The tests import the project packages like main.py does, from the project directory
+project_dir = dirname(dirname(abspath(__file__)))
+if project_dir not in sys.path:
+    sys.path.insert(0, project_dir)
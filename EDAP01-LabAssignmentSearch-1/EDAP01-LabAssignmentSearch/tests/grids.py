@@ -0,0 +1,88 @@
+"""Random grids and a reference Dijkstra search shared by the tests."""
+import heapq
+import importlib
+
+import numpy
+
+from searchalgorithms.graph import TERRAIN
+
+SEEDS = range(8)
+
+
+def random_grid(seed, rows=12, columns=12):
+    """Returns (grid, start, goal) with about a quarter of the cells occupied. Start and goal are the first
+    and the last free cell, the goal may be walled off."""
+    rng = numpy.random.default_rng(seed)
+    grid = numpy.where(rng.random((rows, columns)) < 0.25, 1, 0)
+    free = numpy.argwhere(grid != 1)
+    start, goal = tuple(int(x) for x in free[0]), tuple(int(x) for x in free[-1])
+    return grid.astype(float), start, goal
+
+
+def weighted_grid(seed, rows=12, columns=12):
+    """Like random_grid, with about half of the free cells turned into terrain of cost 2 to 5."""
+    grid, start, goal = random_grid(seed, rows, columns)
+    rng = numpy.random.default_rng(seed + 1000)
+    terrain = (grid != 1) & (rng.random(grid.shape) < 0.5)
+    grid[terrain] = rng.integers(TERRAIN, TERRAIN + 4, grid.shape)[terrain]
+    return grid, start, goal
+
+
+def move_cost(grid, cell):
+    """Returns the cost of moving into cell, see searchalgorithms.graph.TERRAIN."""
+    return int(grid[cell]) - 2 if grid[cell] >= TERRAIN else 1
+
+
+def dijkstra(grid, start, goal):
+    """Returns the cost of the cheapest path from start to goal, or None if the goal cannot be reached."""
+    rows, columns = grid.shape
+    best = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        g, (r, c) = heapq.heappop(heap)
+        if (r, c) == goal:
+            return g
+        if g > best[(r, c)]:
+            continue
+        for neighbor in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < columns and grid[neighbor] != 1:
+                g_neighbor = g + move_cost(grid, neighbor)
+                if g_neighbor < best.get(neighbor, g_neighbor + 1):
+                    best[neighbor] = g_neighbor
+                    heapq.heappush(heap, (g_neighbor, neighbor))
+    return None
+
+
+def new_search(name, grid, start, goal, **attributes):
+    """Returns the algorithm of searchalgorithms/<name>.py reset for the query, with attributes set first."""
+    algorithm = getattr(importlib.import_module("searchalgorithms." + name), name)()
+    for attribute, value in attributes.items():
+        setattr(algorithm, attribute, value)
+    algorithm.reset(grid, start, goal)
+    return algorithm
+
+
+def run(algorithm, max_steps=1_000_000):
+    """Calls step() until the search is done, like the visualizer."""
+    for _ in range(max_steps):
+        if algorithm.isDone():
+            break
+        algorithm.step()
+    return algorithm
+
+
+def assert_solution(algorithm, grid, start, goal, optimal=True):
+    """Checks that the algorithm found a path, of the cost it reports, exactly when the goal can be reached:
+    a chain of free neighbors from start to goal, the cheapest one if optimal."""
+    expected = dijkstra(grid, start, goal)
+    path = algorithm.getPath()
+    assert algorithm.isDone()
+    if expected is None:
+        assert path == []
+        return
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and grid[b] != 1
+    assert algorithm.getCost() == sum(move_cost(grid, cell) for cell in path[1:])
+    if optimal:
+        assert algorithm.getCost() == expected
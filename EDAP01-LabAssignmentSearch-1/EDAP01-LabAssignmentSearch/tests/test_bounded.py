@@ -0,0 +1,59 @@
+"""Tests of the memory-bounded searches IDA* and SMA*: optimal paths, also with tight memory budgets."""
+import pytest
+
+from grids import SEEDS, assert_solution, dijkstra, new_search, random_grid, run
+
+BOUNDED = ["idastar", "smastar"]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("name", BOUNDED)
+def test_path_matches_dijkstra(name, seed):
+    grid, start, goal = random_grid(seed)
+    algorithm = run(new_search(name, grid, start, goal))
+    assert_solution(algorithm, grid, start, goal)
+
+
+@pytest.mark.parametrize("name", BOUNDED)
+def test_unreachable_goal(name):
+    grid, start, goal = random_grid(0)
+    r, c = goal
+    grid[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2] = 1
+    grid[goal] = 0
+    algorithm = run(new_search(name, grid, start, goal))
+    assert_solution(algorithm, grid, start, goal)
+
+
+@pytest.mark.parametrize("name", BOUNDED)
+def test_start_is_goal(name):
+    grid, start, _ = random_grid(1)
+    algorithm = run(new_search(name, grid, start, start))
+    assert algorithm.getPath() == [start]
+    assert algorithm.getCost() == 0
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_idastar_with_a_small_table(seed):
+    grid, start, goal = random_grid(seed)
+    algorithm = run(new_search("idastar", grid, start, goal, table_budget=5))
+    assert_solution(algorithm, grid, start, goal)
+
+
+@pytest.mark.parametrize("spare", [2, 5])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_smastar_within_a_small_budget(seed, spare):
+    # A budget just above the depth of the solution: nodes are dropped and regenerated, the path stays optimal
+    grid, start, goal = random_grid(seed)
+    cost = dijkstra(grid, start, goal)
+    budget = cost + spare
+    algorithm = run(new_search("smastar", grid, start, goal, memory_budget=budget))
+    assert_solution(algorithm, grid, start, goal)
+    assert algorithm.getMaxMemoryUsage() <= budget
+
+
+def test_smastar_budget_below_the_solution_depth():
+    grid, start, goal = random_grid(2)
+    cost = dijkstra(grid, start, goal)
+    algorithm = run(new_search("smastar", grid, start, goal, memory_budget=cost - 1))
+    assert algorithm.isDone() and algorithm.getPath() == []
+    assert algorithm.getMaxMemoryUsage() <= cost - 1
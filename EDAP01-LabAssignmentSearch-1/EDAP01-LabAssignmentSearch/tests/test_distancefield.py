@@ -0,0 +1,76 @@
+"""Tests of the goal-rooted distance fields and of their cache."""
+import numpy
+import pytest
+
+from grids import SEEDS, assert_solution, new_search, random_grid, run
+from searchalgorithms.distancefield import DistanceField, DistanceFieldCache
+from searchalgorithms.graph import GridGraph
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_paths_match_dijkstra(seed):
+    grid, start, goal = random_grid(seed)
+    algorithm = run(new_search("distancefield", grid, start, goal, cache=DistanceFieldCache()))
+    assert_solution(algorithm, grid, start, goal)
+
+
+def test_same_maze_and_goal_is_a_hit():
+    cache = DistanceFieldCache()
+    grid, start, goal = random_grid(0)
+    first = run(new_search("distancefield", grid, start, goal, cache=cache))
+    # Another start, and a copy of the grid with another dtype: the same moves, the same digest
+    other_start = tuple(int(x) for x in numpy.argwhere(grid != 1)[3])
+    second = run(new_search("distancefield", grid.astype(numpy.uint8), other_start, goal, cache=cache))
+    assert not first.isCacheHit() and second.isCacheHit()
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second.getNumberOfExpanded() == len(second.getPath())
+    assert_solution(second, grid, other_start, goal)
+
+
+def test_changed_maze_is_a_miss():
+    cache = DistanceFieldCache()
+    grid, start, goal = random_grid(2)
+    changed = grid.copy()
+    path = run(new_search("distancefield", grid, start, goal, cache=cache)).getPath()
+    changed[path[len(path) // 2]] = 1  # Block the path that is cached for the old maze
+    assert GridGraph(changed).digest != GridGraph(grid).digest
+    algorithm = run(new_search("distancefield", changed, start, goal, cache=cache))
+    assert not algorithm.isCacheHit()
+    assert_solution(algorithm, changed, start, goal)
+
+
+def test_start_and_goal_marks_do_not_change_the_digest():
+    grid, start, goal = random_grid(3)
+    marked = grid.copy()
+    marked[start], marked[goal] = 2, 3
+    assert GridGraph(marked).digest == GridGraph(grid).digest
+
+
+def test_terrain_costs_change_the_digest():
+    grid, start, goal = random_grid(3)
+    weighted = grid.copy()
+    weighted[goal] = 5
+    assert GridGraph(weighted).digest != GridGraph(grid).digest
+
+
+def test_least_recently_used_fields_are_evicted():
+    grid, _, _ = random_grid(4)
+    graph = GridGraph(grid)
+    goals = [tuple(int(x) for x in cell) for cell in numpy.argwhere(grid != 1)[:3]]
+    field_bytes = DistanceField.build(graph, goals[0]).nbytes
+    cache = DistanceFieldCache(max_bytes=2 * field_bytes)
+    for goal in goals:
+        cache.get(graph, goal)
+    assert cache.get(graph, goals[0])[1]  # Evicted, built again
+    assert not cache.get(graph, goals[2])[1]
+
+
+def test_fields_are_loaded_back_from_the_directory(tmp_path):
+    grid, start, goal = random_grid(5)
+    graph = GridGraph(grid)
+    field, built = DistanceFieldCache(directory=str(tmp_path)).get(graph, goal)
+    assert built
+    loaded, built = DistanceFieldCache(directory=str(tmp_path)).get(graph, goal)
+    assert not built
+    numpy.testing.assert_array_equal(loaded.distance, field.distance)
+    assert loaded.pathFrom(start) == field.pathFrom(start)
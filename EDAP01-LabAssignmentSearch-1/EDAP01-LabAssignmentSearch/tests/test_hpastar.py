@@ -0,0 +1,128 @@
+"""Tests of hierarchical pathfinding (HPA*): valid paths, the cached abstraction and its local repair."""
+from collections import OrderedDict
+
+import numpy
+import pytest
+
+from grids import SEEDS, assert_solution, dijkstra, new_search, random_grid, run, weighted_grid
+from searchalgorithms import base, hpastar
+from searchalgorithms.graph import GridGraph, graph_for
+from searchalgorithms.instrumentation import MetricsCollector
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    # Abstractions are cached per process, every test starts without any
+    monkeypatch.setattr(hpastar, "_cache", OrderedDict())
+
+
+def abstraction_of(abstraction):
+    """Returns what a search sees of an abstraction: its nodes per cluster and its edges, in a fixed order."""
+    return abstraction.nodes, {node: sorted(edges) for node, edges in abstraction.edges.items()}
+
+
+@pytest.mark.parametrize("cluster_size", [3, 5])
+@pytest.mark.parametrize("make_grid", [random_grid, weighted_grid])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_path_is_valid(seed, make_grid, cluster_size):
+    grid, start, goal = make_grid(seed, 20, 20)
+    algorithm = run(new_search("hpastar", grid, start, goal, cluster_size=cluster_size))
+    # Near-optimal: a valid path of the cost it reports, found whenever the goal can be reached
+    assert_solution(algorithm, grid, start, goal, optimal=False)
+    if algorithm.getPath():
+        assert algorithm.getCost() >= dijkstra(grid, start, goal)
+    assert algorithm.getNumberOfExpanded() == algorithm.getAbstractExpanded() + algorithm.getConcreteExpanded()
+
+
+def test_unreachable_goal_and_start_is_goal():
+    grid, start, goal = random_grid(0, 20, 20)
+    r, c = goal
+    grid[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2] = 1
+    grid[goal] = 0
+    assert run(new_search("hpastar", grid, start, goal, cluster_size=4)).getPath() == []
+    algorithm = run(new_search("hpastar", grid, start, start, cluster_size=4))
+    assert algorithm.getPath() == [start] and algorithm.getCost() == 0
+
+
+def test_abstraction_is_cached_per_maze():
+    grid, start, goal = weighted_grid(1, 20, 20)
+    first = run(new_search("hpastar", grid, start, goal, cluster_size=5))
+    second = run(new_search("hpastar", grid.copy(), goal, start, cluster_size=5))
+    assert not first.isCacheHit() and second.isCacheHit()
+    assert second.getAbstraction() is first.getAbstraction()
+    other = run(new_search("hpastar", grid, start, goal, cluster_size=4))
+    assert not other.isCacheHit()
+
+
+def test_abstraction_is_built_a_cluster_per_step():
+    grid, start, goal = random_grid(2, 30, 30)
+    algorithm = new_search("hpastar", grid, start, goal, cluster_size=5)
+    algorithm.solve(max_expansions=10)
+    assert algorithm.getAbstraction() is None and not algorithm.isDone()
+    algorithm.solve()
+    assert_solution(algorithm, grid, start, goal, optimal=False)
+    built = hpastar.Abstraction.build(GridGraph(grid), 5)
+    assert abstraction_of(algorithm.getAbstraction()) == abstraction_of(built)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_repaired_abstraction_matches_a_fresh_build(seed):
+    grid, start, goal = weighted_grid(seed, 25, 25)
+    algorithm = run(new_search("hpastar", grid, start, goal, cluster_size=5))
+    changed = grid.copy()
+    rng = numpy.random.default_rng(seed + 3000)
+    for _ in range(3):
+        changes = {}
+        for _ in range(8):
+            cell = tuple(int(x) for x in rng.integers(0, grid.shape))
+            if cell not in (start, goal):
+                changes[cell] = int(rng.choice([0, 1, 4, 7]))
+        for cell, value in changes.items():
+            changed[cell] = value
+        algorithm.updateCells(changes)
+        run(algorithm)
+        assert algorithm.isCacheHit()  # The repaired abstraction, cached under the changed maze
+        assert_solution(algorithm, changed, start, goal, optimal=False)
+        fresh = hpastar.Abstraction.build(GridGraph(changed), 5)
+        assert abstraction_of(algorithm.getAbstraction()) == abstraction_of(fresh)
+        assert algorithm.getAbstraction().digest == fresh.digest
+    assert algorithm.getNumberOfUpdates() == 3
+
+
+def test_update_before_the_abstraction_is_built():
+    grid, start, goal = random_grid(3, 20, 20)
+    algorithm = new_search("hpastar", grid, start, goal, cluster_size=5)
+    algorithm.solve(max_expansions=3)
+    algorithm.updateCells({(10, 10): 1, (10, 11): 1})
+    algorithm.solve()
+    changed = grid.copy()
+    changed[10, 10:12] = 1
+    assert_solution(algorithm, changed, start, goal, optimal=False)
+    assert abstraction_of(algorithm.getAbstraction()) == abstraction_of(hpastar.Abstraction.build(GridGraph(changed), 5))
+
+
+def test_updates_reuse_their_graph_and_leave_the_shared_one(monkeypatch):
+    grid, start, goal = random_grid(4, 20, 20)
+    original = grid.copy()
+    shared = graph_for(grid)
+    digest = shared.digest
+    metrics = MetricsCollector()
+    algorithm = new_search("hpastar", grid, start, goal, cluster_size=5)
+    algorithm.instrument(metrics)
+    algorithm.reset(grid, start, goal)
+    algorithm.solve()
+
+    def no_compile(grid):
+        raise AssertionError("updateCells() compiled the changed grid again")
+
+    monkeypatch.setattr(base, "graph_for", no_compile)
+    algorithm.updateCells({(0, 19): 1})
+    changed = grid.copy()
+    changed[0, 19] = 1
+    assert algorithm._graph.digest == GridGraph(changed).digest
+    generated = metrics.generated
+    algorithm.solve()
+    assert metrics.generated > generated  # Still instrumented after the reset of the update
+    assert shared.digest == digest
+    numpy.testing.assert_array_equal(grid, original)
+    assert {"graph", "grid"} <= set(algorithm.getMemoryBreakdown())
@@ -0,0 +1,146 @@
+"""Tests of the opt-in instrumentation of searchalgorithms.instrumentation: metrics, Chrome traces, no side effects."""
+import json
+
+import pytest
+
+from grids import SEEDS, assert_solution, new_search, random_grid, run, weighted_grid
+from searchalgorithms.instrumentation import Collector, MetricsCollector, TraceCollector
+
+NAMES = ["bfs", "dfs", "gbfs", "ucs", "astar", "bidirectional", "jps", "idastar", "smastar", "wavefront", "lpastar",
+         "hpastar"]
+
+
+class Recorder(Collector):
+    """Records the name of every hook called."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def onReset(self, algorithm) -> None:
+        self.calls.append("reset")
+
+    def onStep(self, index, seconds, expanded, frontier) -> None:
+        self.calls.append("step")
+
+    def onDone(self, algorithm) -> None:
+        self.calls.append("done")
+
+
+def instrumented(name, grid, start, goal, *collectors):
+    algorithm = new_search(name, grid, start, goal)
+    algorithm.instrument(*collectors)
+    algorithm.reset(grid, start, goal)
+    return algorithm
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_instrumented_search_finds_the_same_path(name):
+    grid, start, goal = weighted_grid(3)
+    plain = new_search(name, grid, start, goal)
+    plain.solve()
+    metrics = MetricsCollector()
+    algorithm = instrumented(name, grid, start, goal, metrics)
+    algorithm.solve()
+    assert algorithm.getPath() == plain.getPath() and algorithm.getCost() == plain.getCost()
+    summary = metrics.summary()
+    assert summary["algorithm"] == name
+    assert summary["expansions"] == algorithm.getNumberOfExpanded() == plain.getNumberOfExpanded()
+    assert summary["steps"] == len(metrics.frontier_sizes) == len(metrics.step_seconds)
+    assert summary["max_frontier"] <= algorithm.getMaxFrontierSize()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bfs_counts(seed):
+    grid, start, goal = random_grid(seed)
+    metrics = MetricsCollector()
+    algorithm = instrumented("bfs", grid, start, goal, metrics)
+    algorithm.solve()
+    assert_solution(algorithm, grid, start, goal)
+    # Every step pops one node, every looked up neighbor is pushed or rejected. The start is pushed by reset(),
+    # before the frontier is wrapped
+    assert metrics.pops == metrics.summary()["steps"] == algorithm.getNumberOfExpanded()
+    assert metrics.pushes == metrics.generated - metrics.rejected
+    assert metrics.heuristic_evaluations == 0
+
+
+def test_heuristic_evaluations_are_not_counted_when_drawing():
+    grid, start, goal = random_grid(5)
+    counts = []
+    for draw in (False, True):
+        metrics = MetricsCollector()
+        algorithm = instrumented("astar", grid, start, goal, metrics)
+        while not algorithm.isDone():
+            algorithm.step()
+            if draw:
+                algorithm.getFrontier()
+        counts.append(metrics.heuristic_evaluations)
+    assert counts[0] == counts[1] > 0
+
+
+def test_only_the_instrumented_object_is_changed():
+    grid, start, goal = random_grid(1)
+    algorithm = instrumented("astar", grid, start, goal, MetricsCollector())
+    other = new_search("astar", grid, start, goal)
+    assert type(other).expansion_loop == other.expansion_loop == "cheapest"
+    assert algorithm.expansion_loop is None
+    assert type(other._frontier).__name__ != "InstrumentedFrontier"
+
+
+def test_hooks_follow_every_reset():
+    grid, start, goal = random_grid(2)
+    recorder = Recorder()
+    algorithm = instrumented("ucs", grid, start, goal, recorder)
+    run(algorithm)
+    algorithm.step()  # A finished search does not step again
+    algorithm.reset(grid, start, goal)
+    run(algorithm)
+    first = recorder.calls[:recorder.calls.index("done") + 1]
+    assert first[0] == "reset" and first[-1] == "done" and set(first[1:-1]) == {"step"}
+    assert recorder.calls == first * 2
+
+
+def test_lpastar_repairs_stay_instrumented():
+    grid, start, goal = random_grid(4)
+    metrics = MetricsCollector()
+    algorithm = instrumented("lpastar", grid, start, goal, metrics)
+    algorithm.solve()
+    generated = metrics.generated
+    algorithm.updateCells({(r, c): 1 for r, c in algorithm.getPath()[2:4]})
+    algorithm.solve()
+    assert metrics.generated > generated
+    assert metrics.summary()["expansions"] == algorithm.getNumberOfExpanded()
+
+
+def test_metrics_json(tmp_path):
+    grid, start, goal = random_grid(6)
+    metrics = MetricsCollector()
+    instrumented("astar", grid, start, goal, metrics).solve()
+    path = tmp_path / "metrics.json"
+    metrics.save(str(path))
+    with open(path) as f:
+        saved = json.load(f)
+    assert saved["summary"] == metrics.summary()
+    assert saved["step_expanded"] == metrics.step_expanded.tolist()
+    assert len(saved["step_seconds"]) == len(saved["frontier_sizes"]) == saved["summary"]["steps"]
+
+
+def test_chrome_trace(tmp_path):
+    grid, start, goal = random_grid(6)
+    trace, metrics = TraceCollector(pid=3), MetricsCollector()
+    algorithm = instrumented("astar", grid, start, goal, trace, metrics)
+    algorithm.solve()
+    path = tmp_path / "trace.json"
+    trace.save(str(path))
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    assert events[0]["name"] == "reset" and events[-1]["name"] == "done"
+    assert events[-1]["args"] == {"cost": algorithm.getCost(), "found": True}
+    steps = [event for event in events if event["ph"] == "X"]
+    assert len(steps) == metrics.summary()["steps"]
+    assert [step["args"]["index"] for step in steps] == list(range(1, len(steps) + 1))
+    assert all(step["dur"] >= 0 and step["pid"] == 3 for step in steps)
+    assert [step["ts"] for step in steps] == sorted(step["ts"] for step in steps)
+    operations = [event["args"] for event in events if event["name"] == "operations"]
+    assert operations[-1]["pops"] == metrics.pops
+    frontier = [event["args"]["size"] for event in events if event["name"] == "frontier"]
+    assert frontier == metrics.frontier_sizes.tolist()
@@ -0,0 +1,72 @@
+"""Tests of the landmark (ALT) heuristic of searchalgorithms.landmarks: exact tables, admissible bounds."""
+import numpy
+import pytest
+
+from grids import SEEDS, assert_solution, dijkstra, move_cost, new_search, run, weighted_grid
+from searchalgorithms import landmarks
+from searchalgorithms.graph import GridGraph
+
+
+@pytest.fixture(autouse=True)
+def no_registered_tables(monkeypatch):
+    # Tables are registered per process, keep every test to its own
+    monkeypatch.setattr(landmarks, "_tables", {})
+
+
+def free_cells(grid):
+    return [tuple(int(x) for x in cell) for cell in numpy.argwhere(grid != 1)]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_distances_match_dijkstra(seed):
+    grid, start, _ = weighted_grid(seed)
+    graph = GridGraph(grid)
+    distance = landmarks.distances_from(graph, graph.cellId(start))
+    for cell in free_cells(grid):
+        expected = dijkstra(grid, start, cell)
+        assert distance[graph.cellId(cell)] == (expected if expected is not None else -1)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bound_is_admissible_and_consistent(seed):
+    grid, start, goal = weighted_grid(seed)
+    landmarks.register(landmarks.LandmarkTable.build(grid, count=4))
+    algorithm = new_search("astar", grid, start, goal)
+    assert algorithm._landmarks
+    rows, columns = grid.shape
+    for cell in free_cells(grid):
+        remaining = dijkstra(grid, cell, goal)
+        if remaining is None:
+            continue
+        h = algorithm.heuristic(cell)
+        assert h <= remaining
+        r, c = cell
+        for neighbor in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < columns and grid[neighbor] != 1:
+                assert h <= move_cost(grid, neighbor) + algorithm.heuristic(neighbor)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_astar_stays_optimal_and_expands_less(seed):
+    grid, start, goal = weighted_grid(seed, rows=20, columns=20)
+    manhattan = run(new_search("astar", grid, start, goal))
+    landmarks.register(landmarks.LandmarkTable.build(grid))
+    alt = run(new_search("astar", grid, start, goal))
+    assert_solution(alt, grid, start, goal)
+    assert alt.getNumberOfExpanded() <= manhattan.getNumberOfExpanded()
+    off = run(new_search("astar", grid, start, goal, use_landmarks=False))
+    assert off.getNumberOfExpanded() == manhattan.getNumberOfExpanded()
+
+
+def test_tables_are_loaded_only_for_their_maze(tmp_path):
+    grid, _, _ = weighted_grid(0)
+    maze_file = str(tmp_path / "maze.txt")
+    table = landmarks.LandmarkTable.build(grid, count=3)
+    table.save(landmarks.landmark_path(maze_file))
+    loaded = landmarks.load_for(maze_file, grid)
+    numpy.testing.assert_array_equal(loaded.distances, table.distances)
+    assert landmarks.table_for(GridGraph(grid)) is loaded
+    changed = grid.copy()
+    changed[changed == 1] = 0
+    assert landmarks.load_for(maze_file, changed) is None
+    assert landmarks.load_for(str(tmp_path / "other.txt"), grid) is None
@@ -0,0 +1,70 @@
+"""Tests of the incremental LPA* planner: the first search, and repairs after cells change."""
+import numpy
+import pytest
+
+from grids import SEEDS, assert_solution, new_search, random_grid, run, weighted_grid
+from searchalgorithms.graph import graph_for
+
+
+def changes_for(seed, grid, start, goal, count=6):
+    """Returns count random ((row, column), value) changes that leave start and goal free."""
+    rng = numpy.random.default_rng(seed + 2000)
+    changes = []
+    while len(changes) < count:
+        cell = tuple(int(x) for x in rng.integers(0, grid.shape))
+        if cell not in (start, goal):
+            changes.append((cell, int(rng.choice([0, 1, 4, 6]))))
+    return changes
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_first_search_matches_dijkstra(seed):
+    grid, start, goal = weighted_grid(seed)
+    algorithm = run(new_search("lpastar", grid, start, goal))
+    assert_solution(algorithm, grid, start, goal)
+    assert algorithm.getPlanExpanded() == algorithm.getNumberOfExpanded()
+
+
+@pytest.mark.parametrize("make_grid", [random_grid, weighted_grid])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_repair_matches_a_fresh_search(seed, make_grid):
+    grid, start, goal = make_grid(seed)
+    algorithm = run(new_search("lpastar", grid, start, goal))
+    changed = grid.copy()
+    for round_ in range(3):
+        changes = changes_for(seed * 3 + round_, grid, start, goal)
+        for cell, value in changes:
+            changed[cell] = value
+        algorithm.updateCells(changes)
+        assert not algorithm.isDone()
+        run(algorithm)
+        assert_solution(algorithm, changed, start, goal)
+        fresh = run(new_search("lpastar", changed, start, goal))
+        assert algorithm.getCost() == fresh.getCost()
+        assert algorithm.getFullReplanExpanded() == fresh.getNumberOfExpanded()
+    assert algorithm.getNumberOfUpdates() == 3
+
+
+def test_a_small_change_repairs_less_than_a_full_search():
+    grid = numpy.zeros((30, 30))
+    start, goal = (0, 0), (29, 29)
+    algorithm = run(new_search("lpastar", grid, start, goal))
+    algorithm.updateCells({(15, 15): 1, (15, 16): 1})
+    run(algorithm)
+    assert algorithm.getCost() == 58
+    assert algorithm.getPlanExpanded() < algorithm.getFullReplanExpanded()
+
+
+def test_updates_do_not_touch_the_shared_graph_or_the_grid():
+    grid, start, goal = random_grid(4)
+    original = grid.copy()
+    shared = graph_for(grid)
+    digest = shared.digest
+    algorithm = run(new_search("lpastar", grid, start, goal))
+    # Until the first update the search reads the shared graph
+    assert algorithm._graph is shared
+    algorithm.updateCells([((r, c), 1) for r, c in numpy.argwhere(grid != 1)[1:5]])
+    run(algorithm)
+    assert algorithm._graph is not shared
+    assert shared.digest == digest and graph_for(grid) is shared
+    numpy.testing.assert_array_equal(grid, original)
@@ -0,0 +1,87 @@
+"""Tests of the binary maze format (.mzb) of src.mazefile."""
+from os.path import abspath, dirname, join
+
+import numpy
+import pytest
+
+from src.mazefile import convert, find_start_goal, load_maze, save_maze
+
+project_dir = dirname(dirname(abspath(__file__)))
+
+
+def sample_grid(rows=7, columns=11, seed=0):
+    rng = numpy.random.default_rng(seed)
+    grid = rng.integers(0, 2, (rows, columns)).astype(numpy.uint8)
+    grid[1, 2] = 2
+    grid[rows - 1, columns - 3] = 3
+    return grid
+
+
+def test_unpacked_round_trip_is_memory_mapped(tmp_path):
+    grid = sample_grid()
+    path = str(tmp_path / "maze.mzb")
+    save_maze(path, grid)
+    loaded, start, goal = load_maze(path)
+    assert isinstance(loaded, numpy.memmap)
+    assert not loaded.flags.writeable
+    assert loaded.dtype == numpy.uint8 and loaded.shape == grid.shape
+    numpy.testing.assert_array_equal(loaded, grid)
+    assert (start, goal) == ((1, 2), (6, 8))
+
+
+def test_unpacked_without_mmap(tmp_path):
+    grid = sample_grid()
+    path = str(tmp_path / "maze.mzb")
+    save_maze(path, grid)
+    loaded, _, _ = load_maze(path, mmap=False)
+    assert not isinstance(loaded, numpy.memmap)
+    numpy.testing.assert_array_equal(loaded, grid)
+
+
+@pytest.mark.parametrize("shape", [(7, 11), (1, 1), (3, 4), (5, 5)])
+def test_packed_round_trip(tmp_path, shape):
+    # Cell counts that do and do not fill the last byte
+    grid = numpy.random.default_rng(1).integers(0, 4, shape).astype(numpy.uint8)
+    path = str(tmp_path / "maze.mzb")
+    save_maze(path, grid, packed=True)
+    loaded, start, goal = load_maze(path)
+    numpy.testing.assert_array_equal(loaded, grid)
+    assert (start, goal) == find_start_goal(grid)
+
+
+def test_packed_file_is_four_times_smaller(tmp_path):
+    grid = sample_grid(64, 64)
+    unpacked, packed = str(tmp_path / "unpacked.mzb"), str(tmp_path / "packed.mzb")
+    save_maze(unpacked, grid)
+    save_maze(packed, grid, packed=True)
+    header = 32
+    assert (tmp_path / "unpacked.mzb").stat().st_size == header + 64 * 64
+    assert (tmp_path / "packed.mzb").stat().st_size == header + 64 * 64 // 4
+
+
+def test_convert_text_maze(tmp_path):
+    text_path = join(project_dir, "mazes", "maze1.txt")
+    path = convert(text_path, str(tmp_path / "maze1.mzb"))
+    loaded, start, goal = load_maze(path)
+    text = numpy.loadtxt(text_path, ndmin=2)
+    numpy.testing.assert_array_equal(loaded, text)
+    assert (start, goal) == find_start_goal(text)
+
+
+def test_values_that_do_not_fit(tmp_path):
+    grid = sample_grid()
+    grid[0, 0] = 4
+    with pytest.raises(ValueError):
+        save_maze(str(tmp_path / "maze.mzb"), grid, packed=True)
+    with pytest.raises(ValueError):
+        save_maze(str(tmp_path / "maze.mzb"), numpy.zeros(5))
+
+
+def test_not_a_maze_file(tmp_path):
+    path = tmp_path / "maze.mzb"
+    path.write_bytes(b"NOPE" + bytes(40))
+    with pytest.raises(ValueError):
+        load_maze(str(path))
+    path.write_bytes(b"MAZB")
+    with pytest.raises(ValueError):
+        load_maze(str(path))
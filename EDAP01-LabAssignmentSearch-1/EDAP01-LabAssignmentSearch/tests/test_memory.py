@@ -0,0 +1,111 @@
+"""Tests of the memory accounting in bytes: searchalgorithms.memory and the memory getters of the algorithms."""
+import sys
+import tracemalloc
+from array import array
+
+import numpy
+import pytest
+
+from grids import new_search, random_grid
+from searchalgorithms import memory
+from searchalgorithms.instrumentation import MetricsCollector
+
+NAMES = ["bfs", "dfs", "gbfs", "ucs", "astar", "bidirectional", "jps", "idastar", "smastar", "wavefront", "lpastar",
+         "hpastar"]
+
+
+def test_sizeof_counts_shared_objects_once():
+    item = array("q", range(1000))
+    assert memory.sizeof(item) == sys.getsizeof(item)
+    assert memory.sizeof([item, item]) == sys.getsizeof([item, item]) + sys.getsizeof(item)
+    seen = set()
+    first = memory.sizeof({"a": item}, seen)
+    second = memory.sizeof((item,), seen)
+    assert first > sys.getsizeof(item) and second == sys.getsizeof((item,))
+
+
+def test_sizeof_follows_containers_but_not_small_ints():
+    assert memory.sizeof([1, 2, 3]) == sys.getsizeof([1, 2, 3])
+    large = [10 ** 6 + i for i in range(3)]
+    assert memory.sizeof(large) == sys.getsizeof(large) + sum(map(sys.getsizeof, large))
+    grid = numpy.zeros((100, 100))
+    assert memory.sizeof(grid) >= grid.nbytes
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_breakdown_adds_up(name):
+    grid, start, goal = random_grid(3)
+    algorithm = new_search(name, grid, start, goal)
+    algorithm.solve()
+    breakdown = algorithm.getMemoryBreakdown()
+    assert {"state", "frontier", "explored_list", "path"} <= set(breakdown)
+    assert all(size >= 0 for size in breakdown.values())
+    assert algorithm.getMemoryBytes() == sum(breakdown.values())
+    per_node = algorithm.getBytesPerNode()
+    assert per_node["total"] == pytest.approx(algorithm.getMemoryBytes() / max(1, algorithm.getMaxMemoryUsage()))
+
+
+def test_instrumentation_is_not_counted():
+    grid, start, goal = random_grid(4)
+    plain = new_search("astar", grid, start, goal)
+    plain.solve()
+    instrumented = new_search("astar", grid, start, goal)
+    instrumented.instrument(MetricsCollector())
+    instrumented.reset(grid, start, goal)
+    instrumented.solve()
+    assert instrumented.getMemoryBreakdown()["frontier"] == plain.getMemoryBreakdown()["frontier"]
+
+
+def test_bounded_searches_hold_less_on_a_large_grid():
+    grid = numpy.zeros((300, 300))
+    start, goal = (150, 150), (150, 160)
+    sizes = {}
+    for name in ("astar", "idastar"):
+        algorithm = new_search(name, grid, start, goal)
+        algorithm.solve()
+        sizes[name] = algorithm.getMemoryBytes()
+    # Preallocated arrays for every cell against the few nodes near the start
+    assert sizes["astar"] > grid.size
+    assert sizes["idastar"] < sizes["astar"] // 10
+
+
+def test_lpastar_counts_its_graph_once_it_is_private():
+    grid, start, goal = random_grid(5)
+    algorithm = new_search("lpastar", grid, start, goal)
+    algorithm.solve()
+    assert "graph" not in algorithm.getMemoryBreakdown()
+    algorithm.updateCells({algorithm.getPath()[1]: 1})
+    algorithm.solve()
+    breakdown = algorithm.getMemoryBreakdown()
+    assert breakdown["graph"] > grid.size and breakdown["grid"] >= grid.nbytes
+
+
+def test_measure_peak():
+    grid, start, goal = random_grid(6, 60, 60)
+    algorithm = new_search("astar", grid, start, goal)
+    assert algorithm.getPeakBytes() is None
+    path = algorithm.measurePeak(grid, start, goal)
+    assert path == algorithm.getPath() and algorithm.isDone()
+    assert algorithm.getPeakBytes() > 0
+    assert not tracemalloc.is_tracing()
+    algorithm.reset(grid, start, goal)
+    assert algorithm.getPeakBytes() is None
+
+
+def test_peak_tracker_leaves_running_traces_on():
+    tracemalloc.start()
+    try:
+        with memory.PeakTracker() as tracker:
+            block = bytearray(1 << 20)
+        del block
+        assert tracker.peak >= 1 << 20
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_peak_rss(monkeypatch):
+    if memory.resource is not None:
+        assert memory.peak_rss() > 1 << 20
+    monkeypatch.setattr(memory, "resource", None)
+    assert memory.peak_rss() is None
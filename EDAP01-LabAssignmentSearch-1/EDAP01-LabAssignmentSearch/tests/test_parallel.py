@@ -0,0 +1,96 @@
+"""Tests of the parallel query runner of src.parallel: results, errors, timeouts and killed workers."""
+import multiprocessing
+import time
+
+import numpy
+import pytest
+
+from grids import dijkstra, random_grid
+from searchalgorithms.bfs import bfs
+from searchalgorithms.dfs import dfs
+from src import parallel
+from src.mazefile import save_maze
+
+# The tests slow searches down by patching them in this process, which forked workers inherit
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="patched searches only reach forked workers")
+
+
+@pytest.fixture
+def maze_file(tmp_path):
+    """A maze file with start and goal marked, and its (grid, start, goal)."""
+    grid, start, goal = random_grid(2, 20, 20)
+    marked = grid.astype(numpy.uint8)
+    marked[start], marked[goal] = 2, 3
+    path = str(tmp_path / "maze.mzb")
+    save_maze(path, marked)
+    return path, (grid, start, goal)
+
+
+def test_results_match_dijkstra(maze_file):
+    path, (grid, start, goal) = maze_file
+    queries = [(path, None, None, "bfs"), (path, None, None, "astar"), (path, goal, start, "ucs")]
+    results = sorted(parallel.run_queries(queries, workers=2), key=lambda r: r["index"])
+    assert [r["status"] for r in results] == ["ok"] * 3
+    assert [r["start"] for r in results] == [start, start, goal]
+    assert [r["cost"] for r in results] == [dijkstra(grid, start, goal)] * 3
+
+
+def test_errors_do_not_stop_the_batch(maze_file, tmp_path):
+    path, _ = maze_file
+    queries = [(path, None, None, "nosuchsearch"), (str(tmp_path / "missing.mzb"), None, None, "bfs"),
+               (path, None, None, "bfs")]
+    results = {r["index"]: r for r in parallel.run_queries(queries, workers=2)}
+    assert results[0]["status"] == "error" and "nosuchsearch" in results[0]["error"]
+    assert results[1]["status"] == "error" and results[1]["error"].startswith("Could not load maze")
+    assert results[2]["status"] == "ok"
+
+
+@needs_fork
+def test_search_stops_at_its_deadline(maze_file, monkeypatch):
+    path, _ = maze_file
+    step = bfs.step
+
+    def slow_step(self):
+        time.sleep(0.001)
+        step(self)
+
+    # Run solve() over the slowed down step()
+    monkeypatch.setattr(bfs, "expansion_loop", None)
+    monkeypatch.setattr(bfs, "step", slow_step)
+    monkeypatch.setattr(parallel, "KILL_GRACE", 30.0)
+    results = list(parallel.run_queries([(path, None, None, "bfs")], workers=1, timeout=0.05))
+    assert results[0]["status"] == "timeout"
+    assert results[0]["error"] == "Query did not finish within 0.05 s"
+
+
+@needs_fork
+def test_overrunning_worker_is_killed(maze_file, monkeypatch):
+    path, (grid, start, goal) = maze_file
+    # One step that never checks the deadline
+    monkeypatch.setattr(dfs, "expansion_loop", None)
+    monkeypatch.setattr(dfs, "step", lambda self: time.sleep(60))
+    monkeypatch.setattr(parallel, "KILL_GRACE", 0.2)
+    queries = [(path, None, None, "dfs"), (path, None, None, "bfs"), (path, None, None, "bfs")]
+    start_time = time.perf_counter()
+    # A single worker: the queries behind the stuck one have not started when it is killed
+    results = {r["index"]: r for r in parallel.run_queries(queries, workers=1, timeout=0.1)}
+    assert time.perf_counter() - start_time < 30
+    assert results[0]["status"] == "timeout" and "killed" in results[0]["error"]
+    assert [results[i]["status"] for i in (1, 2)] == ["ok", "ok"]
+    assert results[1]["cost"] == dijkstra(grid, start, goal)
+
+
+@needs_fork
+def test_timeout_starts_after_reset(maze_file, monkeypatch):
+    path, _ = maze_file
+    reset = bfs.reset
+
+    def slow_reset(self, grid, start, goal):
+        time.sleep(0.5)
+        reset(self, grid, start, goal)
+
+    monkeypatch.setattr(bfs, "reset", slow_reset)
+    monkeypatch.setattr(parallel, "KILL_GRACE", 0.1)
+    results = list(parallel.run_queries([(path, None, None, "bfs")], workers=1, timeout=0.2))
+    assert results[0]["status"] == "ok"
@@ -0,0 +1,113 @@
+"""Tests of the background frame recorder of src.recorder: npz and GIF output, dropped frames, errors."""
+import threading
+
+import numpy
+import pytest
+
+from src import recorder
+from src.recorder import FrameRecorder
+
+needs_pillow = pytest.mark.skipif(recorder.Image is None, reason="recording a GIF needs Pillow")
+
+
+def frames(count, height=24, width=32):
+    """Returns count RGB frames of a few colors, each one with one more cell painted than the one before."""
+    rng = numpy.random.default_rng(0)
+    image = numpy.full((height, width, 3), 255, dtype=numpy.uint8)
+    colors = numpy.array([[0, 0, 0], [255, 0, 0], [0, 128, 255], [255, 255, 0]], dtype=numpy.uint8)
+    result = []
+    for i in range(count):
+        r, c = rng.integers(0, height // 4) * 4, rng.integers(0, width // 4) * 4
+        image[r:r + 4, c:c + 4] = colors[i % len(colors)]
+        result.append(image.copy())
+    return result
+
+
+def test_npz_holds_every_frame(tmp_path):
+    path = str(tmp_path / "run.npz")
+    images = frames(10)
+    with FrameRecorder(path) as recording:
+        for image in images:
+            recording.add(image)
+    assert recording.getWritten() == 10 and recording.getDropped() == 0
+    with numpy.load(path) as archive:
+        assert sorted(archive.files) == ["frame_{:06d}".format(i) for i in range(10)]
+        for i, image in enumerate(images):
+            numpy.testing.assert_array_equal(archive["frame_{:06d}".format(i)], image)
+
+
+def test_every_nth_frame(tmp_path):
+    path = str(tmp_path / "run.npz")
+    images = frames(10)
+    recording = FrameRecorder(path, every=3)
+    for image in images:
+        recording.add(image)
+    assert recording.close() == path
+    with numpy.load(path) as archive:
+        recorded = [archive["frame_{:06d}".format(i)] for i in range(len(archive.files))]
+    assert len(recorded) == 4
+    for image, expected in zip(recorded, images[::3]):
+        numpy.testing.assert_array_equal(image, expected)
+
+
+@needs_pillow
+def test_gif_frames_match(tmp_path):
+    from PIL import Image, ImageSequence
+    path = str(tmp_path / "run.gif")
+    images = frames(8)
+    images.insert(4, images[3])  # An unchanged frame is kept
+    with FrameRecorder(path, frame_duration=40) as recording:
+        for image in images:
+            recording.add(image)
+    with Image.open(path) as gif:
+        assert gif.n_frames == len(images)
+        assert gif.info["loop"] == 0
+        for image, frame in zip(images, ImageSequence.Iterator(gif)):
+            assert frame.info["duration"] == 40
+            numpy.testing.assert_array_equal(numpy.asarray(frame.convert("RGB")), image)
+
+
+@needs_pillow
+def test_gif_without_frames_is_not_written(tmp_path):
+    path = tmp_path / "empty.gif"
+    FrameRecorder(str(path)).close()
+    assert not path.exists()
+
+
+def test_frames_are_dropped_instead_of_waiting(tmp_path, monkeypatch):
+    release = threading.Event()
+    write = recorder._NpzWriter.write
+
+    def stalled_write(self, image):
+        release.wait(10)
+        write(self, image)
+
+    monkeypatch.setattr(recorder._NpzWriter, "write", stalled_write)
+    recording = FrameRecorder(str(tmp_path / "run.npz"), queue_size=2, block=False)
+    for image in frames(10):
+        recording.add(image)
+    release.set()
+    recording.close()
+    assert recording.getDropped() > 0
+    assert recording.getWritten() + recording.getDropped() == 10
+
+
+def test_unsupported_format(tmp_path, monkeypatch):
+    with pytest.raises(ValueError):
+        FrameRecorder(str(tmp_path / "run.mp4"))
+    monkeypatch.setattr(recorder, "Image", None)
+    assert recorder.default_extension() == ".npz"
+    with pytest.raises(ImportError):
+        FrameRecorder(str(tmp_path / "run.gif"))
+
+
+def test_writer_errors_reach_the_caller(tmp_path, monkeypatch):
+    def failing_write(self, image):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(recorder._NpzWriter, "write", failing_write)
+    recording = FrameRecorder(str(tmp_path / "run.npz"))
+    for image in frames(3):
+        recording.add(image)
+    with pytest.raises(OSError, match="disk full"):
+        recording.close()
@@ -0,0 +1,169 @@
+"""Tests of the algorithm registry of searchalgorithms.registry: lookups, capabilities and plugin folders."""
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from searchalgorithms import registry
+from searchalgorithms.astar import astar
+
+BUILTINS = ["astar", "bfs", "bidirectional", "dfs", "gbfs", "hpastar", "idastar", "jps", "lpastar", "smastar", "ucs",
+            "wavefront"]
+
+PLUGIN = '''
+"""A plugin with a docstring that looks like a class:
+class notaplugin(SearchAlgorithmBase):
+    capabilities = frozenset({{"optimal"}})
+"""
+from searchalgorithms.base import SearchAlgorithmBase
+
+
+class {name}(SearchAlgorithmBase):
+    capabilities = frozenset({{
+        "optimal",
+        "weighted",  # Spread over lines, with comments
+    }})
+
+    def step(self):
+        self._done = True
+'''
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    # Discovery runs once per process, every test starts from an empty registry
+    monkeypatch.setattr(registry, "_algorithms", {})
+    monkeypatch.setattr(registry, "_discovered", False)
+    monkeypatch.delenv(registry.PATH_VARIABLE, raising=False)
+
+
+def write(directory, name, source):
+    (directory / (name + ".py")).write_text(textwrap.dedent(source))
+
+
+def test_builtins_are_found():
+    assert set(BUILTINS) <= set(registry.names())
+    assert registry.get("astar") is astar
+    assert registry.get("astar") is registry.get("astar")
+    assert registry.info("astar").source == "builtin"
+
+
+def test_unknown_name():
+    with pytest.raises(registry.UnknownAlgorithmError, match="available: .*astar") as error:
+        registry.get("nosuchsearch")
+    assert isinstance(error.value, LookupError)
+
+
+def test_capabilities_are_read_without_importing():
+    code = ("import sys; from searchalgorithms import registry; "
+            "print(registry.find('incremental'), registry.info('ucs').capabilities == {'optimal', 'weighted'}, "
+            "'numpy' in sys.modules, 'searchalgorithms.ucs' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ["['lpastar']", "True", "False", "False"]
+
+
+@pytest.mark.parametrize("name", BUILTINS)
+def test_declared_capabilities_match_the_classes(name):
+    declared = registry.info(name).capabilities
+    assert declared == registry.get(name).capabilities
+
+
+def test_find():
+    assert registry.find() == registry.names()
+    assert registry.find("memory_bounded") == ["idastar", "smastar"]
+    assert set(registry.find("optimal", "weighted")) == {"astar", "lpastar", "ucs"}
+    with pytest.raises(registry.AlgorithmError):
+        registry.find("fast")
+
+
+def test_plugin_folder(tmp_path):
+    write(tmp_path, "myplugin", PLUGIN.format(name="myplugin"))
+    write(tmp_path, "helpers", "class other:\n    pass\n")  # No class named like the file
+    assert registry.add_directory(str(tmp_path)) == ["myplugin"]
+    info = registry.info("myplugin")
+    assert info.source == str(tmp_path / "myplugin.py")
+    # Read from the multi-line literal, before the class is imported
+    assert info._cls is None and info.capabilities == {"optimal", "weighted"}
+    assert "myplugin" in registry.find("weighted")
+    assert "notaplugin" not in registry.names()
+    assert registry.get("myplugin")().capabilities == {"optimal", "weighted"}
+
+
+def test_plugin_folders_from_the_environment(tmp_path, monkeypatch):
+    write(tmp_path, "envplugin", PLUGIN.format(name="envplugin"))
+    monkeypatch.setenv(registry.PATH_VARIABLE, str(tmp_path))
+    assert "envplugin" in registry.names()
+    assert registry.get("envplugin").__name__ == "envplugin"
+
+
+def test_capabilities_that_are_not_literals_are_imported(tmp_path):
+    write(tmp_path, "inherited", '''
+        from searchalgorithms.astar import astar
+
+        class inherited(astar):
+            pass
+    ''')
+    write(tmp_path, "computed", '''
+        from searchalgorithms.astar import astar
+        from searchalgorithms.base import SearchAlgorithmBase
+
+        class computed(SearchAlgorithmBase):
+            capabilities = astar.capabilities | {"incremental"}
+            step = astar.step
+    ''')
+    registry.add_directory(str(tmp_path))
+    assert registry.info("inherited")._declared is None
+    assert registry.info("inherited").capabilities == astar.capabilities
+    assert registry.info("computed")._declared is None
+    assert registry.info("computed").capabilities == {"optimal", "weighted", "incremental"}
+
+
+def test_broken_plugins(tmp_path):
+    write(tmp_path, "stub", '''
+        from searchalgorithms.base import SearchAlgorithmBase
+
+        class stub(SearchAlgorithmBase):
+            pass
+    ''')
+    write(tmp_path, "changed", '''
+        from searchalgorithms.base import SearchAlgorithmBase
+
+        class changed(SearchAlgorithmBase):
+            capabilities = frozenset({"optimal"})
+
+            def step(self):
+                self._done = True
+
+        changed.capabilities = frozenset()
+    ''')
+    write(tmp_path, "bogus", PLUGIN.format(name="bogus").replace('"weighted"', '"fast"'))
+    registry.add_directory(str(tmp_path))
+    # Stubs are found by capability, they only fail once loaded
+    assert "stub" in registry.find()
+    with pytest.raises(registry.AlgorithmNotImplementedError):
+        registry.get("stub")
+    # Files that do not parse are registered, so that loading them reports why
+    (tmp_path / "more").mkdir()
+    write(tmp_path / "more", "unparsable", "class unparsable(:\n")
+    assert registry.add_directory(str(tmp_path / "more")) == ["unparsable"]
+    with pytest.raises(registry.AlgorithmError, match="Could not load unparsable"):
+        registry.get("unparsable")
+    with pytest.raises(registry.AlgorithmError, match="declares the capabilities"):
+        registry.get("changed")
+    with pytest.raises(registry.AlgorithmError, match="unknown capabilities: fast"):
+        registry.get("bogus")
+
+
+def test_register():
+    class mysearch(astar):
+        pass
+
+    registry.register(mysearch)
+    assert registry.get("mysearch") is mysearch
+    with pytest.raises(registry.AlgorithmError, match="already registered"):
+        registry.register(mysearch, name="astar")
+    registry.register(mysearch, name="astar", replace=True)
+    assert registry.get("astar") is mysearch
+    with pytest.raises(registry.AlgorithmError, match="not a SearchAlgorithmBase subclass"):
+        registry.register(int)
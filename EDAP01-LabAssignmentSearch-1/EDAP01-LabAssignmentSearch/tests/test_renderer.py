@@ -0,0 +1,82 @@
+"""Tests of src.renderer.RasterRenderer against a cell-by-cell reference drawing."""
+import numpy
+import pytest
+
+from src.renderer import RasterRenderer
+
+colors = {
+    -1: (206, 171, 147),
+    0: (255, 251, 233),
+    1: (227, 202, 165),
+    2: (79, 189, 186),
+    3: (246, 137, 137),
+    4: (255, 0, 0),
+    5: (0, 0, 255),
+    6: (0, 255, 0),
+}
+
+
+def reference_image(grid, explored, frontier, path, cell, margin):
+    """Draws every cell as its own rectangle like the original maze.draw: path over explored over frontier
+    over the grid color, on a background of the grid line color."""
+    rows, columns = grid.shape
+    pitch = cell + margin
+    image = numpy.empty((rows * pitch + margin, columns * pitch + margin, 3), dtype=numpy.uint8)
+    image[...] = colors[-1]
+    frontier = [entry[0] for entry in frontier]
+    for row in range(rows):
+        for column in range(columns):
+            if (row, column) in path:
+                color = colors[6]
+            elif (row, column) in explored:
+                color = colors[5]
+            elif (row, column) in frontier:
+                color = colors[4]
+            else:
+                color = colors[int(grid[row, column])]
+            top, left = margin + pitch * row, margin + pitch * column
+            image[top:top + cell, left:left + cell] = color
+    return image
+
+
+def sample_grid(rows=9, columns=14, seed=0):
+    grid = numpy.where(numpy.random.default_rng(seed).random((rows, columns)) < 0.3, 1, 0)
+    grid[0, 0], grid[rows - 1, columns - 1] = 2, 3
+    return grid
+
+
+@pytest.mark.parametrize("cell, margin", [(20, 2), (5, 1), (1, 0)])
+def test_frames_match_the_reference(cell, margin):
+    grid = sample_grid()
+    renderer = RasterRenderer(grid, colors, {"height": cell, "width": cell, "margin": margin})
+    cells = [(int(r), int(c)) for r, c in numpy.argwhere(grid != 1)]
+    explored, path = [], []
+    # Explored and path only grow, the frontier changes from frame to frame
+    for frame in range(0, len(cells), 7):
+        explored.extend(cells[frame:frame + 5])
+        frontier = [(node, 0, 0, node) for node in cells[frame + 5:frame + 9]]
+        if frame > 40:
+            path.append(cells[frame])
+        image = renderer.render(explored, frontier, path)
+        assert image.shape == renderer.image_shape
+        numpy.testing.assert_array_equal(image, reference_image(grid, explored, frontier, path, cell, margin))
+
+
+def test_shorter_lists_start_over():
+    grid = sample_grid()
+    renderer = RasterRenderer(grid, colors, {"height": 4, "width": 4, "margin": 1})
+    renderer.render([(0, 1), (0, 2), (1, 1)], [], [])
+    # A new search: the explored list is shorter than the one drawn before
+    image = renderer.render([(2, 2)], [], [])
+    numpy.testing.assert_array_equal(image, reference_image(grid, [(2, 2)], [], [], 4, 1))
+
+
+def test_view_stride_shows_blocks_of_cells():
+    grid = sample_grid(9, 14)
+    renderer = RasterRenderer(grid, colors, {"height": 3, "width": 3, "margin": 1}, view_stride=2)
+    image = renderer.render([(3, 5)], [((8, 13), 0, 0, (8, 12))], [])
+    view = grid[::2, ::2].copy()
+    assert renderer.image_shape == (5 * 4 + 1, 7 * 4 + 1, 3)
+    # The block of cell (3, 5) is (1, 2) in the view, the block of (8, 13) is (4, 6)
+    expected = reference_image(view, [(1, 2)], [((4, 6), 0, 0, None)], [], 3, 1)
+    numpy.testing.assert_array_equal(image, expected)
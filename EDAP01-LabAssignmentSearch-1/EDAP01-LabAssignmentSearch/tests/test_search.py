@@ -0,0 +1,117 @@
+"""Correctness tests of the search algorithms against a reference Dijkstra on random grids."""
+import time
+
+import numpy
+import pytest
+
+from grids import SEEDS, assert_solution, new_search, random_grid, run, weighted_grid
+
+# Searches that find a cheapest path, and the ones that only find some path
+OPTIMAL = ["bfs", "ucs", "astar", "bidirectional", "jps"]
+COMPLETE = ["dfs", "gbfs"]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("name", OPTIMAL + COMPLETE)
+def test_path_matches_dijkstra(name, seed):
+    grid, start, goal = random_grid(seed)
+    algorithm = run(new_search(name, grid, start, goal))
+    assert_solution(algorithm, grid, start, goal, optimal=name in OPTIMAL)
+
+
+@pytest.mark.parametrize("name", OPTIMAL + COMPLETE)
+def test_unreachable_goal(name):
+    grid, start, goal = random_grid(0)
+    r, c = goal
+    grid[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2] = 1
+    grid[goal] = 0
+    algorithm = run(new_search(name, grid, start, goal))
+    assert_solution(algorithm, grid, start, goal)
+
+
+@pytest.mark.parametrize("name", OPTIMAL + COMPLETE)
+def test_start_is_goal(name):
+    grid, start, _ = random_grid(1)
+    algorithm = run(new_search(name, grid, start, start))
+    assert algorithm.getPath() == [start]
+    assert algorithm.getCost() == 0
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bidirectional_expands_fewer_nodes_than_ucs(seed):
+    # Open grids, where the two half searches meet long before one of them crosses the grid
+    grid, start, goal = random_grid(seed, rows=30, columns=30)
+    grid[grid == 1] = 0
+    ucs = run(new_search("ucs", grid, start, goal))
+    bidirectional = run(new_search("bidirectional", grid, start, goal))
+    assert bidirectional.getCost() == ucs.getCost()
+    assert bidirectional.getNumberOfExpanded() < ucs.getNumberOfExpanded()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_jps_expands_fewer_nodes_than_astar(seed):
+    # Jump points are only where walls force a turn, on sparse walls most of a straight run is skipped
+    grid, start, goal = random_grid(seed, rows=30, columns=30)
+    grid[(grid == 1) & (numpy.random.default_rng(seed).random(grid.shape) < 0.8)] = 0
+    astar = run(new_search("astar", grid, start, goal))
+    jps = run(new_search("jps", grid, start, goal))
+    assert jps.getCost() == astar.getCost()
+    assert jps.getNumberOfExpanded() < astar.getNumberOfExpanded()
+
+
+@pytest.mark.parametrize("bucket_queue", [True, False])
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("name", ["ucs", "astar"])
+def test_weighted_path_matches_dijkstra(name, seed, bucket_queue):
+    grid, start, goal = weighted_grid(seed)
+    algorithm = run(new_search(name, grid, start, goal, bucket_queue=bucket_queue))
+    assert_solution(algorithm, grid, start, goal)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("name", ["bfs", "dfs", "gbfs"])
+def test_weighted_cost_is_the_path_cost(name, seed):
+    # These ignore the terrain when they pick a path, but report what it costs
+    grid, start, goal = weighted_grid(seed)
+    algorithm = run(new_search(name, grid, start, goal))
+    assert_solution(algorithm, grid, start, goal, optimal=False)
+
+
+def snapshot(algorithm):
+    """Everything a caller can observe of a search, to compare solve() with step()."""
+    return (algorithm.isDone(), algorithm.getPath(), algorithm.getCost(), list(algorithm.getExplored()),
+            list(algorithm.getFrontier()), algorithm.getNumberOfExpanded(), algorithm.getMaxFrontierSize(),
+            algorithm.getMaxMemoryUsage(), algorithm.getMaxDepth())
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("name", OPTIMAL + COMPLETE)
+@pytest.mark.parametrize("make_grid", [random_grid, weighted_grid])
+def test_solve_matches_step(name, seed, make_grid):
+    grid, start, goal = make_grid(seed, rows=20, columns=20)
+    solved = new_search(name, grid, start, goal)
+    solved.solve()
+    assert snapshot(solved) == snapshot(run(new_search(name, grid, start, goal)))
+
+
+@pytest.mark.parametrize("name", OPTIMAL + COMPLETE)
+def test_solve_resumes_in_slices(name):
+    grid, start, goal = random_grid(4, rows=20, columns=20)
+    sliced = new_search(name, grid, start, goal)
+    stepped = new_search(name, grid, start, goal)
+    while not sliced.isDone():
+        sliced.solve(max_expansions=7)
+        for _ in range(7):
+            if not stepped.isDone():
+                stepped.step()
+        assert snapshot(sliced) == snapshot(stepped)
+
+
+@pytest.mark.parametrize("name", OPTIMAL + COMPLETE)
+def test_solve_stops_at_deadline(name):
+    grid, start, goal = random_grid(4, rows=20, columns=20)
+    algorithm = new_search(name, grid, start, goal)
+    algorithm.solve(deadline=time.perf_counter() - 1)
+    assert not algorithm.isDone() and algorithm.getNumberOfExpanded() == 0
+    algorithm.solve()
+    assert_solution(algorithm, grid, start, goal, optimal=name in OPTIMAL)
@@ -0,0 +1,70 @@
+"""Tests of the search bookkeeping in searchalgorithms.state, preallocated and sparse."""
+import tracemalloc
+
+import numpy
+import pytest
+
+from grids import SEEDS, new_search, random_grid, run
+from searchalgorithms.bfs import bfs
+from searchalgorithms.frontier import QueueFrontier
+from searchalgorithms.state import SearchState
+
+
+class sparse_bfs(bfs):
+    def _new_state(self, size):
+        return SearchState(size, sparse=True)
+
+    def _new_frontier(self, size):
+        return QueueFrontier(size, sparse=True)
+
+
+def test_sparse_state_reads_like_arrays():
+    dense, sparse = SearchState(10), SearchState(10, sparse=True)
+    for state in (dense, sparse):
+        state.reach(3, 3, 0, 0)
+        state.reach(4, 3, 1, 1)
+        state.reach(9, 4, 2, 2)
+        state.close(3)
+        state.close(4)
+        state.close(3)
+    for cell_id in range(10):
+        assert dense.parent[cell_id] == sparse.parent[cell_id]
+        assert dense.g[cell_id] == sparse.g[cell_id]
+        assert dense.depth[cell_id] == sparse.depth[cell_id]
+        assert dense.closed[cell_id] == sparse.closed[cell_id]
+    assert list(dense.explored) == list(sparse.explored) == [3, 4]
+    assert dense.pathTo(9) == sparse.pathTo(9) == [3, 4, 9]
+    # A sparse state only holds the cells written
+    assert sparse.nbytes < dense.nbytes
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sparse_search_matches_dense(seed):
+    grid, start, goal = random_grid(seed)
+    dense = run(new_search("bfs", grid, start, goal))
+    sparse = sparse_bfs()
+    sparse.reset(grid, start, goal)
+    run(sparse)
+    assert sparse.getPath() == dense.getPath()
+    assert sparse.getExplored() == dense.getExplored()
+    assert sparse.getMaxFrontierSize() == dense.getMaxFrontierSize()
+
+
+def traced_peak(name, grid, start, goal):
+    """Returns the peak bytes allocated by a reset and a search, after the graph is compiled."""
+    algorithm = new_search(name, grid, start, goal)  # Compiles and caches the graph
+    tracemalloc.start()
+    try:
+        algorithm.reset(grid, start, goal)
+        algorithm.solve()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_short_bounded_queries_allocate_nothing_grid_sized():
+    grid = numpy.zeros((1000, 1000))
+    start, goal = (500, 500), (500, 510)
+    assert traced_peak("astar", grid, start, goal) > grid.size
+    for name in ("idastar", "smastar"):
+        assert traced_peak(name, grid, start, goal) < grid.size // 10
@@ -0,0 +1,79 @@
+"""Tests of the vectorized wavefront BFS, with levels expanded in the Python loop and with array operations."""
+from collections import deque
+
+import numpy
+import pytest
+
+from grids import SEEDS, assert_solution, new_search, random_grid, run
+
+# small_level 0 expands every level with array operations, a huge one every level in the Python loop
+SMALL_LEVELS = [0, 10 ** 9]
+
+
+def bfs_levels(grid, start):
+    """Returns the cells of every BFS level from start, each level as a set."""
+    rows, columns = grid.shape
+    distance = {start: 0}
+    queue = deque([start])
+    while queue:
+        r, c = queue.popleft()
+        for neighbor in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if (0 <= neighbor[0] < rows and 0 <= neighbor[1] < columns and grid[neighbor] != 1
+                    and neighbor not in distance):
+                distance[neighbor] = distance[(r, c)] + 1
+                queue.append(neighbor)
+    levels = [set() for _ in range(max(distance.values()) + 1)]
+    for cell, d in distance.items():
+        levels[d].add(cell)
+    return levels
+
+
+@pytest.mark.parametrize("small_level", SMALL_LEVELS)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_path_matches_dijkstra(seed, small_level):
+    grid, start, goal = random_grid(seed, 20, 20)
+    algorithm = run(new_search("wavefront", grid, start, goal, small_level=small_level))
+    assert_solution(algorithm, grid, start, goal)
+
+
+@pytest.mark.parametrize("small_level", SMALL_LEVELS)
+def test_levels_are_bfs_levels(small_level):
+    grid, start, _ = random_grid(3, 20, 20)
+    # An unreachable goal, so every reachable level is expanded
+    goal = (0, 19)
+    grid[0:2, 18:20] = 1
+    grid[goal] = 0
+    algorithm = run(new_search("wavefront", grid, start, goal, small_level=small_level))
+    expected = bfs_levels(grid, start)
+    levels = algorithm.getLevels()
+    assert [set(map(tuple, level.tolist())) for level in levels] == expected
+    assert algorithm.getPath() == []
+    explored = algorithm.getExplored()
+    assert len(explored) == len(set(explored)) == algorithm.getNumberOfExpanded() == sum(map(len, expected))
+
+
+def test_explored_grows_level_by_level():
+    grid, start, goal = random_grid(5, 20, 20)
+    algorithm = new_search("wavefront", grid, start, goal)
+    expanded = []
+    while not algorithm.isDone():
+        algorithm.step()
+        expanded.append(len(algorithm.getExplored()))
+        frontier = [node for node, _, _, _ in algorithm.getFrontier()]
+        assert not set(frontier) & set(algorithm.getExplored())
+    assert expanded == sorted(expanded)
+    assert expanded[-1] == algorithm.getNumberOfExpanded()
+
+
+@pytest.mark.parametrize("small_level", SMALL_LEVELS)
+def test_serpentine(small_level):
+    # One corridor, a level of a single cell at every step
+    size = 15
+    grid = numpy.zeros((size, size))
+    for r in range(1, size - 1, 2):
+        grid[r, :] = 1
+        grid[r, size - 1 if (r // 2) % 2 == 0 else 0] = 0
+    start, goal = (0, 0), (size - 1, size - 1)
+    algorithm = run(new_search("wavefront", grid, start, goal, small_level=small_level))
+    assert_solution(algorithm, grid, start, goal)
+    assert algorithm.getMaxFrontierSize() == 1